@@ -1,6 +1,6 @@
 """Top-level package for basket_viz."""
 
-from . import img_util
+from . import img_util, instrumentation
 
-__all__ = ["img_util"]
+__all__ = ["img_util", "instrumentation"]
 
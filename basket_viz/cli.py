@@ -0,0 +1,203 @@
+"""
+Command line tools of basket_viz.
+
+    basket-viz prefetch season_stats.csv relationships.csv --logos logos.txt
+"""
+
+import contextlib
+import io
+import os
+from functools import partial
+from io import BytesIO
+
+import click
+import pandas as pd
+from PIL import Image
+
+from basket_viz.img_util.http_client import MAX_WORKERS, HTTPClient, fetch_all
+from basket_viz.img_util.image_cache import ImageCache, set_image_cache
+from basket_viz.img_util.img_patcher import circular_logo_array
+from basket_viz.radar.standard import RadarChart
+from basket_viz.relationships.plotter_v2 import PlotRelation
+
+# Image-URL columns of the chart inputs: the radar headshots and the
+# PlotRelation headshots
+RADAR_IMAGE_COLUMN = "player.imageUrl"
+HEADSHOT_COLUMNS = ("PLAYER_IMAGE",)
+# Connections kept per host by the download client, at least one per worker
+POOL_MAXSIZE = 16
+
+
+def _read_table(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        return pd.read_parquet(path)
+    if extension in (".json", ".jsonl", ".ndjson"):
+        return pd.read_json(path, lines=extension != ".json")
+    return pd.read_csv(path)
+
+
+def _urls(values):
+    """Distinct non-empty URL strings, in order."""
+    return list(
+        dict.fromkeys(v for v in values if isinstance(v, str) and v.strip())
+    )
+
+
+def _read_logo_list(path):
+    with open(path) as f:
+        return _urls(line.strip() for line in f if not line.startswith("#"))
+
+
+def _radar_images(radar, players, url):
+    # Every player sharing the URL gets their own saved crop. Kept in memory,
+    # the crop is computed to store it in the image cache
+    for player in players:
+        image = radar.comparison_image(player, url)
+        if callable(image):
+            image()
+
+
+def _headshot(url):
+    if PlotRelation.fetch_headshot(url) is None:
+        raise ValueError("the image could not be decoded")
+
+
+@click.group()
+def cli():
+    """basket-viz command line tools."""
+
+
+@cli.command()
+@click.argument(
+    "data_files", nargs=-1, type=click.Path(exists=True, dir_okay=False)
+)
+@click.option(
+    "--column",
+    "columns",
+    multiple=True,
+    help="Additional image-URL column of the data files, can be repeated.",
+)
+@click.option(
+    "--logos",
+    "logo_files",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with one team logo URL per line, can be repeated.",
+)
+@click.option(
+    "--logo-size",
+    default=260,
+    show_default=True,
+    help="Size the circular logos are pre-processed at, they are kept in the "
+    "image cache.",
+)
+@click.option(
+    "--radar-image-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Save the cropped radar headshots here, for "
+    "RadarChart(player_image_dir=...).",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Image cache directory, defaults to the basket_viz image cache.",
+)
+@click.option(
+    "--workers",
+    default=MAX_WORKERS,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Concurrent downloads.",
+)
+def prefetch(
+    data_files, columns, logo_files, logo_size, radar_image_dir, cache_dir, workers
+):
+    """
+    Download every image referenced by a season's data into the image cache.
+
+    Scans the DATA_FILES (CSV, JSON lines or parquet) for the image-URL columns
+    of the charts (player.imageUrl, PLAYER_IMAGE and any --column) and the
+    --logos lists. All images are downloaded concurrently and pre-processed as
+    the charts draw them: the logos are masked into circles, the PlotRelation
+    headshots decoded and the radar headshots cropped, and the results are
+    stored in the image cache. With --radar-image-dir the radar crops are also
+    saved there. Images of the other columns are only decoded. Failures are
+    reported and make the command exit with 1, so the rendering phase can rely
+    on the cache afterwards.
+    """
+    # One pooled connection per worker, so no download waits for a connection
+    client = HTTPClient(pool_maxsize=max(workers, POOL_MAXSIZE))
+    cache = ImageCache(cache_dir, client=client)
+    set_image_cache(cache)
+
+    # URL -> the functions pre-processing its variants, a logo can also be a
+    # headshot
+    tasks = {}
+
+    def add_task(url, task):
+        if task not in tasks.setdefault(url, []):
+            tasks[url].append(task)
+
+    def decode(url):
+        image = Image.open(BytesIO(cache.get(url)))
+        image.load()
+        return image
+
+    logo = partial(circular_logo_array, img_size=(logo_size, logo_size))
+
+    for path in logo_files:
+        for url in _read_logo_list(path):
+            add_task(url, logo)
+
+    for path in data_files:
+        df = _read_table(path)
+        for column in HEADSHOT_COLUMNS:
+            if column in df:
+                for url in _urls(df[column]):
+                    add_task(url, _headshot)
+        for column in columns:
+            if column in df:
+                for url in _urls(df[column]):
+                    add_task(url, decode)
+
+        if RADAR_IMAGE_COLUMN in df:
+            if radar_image_dir is not None and "player" in df:
+                radar = RadarChart(df, [], player_image_dir=radar_image_dir)
+                players = df.groupby(RADAR_IMAGE_COLUMN, sort=False)["player"]
+                players = players.unique()
+            else:
+                # The crops are only stored in the image cache, once per URL
+                radar = RadarChart(df, [])
+                players = None
+            for url in _urls(df[RADAR_IMAGE_COLUMN]):
+                names = [None] if players is None else players[url]
+                add_task(url, partial(_radar_images, radar, names))
+
+    if not tasks:
+        click.echo("No image URLs found.")
+        return
+
+    click.echo(f"Prefetching {len(tasks)} images into {cache.cache_dir}")
+    # The image helpers print a line per image, only the summary is shown
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.closing(client):
+        results = fetch_all(
+            list(tasks),
+            lambda url: [task(url) for task in tasks[url]],
+            max_workers=workers,
+        )
+
+    failures = {
+        url: error for url, error in results.items() if isinstance(error, Exception)
+    }
+    click.echo(f"{len(tasks) - len(failures)} images ready, {len(failures)} failed")
+    for url, error in failures.items():
+        click.echo(f"⚠️ {url}: {error}", err=True)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,217 @@
+import math
+
+import numpy as np
+from matplotlib import transforms
+from matplotlib.collections import PolyCollection
+
+
+class HexGrid:
+    """
+    NumPy implementation of the hexagonal grid used by ``Axes.hexbin``.
+
+    The cell layout, cell order and offsets are identical to the ones matplotlib
+    produces for the same ``gridsize`` and ``extent`` (with ``mincnt=0``), so the
+    arrays returned here can be used anywhere the ``get_array()`` /
+    ``get_offsets()`` output of a hexbin collection is expected.
+
+    Args:
+    - gridsize: Number of hexagons in the x-direction, or an (nx, ny) tuple.
+    - extent: (xmin, xmax, ymin, ymax) of the binned region.
+    """
+
+    def __init__(self, gridsize=15, extent=(-800, 800, -200, 1300)):
+        if np.iterable(gridsize):
+            nx, ny = gridsize
+        else:
+            nx = gridsize
+            ny = int(nx / math.sqrt(3))
+
+        xmin, xmax, ymin, ymax = extent
+        # Same padding as matplotlib to avoid roundoff errors at the borders
+        padding = 1.0e-9 * (xmax - xmin)
+        xmin -= padding
+        xmax += padding
+
+        self.gridsize = gridsize
+        self.extent = tuple(extent)
+        self.nx1, self.ny1 = nx + 1, ny + 1
+        self.nx2, self.ny2 = nx, ny
+        self.xmin, self.ymin = xmin, ymin
+        self.sx = (xmax - xmin) / nx
+        self.sy = (ymax - ymin) / ny
+        self._offsets = None
+
+    @property
+    def n_cells(self):
+        return self.nx1 * self.ny1 + self.nx2 * self.ny2
+
+    @property
+    def offsets(self):
+        """Hexagon centers in data coordinates, shape (n_cells, 2)."""
+        if self._offsets is None:
+            n1 = self.nx1 * self.ny1
+            offsets = np.zeros((self.n_cells, 2), float)
+            offsets[:n1, 0] = np.repeat(np.arange(self.nx1), self.ny1)
+            offsets[:n1, 1] = np.tile(np.arange(self.ny1), self.nx1)
+            offsets[n1:, 0] = np.repeat(np.arange(self.nx2) + 0.5, self.ny2)
+            offsets[n1:, 1] = np.tile(np.arange(self.ny2), self.nx2) + 0.5
+            offsets[:, 0] = offsets[:, 0] * self.sx + self.xmin
+            offsets[:, 1] = offsets[:, 1] * self.sy + self.ymin
+            offsets.flags.writeable = False
+            self._offsets = offsets
+        return self._offsets
+
+    @property
+    def polygon(self):
+        """Vertices of the hexagon template, relative to a cell center."""
+        return [self.sx, self.sy / 3] * np.array(
+            [
+                [0.5, -0.5],
+                [0.5, 0.5],
+                [0.0, 1.0],
+                [-0.5, 0.5],
+                [-0.5, -0.5],
+                [0.0, -1.0],
+            ]
+        )
+
+    def collection(self, ax, values, offsets=None, **kwargs):
+        """
+        Build a hexagon PolyCollection for precomputed per-cell values.
+
+        The hexagons are drawn at the given centers (the grid offsets by default)
+        with the hexagon template of this grid, so no binning takes place and a
+        value can never land in a neighbouring cell. Cells with non-finite values
+        are skipped. The collection is not added to ``ax``.
+
+        Args:
+        - ax: Axes whose data coordinates the centers are in.
+        - values: One value per center.
+        - offsets: Hexagon centers, defaults to the grid offsets.
+        - kwargs: Passed to PolyCollection (cmap, norm, edgecolors, linewidths...).
+        """
+        offsets = self.offsets if offsets is None else np.asarray(offsets, float)
+        values = np.ma.filled(np.ma.asarray(values, dtype=float), np.nan)
+        visible = np.isfinite(values)
+
+        collection = PolyCollection(
+            [self.polygon],
+            offsets=offsets[visible],
+            offset_transform=transforms.AffineDeltaTransform(ax.transData),
+            **kwargs,
+        )
+        collection.set_transform(ax.transData)
+        collection.set_array(values[visible])
+        return collection
+
+    def draw(self, ax, values, offsets=None, **kwargs):
+        """
+        Draw precomputed per-cell values on ``ax`` and return the collection.
+
+        This is a pure draw step: see :meth:`collection`.
+        """
+        collection = self.collection(ax, values, offsets=offsets, **kwargs)
+        if collection.norm.vmin is None and collection.norm.vmax is None:
+            collection.norm.autoscale(collection.get_array())
+
+        xmin, xmax, ymin, ymax = self.extent
+        ax.update_datalim(((xmin, ymin), (xmax, ymax)))
+        ax.add_collection(collection, autolim=False)
+        ax.autoscale_view(tight=True)
+        return collection
+
+    def bin_index(self, x, y):
+        """
+        Return the flat cell index of every point, or -1 for points that fall
+        outside the grid.
+        """
+        ix = (np.asarray(x, dtype=float) - self.xmin) / self.sx
+        iy = (np.asarray(y, dtype=float) - self.ymin) / self.sy
+
+        ix1 = np.round(ix).astype(int)
+        iy1 = np.round(iy).astype(int)
+        ix2 = np.floor(ix).astype(int)
+        iy2 = np.floor(iy).astype(int)
+
+        d1 = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+        d2 = (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+        on_first_lattice = d1 < d2
+
+        index1 = np.where(
+            (0 <= ix1) & (ix1 < self.nx1) & (0 <= iy1) & (iy1 < self.ny1),
+            ix1 * self.ny1 + iy1,
+            -1,
+        )
+        index2 = np.where(
+            (0 <= ix2) & (ix2 < self.nx2) & (0 <= iy2) & (iy2 < self.ny2),
+            self.nx1 * self.ny1 + ix2 * self.ny2 + iy2,
+            -1,
+        )
+        return np.where(on_first_lattice, index1, index2)
+
+    def count(self, x, y, weights=None):
+        """Number of points (or sum of ``weights``) per cell."""
+        return self.count_index(self.bin_index(x, y), weights=weights)
+
+    def count_index(self, index, weights=None):
+        """Like :meth:`count`, for points that were already binned."""
+        index = np.asarray(index)
+        valid = index >= 0
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)[valid]
+        counts = np.bincount(index[valid], weights=weights, minlength=self.n_cells)
+        return counts.astype(float)
+
+    def aggregate(self, x, y, C, reduce="mean"):
+        """
+        Reduce the values ``C`` of the points falling into each cell.
+
+        This replaces ``ax.hexbin(..., C=C, reduce_C_function=...)`` with
+        (weighted) bincounts, so no Python function is called per cell.
+
+        Args:
+        - x, y: Point coordinates.
+        - C: Value of every point.
+        - reduce: One of "sum", "mean", "max", "min" or "count".
+
+        Returns an array with one value per cell, NaN for cells without points
+        (except for "count" and "sum", which are 0 there).
+        """
+        return self.aggregate_index(self.bin_index(x, y), C, reduce=reduce)
+
+    def aggregate_index(self, index, C, reduce="mean"):
+        """Like :meth:`aggregate`, for points that were already binned."""
+        index = np.asarray(index)
+        valid = index >= 0
+        index = index[valid]
+        C = np.asarray(C, dtype=float)[valid]
+
+        if reduce == "count":
+            return np.bincount(index, minlength=self.n_cells).astype(float)
+        if reduce == "sum":
+            return np.bincount(index, weights=C, minlength=self.n_cells)
+        if reduce == "mean":
+            counts = np.bincount(index, minlength=self.n_cells)
+            sums = np.bincount(index, weights=C, minlength=self.n_cells)
+            return np.divide(
+                sums, counts, out=np.full(self.n_cells, np.nan), where=counts > 0
+            )
+        if reduce in ("max", "min"):
+            ufunc = np.fmax if reduce == "max" else np.fmin
+            result = np.full(self.n_cells, np.nan)
+            ufunc.at(result, index, C)
+            return result
+        raise ValueError(f"Unsupported reduce: {reduce}")
+
+
+def shooting_ratio(values_made, values_all):
+    """
+    Per-cell made/attempted ratio as computed by ``ShotChart.get_entity_hexbin_data``.
+
+    A small adjustment is added to the made values of every visited cell so that
+    cells with only a few missed shots are distinguishable from empty ones.
+    Cells without attempts are masked.
+    """
+    values_all = np.ma.asarray(values_all)
+    adjustment = np.where(values_all != 0, 1, 0) * 0.001
+    return (values_made + adjustment) / values_all
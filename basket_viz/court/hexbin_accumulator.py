@@ -0,0 +1,269 @@
+import numpy as np
+import pandas as pd
+
+from basket_viz.court.hex_grid import HexGrid, shooting_ratio
+
+
+class HexbinAccumulator:
+    """
+    Per-entity made/missed/all hexbin counts that are updated game by game.
+
+    Play-by-play rows are ingested with :meth:`update`. Each game is binned
+    once and its contribution is added to the running totals in place, so the
+    cost of a refresh scales with the new games only. Contributions are keyed
+    by GAME_ID: feeding a game that was already ingested replaces its previous
+    contribution instead of counting it twice.
+
+    :meth:`snapshot` returns the same DataFrame layout as
+    ``ShotChart.get_all_entity_hexbin_data``, so it can be passed directly to
+    the plotting and normalization methods of the ShotChart.
+
+    When ``window`` is set, the accumulator additionally maintains rolling
+    "last N games" counts for every entity: ingesting a game adds its counts
+    and subtracts the counts of the game that drops out of each entity's
+    window, without re-binning. Games are ordered by ingestion, so rounds
+    should be fed in chronological order.
+
+    Args:
+    - shot_chart: ShotChart whose config (entity type, column names, action ids,
+      gridsize and hexagon extent) is used for filtering and binning.
+    - game_column: Name of the column identifying a game.
+    - window: Number of most recent games of an entity kept in the rolling
+      window, or None to disable the rolling window.
+    """
+
+    _METRICS = ("made", "missed", "all")
+
+    def __init__(self, shot_chart, game_column="GAME_ID", window=None):
+        self.config = shot_chart.config
+        self.game_column = game_column
+        self.window = window
+        self.entity_type = self.config["entity_type"]
+        self.grid = HexGrid(self.config["gridsize"], self.config["hexagon_extent"])
+
+        self.entities = []
+        self._entity_index = {}
+        self._totals = np.zeros((len(self._METRICS), 0, self.grid.n_cells))
+        self._window_totals = np.zeros_like(self._totals)
+        self._games = {}
+        # Games of every entity (by row index) in ingestion order
+        self._entity_games = {}
+
+    @property
+    def games(self):
+        """GAME_IDs in the order they were first ingested."""
+        return list(self._games)
+
+    def _entity_column(self):
+        if self.entity_type == "player":
+            return self.config["player_column_name"]
+        elif self.entity_type == "team":
+            return self.config["team_column_name"]
+        raise ValueError(f"Unsupported entity_type: {self.entity_type}")
+
+    def _entity_codes(self, names):
+        """Map entity names to row indices, registering new entities."""
+        uniques, inverse = np.unique(names, return_inverse=True)
+        codes = np.empty(len(uniques), dtype=int)
+        for i, name in enumerate(uniques):
+            if name not in self._entity_index:
+                self._entity_index[name] = len(self.entities)
+                self.entities.append(name)
+            codes[i] = self._entity_index[name]
+
+        capacity = self._totals.shape[1]
+        if len(self.entities) > capacity:
+            new_capacity = max(len(self.entities), 2 * capacity)
+            self._totals = self._grow(self._totals, new_capacity)
+            self._window_totals = self._grow(self._window_totals, new_capacity)
+
+        return codes[inverse]
+
+    @staticmethod
+    def _grow(totals, capacity):
+        grown = np.zeros((totals.shape[0], capacity, totals.shape[2]))
+        grown[:, : totals.shape[1]] = totals
+        return grown
+
+    def _game_contribution(self, game_df, entity_column):
+        """Bin one game into sparse (flat index, count) pairs per metric."""
+        game_df = game_df[game_df[entity_column].notna()]
+        rows = self._entity_codes(game_df[entity_column].to_numpy())
+        cells = self.grid.bin_index(
+            game_df[self.config["coord_x"]].to_numpy(),
+            game_df[self.config["coord_y"]].to_numpy(),
+        )
+        actions = game_df["ID_ACTION"]
+        selections = (
+            actions.isin(self.config["made_action_ids"]).to_numpy(),
+            actions.isin(self.config["missed_action_ids"]).to_numpy(),
+            np.ones(len(game_df), dtype=bool),
+        )
+
+        contribution = []
+        for selected in selections:
+            valid = selected & (cells >= 0)
+            flat = rows[valid] * self.grid.n_cells + cells[valid]
+            flat, counts = np.unique(flat, return_counts=True)
+            contribution.append((flat, counts.astype(float)))
+        return contribution
+
+    def _apply(self, contribution, sign, totals=None):
+        totals = self._totals if totals is None else totals
+        n_cells = self.grid.n_cells
+        for metric_totals, (flat, counts) in zip(totals, contribution):
+            np.add.at(
+                metric_totals, (flat // n_cells, flat % n_cells), sign * counts
+            )
+
+    def _contribution_rows(self, contribution):
+        """Entity rows present in a game (taken from the 'all' metric)."""
+        flat, _ = contribution[-1]
+        return np.unique(flat // self.grid.n_cells)
+
+    def _entity_slice(self, contribution, rows):
+        """Restrict a game contribution to the given entity rows."""
+        sliced = []
+        for flat, counts in contribution:
+            keep = np.isin(flat // self.grid.n_cells, rows)
+            sliced.append((flat[keep], counts[keep]))
+        return sliced
+
+    def _advance_window(self, game_id, contribution):
+        """Add the newest game and subtract the games leaving each window."""
+        expired = {}
+        for row in self._contribution_rows(contribution):
+            games = self._entity_games.setdefault(row, [])
+            games.append(game_id)
+            if self.window is not None and len(games) > self.window:
+                expired.setdefault(games[-self.window - 1], []).append(row)
+
+        if self.window is None:
+            return
+
+        self._apply(contribution, sign=1, totals=self._window_totals)
+
+        for old_game_id, rows in expired.items():
+            old_contribution = self._entity_slice(self._games[old_game_id], rows)
+            self._apply(old_contribution, sign=-1, totals=self._window_totals)
+
+    def _rebuild_window(self):
+        """Recompute the game histories and window counts from scratch."""
+        self._window_totals = np.zeros_like(self._totals)
+        self._entity_games = {}
+        for game_id, contribution in self._games.items():
+            self._advance_window(game_id, contribution)
+
+    def update(self, df):
+        """
+        Ingest play-by-play rows and update the counts in place.
+
+        Rows are grouped by GAME_ID. Games that were already ingested are
+        replaced by the new rows, so the same game can be fed again (e.g. after
+        a data correction) without being double-counted.
+
+        Returns the list of GAME_IDs that were (re)ingested.
+        """
+        entity_column = self._entity_column()
+        updated = []
+        replayed = False
+
+        for game_id, game_df in df.groupby(self.game_column, sort=False, observed=True):
+            contribution = self._game_contribution(game_df, entity_column)
+            if game_id in self._games:
+                self._apply(self._games[game_id], sign=-1)
+                replayed = True
+            self._apply(contribution, sign=1)
+            self._games[game_id] = contribution
+            if not replayed:
+                self._advance_window(game_id, contribution)
+            updated.append(game_id)
+
+        # A replayed game may change the entities it contributes to, and with
+        # them which games are in each window
+        if replayed:
+            self._rebuild_window()
+
+        return updated
+
+    def remove_game(self, game_id):
+        """Subtract a previously ingested game from the counts."""
+        if game_id not in self._games:
+            raise KeyError(f"Game '{game_id}' has not been ingested.")
+        self._apply(self._games.pop(game_id), sign=-1)
+        self._rebuild_window()
+
+    def _to_dataframe(self, totals):
+        """Build the get_all_entity_hexbin_data layout from a totals array."""
+        n_entities = len(self.entities)
+        offsets = self.grid.offsets
+        made, missed, all_ = (
+            np.ma.masked_invalid(totals[i, :n_entities]) for i in range(3)
+        )
+
+        return pd.DataFrame(
+            {
+                f"{self.entity_type}_name": list(self.entities),
+                "offsets": [offsets] * n_entities,
+                "values_made": list(made),
+                "values_missed": list(missed),
+                "values_all": list(all_),
+                "values_ratio": [
+                    shooting_ratio(m, a) for m, a in zip(made, all_)
+                ],
+            }
+        )
+
+    def snapshot(self):
+        """
+        Return the current counts as a DataFrame with columns: player_name or
+        team_name, offsets, values_made, values_missed, values_all, values_ratio.
+        """
+        return self._to_dataframe(self._totals.copy())
+
+    def window_snapshot(self):
+        """
+        Return the rolling "last N games" counts of every entity in the same
+        layout as :meth:`snapshot`.
+        """
+        if self.window is None:
+            raise ValueError("The accumulator was created without a window.")
+        return self._to_dataframe(self._window_totals.copy())
+
+    def rolling_window_sequence(self, entity_name, window=None):
+        """
+        Per-game hexbin counts of one entity over time.
+
+        The entity's games are stacked into a (n_games, 3, n_cells) tensor of
+        made/missed/all counts and accumulated along the game axis. Every frame
+        of a rolling window is then the difference of two cumulative frames.
+
+        Args:
+        - entity_name: The player or team name.
+        - window: Number of games per frame. Defaults to the accumulator window;
+          None gives the cumulative season-to-date counts.
+
+        Returns:
+        - game_ids: The entity's games, one per frame.
+        - frames: Array of shape (n_games, 3, n_cells) with the made, missed and
+          all counts of every frame.
+        """
+        if entity_name not in self._entity_index:
+            raise KeyError(f"Unknown {self.entity_type}: '{entity_name}'")
+        window = self.window if window is None else window
+
+        row = self._entity_index[entity_name]
+        n_cells = self.grid.n_cells
+        game_ids = list(self._entity_games.get(row, []))
+
+        per_game = np.zeros((len(game_ids), len(self._METRICS), n_cells))
+        for k, game_id in enumerate(game_ids):
+            for m, (flat, counts) in enumerate(self._games[game_id]):
+                keep = flat // n_cells == row
+                per_game[k, m, flat[keep] % n_cells] = counts[keep]
+
+        frames = np.cumsum(per_game, axis=0)
+        if window is not None and window < len(game_ids):
+            frames[window:] -= frames[:-window].copy()
+
+        return game_ids, frames
@@ -0,0 +1,99 @@
+import numpy as np
+
+from basket_viz.court.hex_grid import HexGrid, shooting_ratio
+
+
+class HexbinPyramid:
+    """
+    Hexbin values for several grid sizes, built from one pass over the shots.
+
+    Hexagonal grids of different sizes do not nest, so coarser levels cannot be
+    obtained by merging the cells of a finer one. Instead the raw shots are
+    collapsed once into their distinct court coordinates (the finest possible
+    resolution) with made/attempt weights. Every level is then aggregated from
+    that compressed base, which is exact and never touches the raw data again.
+    Levels are cached, and grid sizes that were not requested up front can still
+    be served from the base.
+
+    Args:
+    - made: DataFrame (or (x, y) array pair) with the made shots.
+    - miss: DataFrame (or (x, y) array pair) with the missed shots.
+    - gridsizes: Grid sizes to aggregate eagerly.
+    - extent: (xmin, xmax, ymin, ymax) of the binned region.
+    - coord_x: Name of the x coordinate column.
+    - coord_y: Name of the y coordinate column.
+    """
+
+    def __init__(
+        self,
+        made,
+        miss,
+        gridsizes=(10, 15, 25, 40),
+        extent=(-800, 800, -200, 1300),
+        coord_x="COORD_X",
+        coord_y="COORD_Y",
+    ):
+        self.extent = tuple(extent)
+
+        made_xy = self._to_xy(made, coord_x, coord_y)
+        miss_xy = self._to_xy(miss, coord_x, coord_y)
+        points = np.concatenate([made_xy, miss_xy])
+
+        # Collapse the shots into distinct coordinates with per-point weights
+        self.points, inverse = np.unique(points, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        n_points = len(self.points)
+        self.weights_all = np.bincount(inverse, minlength=n_points).astype(float)
+        self.weights_made = np.bincount(
+            inverse[: len(made_xy)], minlength=n_points
+        ).astype(float)
+
+        self._levels = {}
+        for gridsize in gridsizes:
+            self.level(gridsize)
+
+    @staticmethod
+    def _to_xy(data, coord_x, coord_y):
+        if hasattr(data, "columns"):
+            x, y = data[coord_x].to_numpy(), data[coord_y].to_numpy()
+        else:
+            x, y = data
+        return np.column_stack([np.asarray(x, float), np.asarray(y, float)])
+
+    @property
+    def gridsizes(self):
+        """Grid sizes that have been aggregated so far."""
+        return sorted(self._levels)
+
+    @property
+    def n_shots(self):
+        return int(self.weights_all.sum())
+
+    def level(self, gridsize):
+        """
+        Return the hexbin data of one zoom level.
+
+        The returned dict has the same keys as the columns produced by
+        ``ShotChart.get_entity_hexbin_data``: offsets, values_made, values_missed,
+        values_all and values_ratio.
+        """
+        if gridsize not in self._levels:
+            grid = HexGrid(gridsize, self.extent)
+            index = grid.bin_index(self.points[:, 0], self.points[:, 1])
+            values_made = np.ma.masked_invalid(
+                grid.count_index(index, weights=self.weights_made)
+            )
+            values_all = np.ma.masked_invalid(
+                grid.count_index(index, weights=self.weights_all)
+            )
+            self._levels[gridsize] = {
+                "offsets": grid.offsets,
+                "values_made": values_made,
+                "values_missed": values_all - values_made,
+                "values_all": values_all,
+                "values_ratio": shooting_ratio(values_made, values_all),
+            }
+        return self._levels[gridsize]
+
+    def __getitem__(self, gridsize):
+        return self.level(gridsize)
@@ -0,0 +1,306 @@
+import io
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from matplotlib import pyplot as plt
+
+from basket_viz.export_util.fig_export import LocalExport
+from basket_viz.instrumentation import count_rows, instrumented, stage
+
+
+class LiveShotChart:
+    """
+    Shot chart that follows a play-by-play file while it is being written.
+
+    The file is tailed by byte offset: every :meth:`update` reads only the bytes
+    appended since the previous call, parses the complete lines among them and
+    keeps a trailing partial line for the next call. A file that was truncated
+    or replaced (log rotation) is detected and read from the start again.
+
+    New made and missed shots are appended to preallocated coordinate arrays.
+    Matplotlib copies the data of a marker artist on every change, so the
+    markers are split into artists of at most ``CHUNK_SIZE`` shots and only the
+    last one is updated. The court is drawn only once, so the cost of an update
+    scales with the new rows instead of the length of the game.
+
+    The figure is re-exported every ``export_every`` updates with new shots
+    and/or every ``export_interval`` seconds, whichever comes first.
+
+    Args:
+    - shot_chart: ShotChart whose config (columns, action ids, colors, markers)
+      is used for filtering and drawing.
+    - path: CSV (with a header line) or JSONL file with play-by-play rows.
+    - file_format: "csv" or "jsonl". Guessed from the file extension if None.
+    - player_name, team_name, game_id: Optional filters, as in get_fg_made_miss.
+    - title: Optional title of the chart.
+    - export_every: Export after this many updates that added shots, or None.
+    - export_interval: Export at most every this many seconds, or None.
+    - directory, file_name, export_format: Where and how the figure is exported.
+    - numbered_frames: Write every export to its own numbered file instead of
+      overwriting the same one.
+    """
+
+    # Shots per marker artist, bounds the data copied by every update
+    CHUNK_SIZE = 512
+    # Leading bytes of the file compared to detect that it was replaced
+    HEAD_SIZE = 1024
+
+    def __init__(
+        self,
+        shot_chart,
+        path,
+        file_format=None,
+        player_name=None,
+        team_name=None,
+        game_id=None,
+        title=None,
+        export_every=None,
+        export_interval=None,
+        directory="output",
+        file_name="live_shot_chart",
+        export_format="png",
+        numbered_frames=False,
+    ):
+        self.shot_chart = shot_chart
+        self.config = shot_chart.config
+        self.path = path
+        if file_format is None:
+            file_format = (
+                "jsonl"
+                if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson")
+                else "csv"
+            )
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        self.file_format = file_format
+        self.filters = {
+            "player_name": player_name,
+            "team_name": team_name,
+            "game_id": game_id,
+        }
+
+        self.export_every = export_every
+        self.export_interval = export_interval
+        self.directory = directory
+        self.file_name = file_name
+        self.export_format = export_format
+        self.numbered_frames = numbered_frames
+
+        self._offset = 0
+        self._file_id = None
+        self._head = b""
+        self._columns = None
+        self._shots = {"made": np.empty((2, 0)), "miss": np.empty((2, 0))}
+        self._n_shots = {"made": 0, "miss": 0}
+        self._updates_since_export = 0
+        self._last_export = time.monotonic()
+        self.n_rows = 0
+        self.n_exports = 0
+
+        self.fig, self.ax, self.artists = self._create_figure(title)
+        # Per result: the marker artists and the first shot of the last one
+        self._chunks = {result: [artist] for result, artist in self.artists.items()}
+        self._chunk_start = {"made": 0, "miss": 0}
+
+    def _create_figure(self, title):
+        fig, ax = plt.subplots(figsize=self.config["figsize"])
+        fig.patch.set_facecolor(self.config["court_background_color"])
+        self.shot_chart.draw_court(ax)
+
+        artists = {}
+        for result, label in (("made", "Made"), ("miss", "Missed")):
+            if self.config["plot_shots"] in ["all", result]:
+                (artists[result],) = ax.plot(
+                    [],
+                    [],
+                    self.config["marker_style"][result],
+                    label=label,
+                    color=self.config["color_map"][result],
+                    markersize=self.config["marker_size"],
+                )
+
+        ax.legend(loc="upper right", bbox_to_anchor=(0.95, 0.95), prop={"size": 14})
+        ax.set_xlim([-800, 800])
+        ax.set_ylim([-200, 1300])
+
+        if title:
+            ax.set_title(
+                title,
+                fontsize=self.config["title"]["fontsize"],
+                fontweight=self.config["title"]["fontweight"],
+                color=self.config["title"]["color"],
+            )
+
+        return fig, ax, artists
+
+    def _read_new_lines(self):
+        """Return the complete lines appended since the previous read."""
+        if not os.path.exists(self.path):
+            return b""
+
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            if self._offset and (
+                file_id != self._file_id
+                or stat.st_size < self._offset
+                or f.read(len(self._head)) != self._head
+            ):
+                warnings.warn(
+                    f"{self.path} was truncated or replaced, reading it from the "
+                    "start",
+                    RuntimeWarning,
+                    stacklevel=3,
+                )
+                self.reset()
+            self._file_id = file_id
+
+            f.seek(self._offset)
+            chunk = f.read()
+
+            # Keep a partially written last line for the next read
+            end = chunk.rfind(b"\n") + 1
+            self._offset += end
+            if len(self._head) < self.HEAD_SIZE:
+                f.seek(0)
+                self._head = f.read(min(self._offset, self.HEAD_SIZE))
+        return chunk[:end]
+
+    def _parse(self, chunk):
+        """Parse complete CSV or JSONL lines into a DataFrame."""
+        if not chunk.strip():
+            return pd.DataFrame()
+        if self.file_format == "jsonl":
+            return pd.read_json(io.BytesIO(chunk), lines=True)
+
+        if self._columns is None:
+            header, _, chunk = chunk.partition(b"\n")
+            self._columns = pd.read_csv(io.BytesIO(header)).columns.tolist()
+        if not chunk.strip():
+            return pd.DataFrame()
+        return pd.read_csv(io.BytesIO(chunk), header=None, names=self._columns)
+
+    def _append(self, result, shots):
+        """Append shot coordinates, growing the buffer by doubling."""
+        n, buffer = self._n_shots[result], self._shots[result]
+        n_new = n + len(shots)
+        if n_new > buffer.shape[1]:
+            grown = np.empty((2, max(n_new, 2 * buffer.shape[1])))
+            grown[:, :n] = buffer[:, :n]
+            self._shots[result] = buffer = grown
+        buffer[:, n:n_new] = shots.T
+        self._n_shots[result] = n_new
+
+        if result in self.artists:
+            self._draw_new_shots(result)
+
+    def _draw_new_shots(self, result):
+        """Pass the shots of the last marker artist, starting a new one when full."""
+        x, y = self._shots[result]
+        n, start = self._n_shots[result], self._chunk_start[result]
+        chunks = self._chunks[result]
+
+        while n - start > self.CHUNK_SIZE:
+            end = start + self.CHUNK_SIZE
+            chunks[-1].set_data(x[start:end], y[start:end])
+            start = end
+            (artist,) = self.ax.plot(
+                [],
+                [],
+                self.config["marker_style"][result],
+                color=self.config["color_map"][result],
+                markersize=self.config["marker_size"],
+            )
+            chunks.append(artist)
+
+        chunks[-1].set_data(x[start:n], y[start:n])
+        self._chunk_start[result] = start
+
+    @instrumented()
+    def update(self):
+        """
+        Read and draw the rows appended to the file since the previous update.
+
+        Returns the number of new made and missed shots.
+        """
+        with stage("read"):
+            rows = self._parse(self._read_new_lines())
+        self.n_rows += len(rows)
+        count_rows("input", len(rows))
+
+        n_new = 0
+        if len(rows):
+            coords = [self.config["coord_x"], self.config["coord_y"]]
+            fg_made, fg_miss = self.shot_chart.get_fg_made_miss(rows, **self.filters)
+            with stage("draw"):
+                for result, shots in (("made", fg_made), ("miss", fg_miss)):
+                    if len(shots):
+                        self._append(result, shots[coords].to_numpy(dtype=float))
+                        n_new += len(shots)
+
+        if n_new:
+            self._updates_since_export += 1
+        if self._export_due():
+            self.export()
+
+        return n_new
+
+    def _export_due(self):
+        if self._updates_since_export == 0:
+            return False
+        if self.export_every and self._updates_since_export >= self.export_every:
+            return True
+        return bool(
+            self.export_interval
+            and time.monotonic() - self._last_export >= self.export_interval
+        )
+
+    @instrumented()
+    def export(self):
+        """Export the current state of the chart."""
+        file_name = self.file_name
+        if self.numbered_frames:
+            file_name = f"{file_name}_{self.n_exports:05d}"
+        LocalExport.save_plot(
+            fig=self.fig,
+            directory=self.directory,
+            file_name=file_name,
+            file_format=self.export_format,
+        )
+        self.n_exports += 1
+        self._updates_since_export = 0
+        self._last_export = time.monotonic()
+
+    def reset(self):
+        """Forget all shots and read the file from the start again."""
+        self._offset = 0
+        self._file_id = None
+        self._head = b""
+        self._columns = None
+        self._n_shots = {"made": 0, "miss": 0}
+        self._chunk_start = {"made": 0, "miss": 0}
+        self.n_rows = 0
+        for result, artist in self.artists.items():
+            for extra in self._chunks[result][1:]:
+                extra.remove()
+            self._chunks[result] = [artist]
+            artist.set_data([], [])
+
+    def follow(self, poll_interval=1.0, duration=None):
+        """
+        Keep updating the chart until ``duration`` seconds have passed (forever
+        if None) or the loop is interrupted.
+        """
+        start = time.monotonic()
+        try:
+            while duration is None or time.monotonic() - start < duration:
+                self.update()
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self._updates_since_export:
+                self.export()
@@ -5,6 +5,10 @@ import matplotlib.animation as animation
 from IPython.display import HTML
 import os
 from basket_viz.court.euroleague_team_configs import team_configs
+from basket_viz.court.hex_grid import HexGrid, shooting_ratio
+from basket_viz.court.hexbin_pyramid import HexbinPyramid
+from basket_viz.court.live import LiveShotChart
+from basket_viz.data_util.column_cache import load_cached
 from matplotlib.colors import LinearSegmentedColormap
 from matplotlib.patches import PathPatch
 from matplotlib.collections import PatchCollection
@@ -17,6 +21,10 @@ from matplotlib.colors import SymLogNorm
 
 from sklearn.preprocessing import MinMaxScaler
 import numpy as np
+from basket_viz.instrumentation import count_rows, instrumented, savefig, stage
+
+# Bootstrap draws generated at once by get_hexbin_confidence
+BOOTSTRAP_CHUNK = 1 << 22
 
 
 class ShotChart:
@@ -52,6 +60,15 @@ class ShotChart:
             "player_column_name": "PLAYER",
             "team_column_name": "TEAM",
             "entity_type": "player",
+            "insignificant_color": "#BDBDBD",
+            "action_points": {
+                "2FGM": 2,
+                "2FGA": 2,
+                "3FGM": 3,
+                "3FGA": 3,
+                "FTM": 1,
+                "FTA": 1,
+            },
         }
 
         if use_team_config and use_team_config in team_configs:
@@ -92,6 +109,7 @@ class ShotChart:
 
         return ax
 
+    @instrumented()
     def plot_field_goal_scatter(self, made, miss, title=None):
         fig, ax = plt.subplots(figsize=self.config["figsize"])
         fig.patch.set_facecolor(self.config["court_background_color"])
@@ -255,6 +273,7 @@ class ShotChart:
     # add type hints
     # add display animation in jupyter notebook [x]
 
+    @instrumented()
     def plot_field_goal_scatter_temporal(self, made, miss, title=None):
         made["Result"] = "Made"
         miss["Result"] = "Missed"
@@ -325,6 +344,7 @@ class ShotChart:
         else:
             raise ValueError("No animation available to show.")
 
+    @instrumented()
     def save_plot(self, directory="output", file_name="shot_chart", file_format=None):
         if not os.path.exists(directory):
             os.makedirs(directory)
@@ -334,9 +354,11 @@ class ShotChart:
                 file_format = "mp4"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
             if file_format == "gif":
-                self.ani.save(full_path, writer="pillow")
+                with stage("encode"):
+                    self.ani.save(full_path, writer="pillow")
             elif file_format == "mp4":
-                self.ani.save(full_path, writer="ffmpeg")
+                with stage("encode"):
+                    self.ani.save(full_path, writer="ffmpeg")
             else:
                 raise ValueError(
                     f"Unsupported file format for animation: {file_format}"
@@ -347,12 +369,56 @@ class ShotChart:
             if file_format is None:
                 file_format = "png"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
-            self.fig.savefig(full_path)
+            savefig(self.fig, full_path)
             print(f"Saved figure to {full_path}")
 
         else:
             raise ValueError("No plot or animation available to save.")
 
+    def load_cached(self, path, games=None, teams=None, columns=None, **kwargs):
+        """
+        Load a play-by-play file through the column cache (see
+        basket_viz.data_util.ColumnCache), reading only the columns the shot
+        charts use and the rows of the given games and teams.
+
+        Args:
+        - path: The play-by-play file.
+        - games: Only load the rows of these GAME_IDs.
+        - teams: Only load the rows of these teams (team_column_name).
+        - columns: Columns to load, defaults to the coordinates, action, game,
+          player, team and sort columns of the config.
+        - kwargs: Passed to load_cached, e.g. reader or cache_dir.
+        """
+        if columns is None:
+            columns = [
+                "GAME_ID",
+                self.config["team_column_name"],
+                self.config["player_column_name"],
+                "ID_ACTION",
+                self.config["coord_x"],
+                self.config["coord_y"],
+                self.config["sort_col"],
+            ]
+        kwargs.setdefault("team_column", self.config["team_column_name"])
+        return load_cached(path, columns=columns, games=games, teams=teams, **kwargs)
+
+    def live_shot_chart(self, path, title=None, **kwargs):
+        """
+        Create a LiveShotChart that follows a growing play-by-play CSV or JSONL
+        file with the config of this chart. Call update() on it whenever new rows
+        may have been written, or follow() to poll the file.
+
+        Args:
+        - path: The play-by-play file.
+        - title: Optional title of the chart.
+        - kwargs: Filters and export options, see LiveShotChart.
+        """
+        live = LiveShotChart(self, path, title=title, **kwargs)
+        self.fig = live.fig
+        self.ani = None
+        return live
+
+    @instrumented()
     def get_fg_made_miss(self, df, player_name=None, team_name=None, game_id=None):
 
         made_action_ids = self.config["made_action_ids"]
@@ -367,8 +433,11 @@ class ShotChart:
 
         fg_made = df[df["ID_ACTION"].isin(made_action_ids)]
         fg_miss = df[df["ID_ACTION"].isin(missed_action_ids)]
+        count_rows("made", len(fg_made))
+        count_rows("missed", len(fg_miss))
         return fg_made, fg_miss
 
+    @instrumented()
     def euroleague_field_goal_dots(
         self,
         df,
@@ -399,16 +468,116 @@ class ShotChart:
 
     def get_hexbin_from_offset_values(self, ax, offsets, values):
 
-        hc = ax.hexbin(
-            offsets[:, 0],
-            offsets[:, 1],
-            gridsize=self.config["gridsize"],
-            C=np.array(values),
-            extent=self.config["hexagon_extent"],
-        )
+        hc = self._hex_grid().draw(ax, values, offsets=offsets)
         plt.close()
         return ax, hc
 
+    def _hex_grid(self, gridsize=None):
+        """HexGrid for the given gridsize (the configured one by default)."""
+        return HexGrid(
+            gridsize or self.config["gridsize"], self.config["hexagon_extent"]
+        )
+
+    def _shot_weights(self, shots, weights, index, grid):
+        """
+        Resolve the per-shot weights used by get_hexbin_aggregate.
+
+        - "points": points scored by the shot (0 for misses).
+        - "shot_value": value of the attempt (2 or 3, 1 for free throws).
+        - "expected_points": shot value times the FG% of all given shots in the
+          shot's hexbin.
+        - a column name of shots, or a Series aligned on the index of the
+          play-by-play DataFrame (shots missing from it get NaN).
+        """
+        if isinstance(weights, str) and weights in (
+            "points",
+            "shot_value",
+            "expected_points",
+        ):
+            actions = shots["ID_ACTION"]
+            shot_value = actions.map(self.config["action_points"]).fillna(0).to_numpy()
+            made = actions.isin(self.config["made_action_ids"]).to_numpy()
+
+            if weights == "points":
+                return np.where(made, shot_value, 0.0)
+            if weights == "shot_value":
+                return shot_value
+
+            made_ratio = grid.aggregate_index(index, made, reduce="mean")
+            return shot_value * np.where(index >= 0, made_ratio[index], np.nan)
+
+        if isinstance(weights, str):
+            return shots[weights].to_numpy(dtype=float)
+        if isinstance(weights, pd.Series):
+            if not weights.index.is_unique:
+                raise ValueError("weights must have a unique index")
+            return weights.reindex(shots.index).to_numpy(dtype=float)
+        raise TypeError(
+            "weights must be a weighting name, a column name or a Series aligned "
+            "on the index of df"
+        )
+
+    @instrumented()
+    def get_hexbin_aggregate(
+        self,
+        df,
+        weights="points",
+        reduce="mean",
+        player_name=None,
+        team_name=None,
+        game_id=None,
+        gridsize=None,
+    ):
+        """
+        Aggregate weighted field goals per hexbin with weighted bincounts.
+
+        Args:
+        - df: Play-by-play DataFrame.
+        - weights: "points", "shot_value", "expected_points", a column name or a
+          Series of per-shot values aligned on the index of df.
+        - reduce: "sum", "mean", "max", "min" or "count".
+        - player_name, team_name, game_id: Optional filters.
+        - gridsize: Grid size, defaults to the configured one.
+
+        Returns the hexbin offsets and the aggregated value of every hexbin
+        (NaN for hexbins without shots when reducing with mean, max or min).
+        """
+        fg_made, fg_miss = self.get_fg_made_miss(df, player_name, team_name, game_id)
+        shots = pd.concat([fg_made, fg_miss])
+
+        grid = self._hex_grid(gridsize)
+        index = grid.bin_index(
+            shots[self.config["coord_x"]].to_numpy(),
+            shots[self.config["coord_y"]].to_numpy(),
+        )
+        values = self._shot_weights(shots, weights, index, grid)
+
+        return grid.offsets, grid.aggregate_index(index, values, reduce=reduce)
+
+    @instrumented()
+    def plot_points_per_shot(
+        self, df, player_name=None, team_name=None, game_id=None, title=None
+    ):
+        """
+        Plot the average points scored per field goal attempt in every hexbin.
+        """
+        offsets, values = self.get_hexbin_aggregate(
+            df,
+            weights="points",
+            reduce="mean",
+            player_name=player_name,
+            team_name=team_name,
+            game_id=game_id,
+        )
+
+        self.plot_hexbin(
+            offsets=offsets,
+            values=values,
+            title=title,
+            label="Points per Shot",
+            keep_zeros=True,
+        )
+
     def create_custom_cmap(self):
         colors = [
             (1, 1, 1),
@@ -420,6 +589,7 @@ class ShotChart:
         ]
         return LinearSegmentedColormap.from_list("custom_cmap", colors, N=256)
 
+    @instrumented()
     def plot_field_goal_heatmap(
         self,
         shots_df,
@@ -544,6 +714,7 @@ class ShotChart:
 
     # Remove the original hexbin collection (but preserve the color array)
 
+    @instrumented()
     def euroleague_field_goal_heatmap(
         self,
         df,
@@ -572,38 +743,193 @@ class ShotChart:
             sized=sized,
         )
 
-    def plot_hexbin(self, offsets, values, mincnt=0, title=None):
+    @instrumented()
+    def plot_hexbin(
+        self,
+        offsets,
+        values,
+        mincnt=0,
+        title=None,
+        gridsize=None,
+        grey_mask=None,
+        label="Shooting Efficiency",
+        keep_zeros=False,
+    ):
         """
-        Plot the efficiency using ax.hexbin with data from hexbin_data_with_coords.
+        Plot the efficiency with data from hexbin_data_with_coords.
+        The values are drawn as they are, without binning them again. The
+        configured gridsize is used unless a different gridsize is given; it has
+        to match the gridsize the offsets were computed with. mincnt is kept for
+        backwards compatibility and has no effect on precomputed values.
+        Hexagons where the optional boolean grey_mask is True are drawn in the
+        insignificant_color instead of the colormap. Hexagons with 0 values are
+        hidden unless keep_zeros is set, NaN values are always hidden.
         """
         # # Create the plot
         fig, ax = plt.subplots(figsize=self.config["figsize"])
 
+        grid = self._hex_grid(gridsize)
+
         # # Set hexagons with 0 values to NaN so they won't be plotted
-        values_filtered = np.array(values)
-        values_filtered[values_filtered == 0] = np.nan
-        vmax_value = np.nanmax(values_filtered)  # Max of non-zero values
+        values_filtered = np.ma.filled(np.ma.asarray(values, dtype=float), np.nan)
+        if not keep_zeros:
+            values_filtered[values_filtered == 0] = np.nan
+
+        values_scale = values_filtered
+        if grey_mask is not None:
+            grey_mask = np.asarray(grey_mask, dtype=bool) & ~np.isnan(values_filtered)
+            if grey_mask.any():
+                grid.draw(
+                    ax,
+                    np.where(grey_mask, 1.0, np.nan),
+                    offsets=offsets,
+                    edgecolors=self.config["edge_color"],
+                    linewidths=self.config["edge_thickness"],
+                    cmap=LinearSegmentedColormap.from_list(
+                        "insignificant", [self.config["insignificant_color"]] * 2
+                    ),
+                )
+            # When every hexbin is greyed out, the scale spans the grey values
+            if grey_mask[~np.isnan(values_filtered)].all():
+                values_scale = values_filtered.copy()
+            values_filtered[grey_mask] = np.nan
+
+        # Max of non-zero values
+        vmax_value = np.nanmax(values_scale) if np.any(values_scale > 0) else 1.0
+
+        with stage("draw"):
+            hc = grid.draw(
+                ax,
+                values_filtered,
+                offsets=offsets,
+                edgecolors=self.config["edge_color"],
+                linewidths=self.config["edge_thickness"],
+                cmap=self.config["cmap"],
+                norm=SymLogNorm(
+                    linthresh=1e-2, linscale=1, vmin=0.1, vmax=vmax_value
+                ),
+            )
 
-        hc = ax.hexbin(
-            offsets[:, 0],
-            offsets[:, 1],
-            gridsize=self.config["gridsize"],
-            edgecolors=self.config["edge_color"],
-            linewidths=self.config["edge_thickness"],
-            C=values_filtered,
+            plt.colorbar(hc, ax=ax, label=label)
+
+            # Draw the court and set limits
+            self.draw_court(ax)
+        ax.set_xlim([-800, 800])
+        ax.set_ylim([-200, 1300])
+
+        ax.set_aspect("equal")
+
+        if title:
+            ax.set_title(
+                title,
+                fontsize=self.config["title"]["fontsize"],
+                fontweight=self.config["title"]["fontweight"],
+                color=self.config["title"]["color"],
+            )
+
+        self.fig = fig
+        self.ani = None
+        plt.show()
+
+    @instrumented()
+    def build_hexbin_pyramid(
+        self,
+        df,
+        gridsizes=(10, 15, 25, 40),
+        player_name=None,
+        team_name=None,
+        game_id=None,
+    ):
+        """
+        Bin the field goals of a player, team or game for several grid sizes at once.
+
+        Returns a HexbinPyramid whose levels can be plotted with plot_hexbin_level
+        without re-binning the raw shots.
+        """
+        fg_made, fg_miss = self.get_fg_made_miss(df, player_name, team_name, game_id)
+
+        return HexbinPyramid(
+            fg_made,
+            fg_miss,
+            gridsizes=gridsizes,
             extent=self.config["hexagon_extent"],
-            cmap=self.config["cmap"],
+            coord_x=self.config["coord_x"],
+            coord_y=self.config["coord_y"],
+        )
+
+    @instrumented()
+    def plot_hexbin_level(
+        self, pyramid, gridsize, values_key="values_ratio", mincnt=0, title=None
+    ):
+        """
+        Plot one zoom level of a HexbinPyramid.
+
+        Args:
+        - pyramid: HexbinPyramid returned by build_hexbin_pyramid.
+        - gridsize: The grid size of the level to plot.
+        - values_key: Which values color the hexagons (values_ratio, values_made,
+          values_missed or values_all).
+        - mincnt: Minimum count for hexagons.
+        - title: Title for the plot.
+        """
+        level = pyramid.level(gridsize)
+
+        self.plot_hexbin(
+            offsets=level["offsets"],
+            values=level[values_key],
             mincnt=mincnt,
-            norm=SymLogNorm(linthresh=1e-2, linscale=1, vmin=0.1, vmax=vmax_value),
+            title=title,
+            gridsize=gridsize,
         )
 
-        plt.colorbar(hc, ax=ax, label="Shooting Efficiency")
+    @instrumented()
+    def plot_entity_hexbin_form_animated(
+        self,
+        accumulator,
+        entity_name,
+        window=None,
+        values_key="values_ratio",
+        title=None,
+    ):
+        """
+        Animate the hexbin of a player or team game by game, one frame per game.
 
-        # Draw the court and set limits
+        Args:
+        - accumulator: HexbinAccumulator holding the per-game counts.
+        - entity_name: The player or team name.
+        - window: Number of games per frame (e.g. 10 for "last 10 games").
+          Defaults to the accumulator window; None animates the cumulative
+          season-to-date chart.
+        - values_key: Which values color the hexagons (values_ratio, values_made,
+          values_missed or values_all).
+        - title: Title for the plot.
+        """
+        game_ids, frames = accumulator.rolling_window_sequence(
+            entity_name, window=window
+        )
+        if not game_ids:
+            raise ValueError(f"No games available for '{entity_name}'.")
+
+        values_made, values_missed, values_all = (frames[:, i] for i in range(3))
+        frame_values = {
+            "values_made": values_made,
+            "values_missed": values_missed,
+            "values_all": values_all,
+            "values_ratio": np.ma.filled(
+                shooting_ratio(values_made, values_all), np.nan
+            ),
+        }[values_key]
+
+        # Set hexagons with 0 values to NaN so they won't be plotted
+        frame_values = np.where(frame_values == 0, np.nan, frame_values)
+        vmax_value = np.nanmax(frame_values)
+        offsets = accumulator.grid.offsets
+
+        fig, ax = plt.subplots(figsize=self.config["figsize"])
+        fig.patch.set_facecolor(self.config["court_background_color"])
         self.draw_court(ax)
         ax.set_xlim([-800, 800])
         ax.set_ylim([-200, 1300])
-
         ax.set_aspect("equal")
 
         if title:
@@ -614,11 +940,53 @@ class ShotChart:
                 color=self.config["title"]["color"],
             )
 
-        plt.show()
+        ims = []
+        for game_id, values in zip(game_ids, frame_values):
+            hc = accumulator.grid.draw(
+                ax,
+                values,
+                edgecolors=self.config["edge_color"],
+                linewidths=self.config["edge_thickness"],
+                cmap=self.config["cmap"],
+                norm=SymLogNorm(linthresh=1e-2, linscale=1, vmin=0.1, vmax=vmax_value),
+            )
+            label = ax.text(
+                0.02,
+                0.98,
+                f"{self.config['entity_type'].title()}: {entity_name}"
+                f" | Game: {game_id}",
+                transform=ax.transAxes,
+                ha="left",
+                va="top",
+            )
+            ims.append([hc, label])
+
+        self.ani = animation.ArtistAnimation(
+            fig,
+            ims,
+            interval=self.config["animation_interval"],
+            blit=self.config["animation_blit"],
+            repeat_delay=self.config["animation_repeat_delay"],
+        )
+        self.fig = fig
 
+    @instrumented()
     def plot_entity_hexbin(
-        self, df, offsets_col, color_col, entity_name, mincnt=0, title=None
+        self,
+        df,
+        offsets_col,
+        color_col,
+        entity_name,
+        mincnt=0,
+        title=None,
+        significance_col=None,
     ):
+        """
+        Plot the hexbin of a player or team colored by color_col.
+
+        When significance_col is given (e.g. ratio_significant from
+        get_hexbin_confidence), hexagons that are not significant are greyed out.
+        """
 
         entity_type = self.config["entity_type"]
         # Extract data for the chosen entity (player or team)
@@ -633,8 +1001,92 @@ class ShotChart:
         ]  # Assuming offsets are stored as a list of (x, y) tuples
         color_values = np.array(entity_data[color_col].values[0])  # 0 to 1 values
 
-        self.plot_hexbin(offsets=offsets, values=color_values, mincnt=mincnt)
+        grey_mask = None
+        if significance_col is not None:
+            grey_mask = ~np.asarray(entity_data[significance_col].values[0], dtype=bool)
+
+        self.plot_hexbin(
+            offsets=offsets, values=color_values, mincnt=mincnt, grey_mask=grey_mask
+        )
+
+    @instrumented()
+    def plot_entity_hexbin_grid(
+        self,
+        df,
+        entity_names,
+        offsets_col="offsets",
+        color_col="values_ratio",
+        subtitles=None,
+        ncols=3,
+        title=None,
+    ):
+        """
+        Plot the hexbins of several players or teams as a grid of small multiples.
 
+        Args:
+        - df: DataFrame returned by get_all_entity_hexbin_data.
+        - entity_names: Names of the players or teams to plot, in grid order.
+        - offsets_col: The name of the column containing the offsets (x, y).
+        - color_col: The name of the column containing the values for the color.
+        - subtitles: Optional list of subtitles, defaults to the entity names.
+        - ncols: Number of charts per row.
+        - title: Title for the whole figure.
+        """
+        entity_names = list(entity_names)
+        subtitles = subtitles or entity_names
+        nrows = int(np.ceil(len(entity_names) / ncols))
+        width, height = self.config["figsize"]
+
+        fig, axes = plt.subplots(
+            nrows,
+            ncols,
+            figsize=(width / 2 * ncols, height / 2 * nrows),
+            squeeze=False,
+        )
+        fig.patch.set_facecolor(self.config["court_background_color"])
+
+        entity_data = df.set_index(f"{self.config['entity_type']}_name")
+        grid = self._hex_grid()
+
+        for ax, entity_name, subtitle in zip(axes.flat, entity_names, subtitles):
+            offsets = entity_data.at[entity_name, offsets_col]
+            values = np.array(entity_data.at[entity_name, color_col], dtype=float)
+            values[values == 0] = np.nan
+
+            if np.any(~np.isnan(values)):
+                grid.draw(
+                    ax,
+                    values,
+                    offsets=offsets,
+                    edgecolors=self.config["edge_color"],
+                    linewidths=self.config["edge_thickness"] / 2,
+                    cmap=self.config["cmap"],
+                    norm=SymLogNorm(
+                        linthresh=1e-2, linscale=1, vmin=0.1, vmax=np.nanmax(values)
+                    ),
+                )
+
+            self.draw_court(ax)
+            ax.set_xlim([-800, 800])
+            ax.set_ylim([-200, 1300])
+            ax.set_title(subtitle, fontsize=self.config["title"]["fontsize"] * 0.7)
+
+        for ax in axes.flat[len(entity_names) :]:
+            ax.axis("off")
+
+        if title:
+            fig.suptitle(
+                title,
+                fontsize=self.config["title"]["fontsize"],
+                fontweight=self.config["title"]["fontweight"],
+                color=self.config["title"]["color"],
+            )
+
+        self.fig = fig
+        self.ani = None
+        plt.show()
+
+    @instrumented()
     def plot_entity_hexbin_sized(
         self,
         df,
@@ -685,23 +1137,17 @@ class ShotChart:
             color_values_filtered
         )  # Max of non-zero efficiency values
 
-        # Plot hexagons with filtered efficiency as color
-        hc = ax.hexbin(
-            offsets[:, 0],
-            offsets[:, 1],
-            gridsize=self.config["gridsize"],
+        # Hexagon template collection, it is not added to the axis
+        hc = self._hex_grid().collection(
+            ax,
+            color_values_filtered,
+            offsets=offsets,
             edgecolors="none",  # Prevent the edges from drawing
             linewidths=0,
-            C=color_values_filtered,  # Use filtered efficiency for color
-            extent=self.config["hexagon_extent"],
             cmap=self.config["cmap"],  # Your colormap
-            mincnt=mincnt,
             norm=SymLogNorm(linthresh=1e-2, linscale=1, vmin=0.1, vmax=vmax_value),
         )
 
-        # Remove the original hexbin collection
-        hc.remove()
-
         # Call the sized_hexbin function to adjust hexagon sizes based on filtered frequency
         size_values_filtered = np.copy(size_values)
         size_values_filtered[size_values_filtered == 0] = -1
@@ -732,8 +1178,11 @@ class ShotChart:
                 color=self.config["title"]["color"],
             )
 
+        self.fig = fig
+        self.ani = None
         plt.show()
 
+    @instrumented()
     def get_entity_hexbin_data(self, df, entity_name):
         """
         Filters the dataframe for a specific player and returns a dataframe
@@ -741,27 +1190,31 @@ class ShotChart:
         """
         # Filter the dataframe by player name
         entity_type = self.config["entity_type"]
+        count_rows("input", len(df))
 
-        if entity_type == "player":
-            df_entity = df[df[self.config["player_column_name"]] == entity_name]
-        elif entity_type == "team":
-            df_entity = df[df[self.config["team_column_name"]] == entity_name]
+        with stage("filter"):
+            if entity_type == "player":
+                df_entity = df[df[self.config["player_column_name"]] == entity_name]
+            elif entity_type == "team":
+                df_entity = df[df[self.config["team_column_name"]] == entity_name]
 
-        # Separate made and missed shots
-        fg_made, fg_miss = self.get_fg_made_miss(df_entity)
+            # Separate made and missed shots
+            fg_made, fg_miss = self.get_fg_made_miss(df_entity)
+        count_rows("filtered", len(df_entity))
 
-        # Get the hexbin offsets and values for made shots
-        made_hc = self.get_hexbin_from_data_points(fg_made)
-        values_made = made_hc.get_array()
+        with stage("binning"):
+            # Get the hexbin offsets and values for made shots
+            made_hc = self.get_hexbin_from_data_points(fg_made)
+            values_made = made_hc.get_array()
 
-        # Get the hexbin offsets and values for missed shots
-        miss_hc = self.get_hexbin_from_data_points(fg_miss)
-        values_missed = miss_hc.get_array()
+            # Get the hexbin offsets and values for missed shots
+            miss_hc = self.get_hexbin_from_data_points(fg_miss)
+            values_missed = miss_hc.get_array()
 
-        # Get the hexbin offsets and values for all shots
-        all_hc = self.get_hexbin_from_data_points(df_entity)
-        values_all = all_hc.get_array()
-        offsets_all = all_hc.get_offsets()
+            # Get the hexbin offsets and values for all shots
+            all_hc = self.get_hexbin_from_data_points(df_entity)
+            values_all = all_hc.get_array()
+            offsets_all = all_hc.get_offsets()
 
         # this is for the case when there was only a few shots in a hexbin and they were misses
         adjustment = np.where(values_all != 0, 1, 0) * 0.001
@@ -785,6 +1238,7 @@ class ShotChart:
 
         return result_df
 
+    @instrumented()
     def get_all_entity_hexbin_data(self, df):
         """
         Processes the shot data for all players and returns a dataframe containing:
@@ -860,6 +1314,259 @@ class ShotChart:
 
         return normalized_df
 
+    @instrumented()
+    def get_percentile_ranks(self, all_entities_df, metric="ratio", min_attempts=1):
+        """
+        Ranks every player (or team) against the rest of the league in each hexbin.
+
+        For every hexbin, each qualifying entity gets its percentile among all
+        qualifying entities, so 1 means "best in the league here". Only entities
+        with at least min_attempts shots in a hexbin qualify, the others get NaN.
+        Ties share their average rank.
+
+        Returns a dataframe with the entity name, offsets and the
+        percentile_values_{metric} column, which can be used as color_col of
+        plot_entity_hexbin.
+        """
+        metrics = {
+            "ratio": "values_ratio",
+            "made": "values_made",
+            "missed": "values_missed",
+            "all": "values_all",
+        }
+        entity_type = self.config["entity_type"]
+
+        # Stack the entities into (entities x hexbins) matrices
+        values = np.vstack(
+            [
+                np.ma.filled(np.ma.asarray(v, dtype=float), np.nan)
+                for v in all_entities_df[metrics[metric]]
+            ]
+        )
+        attempts = np.vstack(
+            [np.ma.filled(v, 0) for v in all_entities_df["values_all"]]
+        )
+
+        qualified = (attempts >= min_attempts) & ~np.isnan(values)
+        values = np.where(qualified, values, np.nan)
+        n_qualified = qualified.sum(axis=0)
+
+        # NaNs are sorted last, so the first n_qualified rows of every column are
+        # the qualifying entities in ascending order
+        order = np.argsort(values, axis=0, kind="stable")
+        sorted_values = np.take_along_axis(values, order, axis=0)
+        n_entities = values.shape[0]
+        positions = np.broadcast_to(np.arange(n_entities)[:, None], values.shape)
+
+        # Tied values share the average of their first and last position
+        new_run = np.ones(values.shape, dtype=bool)
+        new_run[1:] = sorted_values[1:] != sorted_values[:-1]
+        run_start = np.maximum.accumulate(np.where(new_run, positions, 0), axis=0)
+        run_end_mark = np.ones(values.shape, dtype=bool)
+        run_end_mark[:-1] = new_run[1:]
+        run_end = np.minimum.accumulate(
+            np.where(run_end_mark, positions, n_entities)[::-1], axis=0
+        )[::-1]
+        sorted_ranks = (run_start + run_end) / 2
+
+        # Mid-rank percentiles, (rank + 0.5) / n, in (0, 1)
+        sorted_percentiles = (sorted_ranks + 0.5) / np.maximum(n_qualified, 1)
+        sorted_percentiles[positions >= n_qualified] = np.nan
+
+        percentiles = np.empty_like(sorted_percentiles)
+        np.put_along_axis(percentiles, order, sorted_percentiles, axis=0)
+
+        return pd.DataFrame(
+            {
+                f"{entity_type}_name": all_entities_df[f"{entity_type}_name"].values,
+                "offsets": all_entities_df["offsets"].values,
+                f"percentile_values_{metric}": list(percentiles),
+            }
+        )
+
+    @instrumented()
+    def get_shrunk_hexbin_data(
+        self, all_entities_df, prior_strength=None, max_prior_strength=1000
+    ):
+        """
+        Shrinks the per-hexbin shooting percentages towards the league
+        (empirical Bayes).
+
+        A beta prior is fitted for every hexbin from the league's made/attempt
+        matrix with the method of moments: its mean is the league percentage in
+        the hexbin, and its strength (alpha + beta) follows from how much the
+        entities' percentages vary beyond binomial noise. Each entity then gets
+        the posterior mean (made + alpha) / (attempts + alpha + beta), so
+        hexbins with one or two attempts no longer show extreme efficiencies.
+
+        Args:
+        - all_entities_df: DataFrame returned by get_all_entity_hexbin_data.
+        - prior_strength: Fixed alpha + beta for every hexbin instead of the fitted one.
+        - max_prior_strength: Upper bound for the fitted alpha + beta (used where
+          the league shows no variation beyond noise).
+
+        Returns a copy of all_entities_df with a values_ratio_shrunk column (NaN
+        in hexbins without attempts), which can be used as color_col of
+        plot_entity_hexbin and plot_entity_hexbin_sized.
+        """
+        made = np.vstack([np.ma.filled(v, 0) for v in all_entities_df["values_made"]])
+        missed = np.vstack(
+            [np.ma.filled(v, 0) for v in all_entities_df["values_missed"]]
+        )
+        attempts = made + missed
+
+        league_made = made.sum(axis=0)
+        league_attempts = attempts.sum(axis=0)
+
+        # Prior mean: league percentage per hexbin (overall percentage where empty)
+        overall_ratio = league_made.sum() / max(league_attempts.sum(), 1)
+        prior_mean = np.divide(
+            league_made,
+            league_attempts,
+            out=np.full(league_made.shape, overall_ratio, dtype=float),
+            where=league_attempts > 0,
+        )
+
+        if prior_strength is None:
+            # Attempt-weighted variance of the entity percentages per hexbin
+            ratios = np.divide(
+                made, attempts, out=np.zeros_like(made, dtype=float), where=attempts > 0
+            )
+            weighted_variance = np.divide(
+                (attempts * (ratios - prior_mean) ** 2).sum(axis=0),
+                league_attempts,
+                out=np.zeros_like(prior_mean),
+                where=league_attempts > 0,
+            )
+            # Remove the part of the variance explained by binomial noise
+            n_shooting = (attempts > 0).sum(axis=0)
+            binomial = prior_mean * (1 - prior_mean)
+            noise_variance = np.divide(
+                binomial * n_shooting,
+                league_attempts,
+                out=np.zeros_like(prior_mean),
+                where=league_attempts > 0,
+            )
+            between_variance = weighted_variance - noise_variance
+
+            strength = np.full(prior_mean.shape, float(max_prior_strength))
+            spread = between_variance > 0
+            strength[spread] = binomial[spread] / between_variance[spread] - 1
+            strength = np.clip(strength, 1e-3, max_prior_strength)
+        else:
+            strength = np.full(prior_mean.shape, float(prior_strength))
+
+        alpha = prior_mean * strength
+        beta = (1 - prior_mean) * strength
+        shrunk = (made + alpha) / (attempts + alpha + beta)
+
+        # NaN rather than a mask: the plots read the column with np.array, which
+        # drops masks and would color every empty hexbin with the prior
+        shrunk_df = all_entities_df.copy()
+        shrunk_df["values_ratio_shrunk"] = list(np.where(attempts > 0, shrunk, np.nan))
+        return shrunk_df
+
+    @instrumented()
+    def get_hexbin_confidence(
+        self,
+        all_entities_df,
+        n_replicates=1000,
+        confidence=0.95,
+        seed=None,
+        prior_strength=2,
+        min_attempts=5,
+    ):
+        """
+        Bootstraps confidence intervals for the per-hexbin shooting percentages.
+
+        The shots of every entity in a hexbin are resampled with binomial draws
+        of shape (n_replicates, hexbins), so no Python loop runs over the
+        replicates or the entities, and hexbins with the same attempts and
+        makes share one set of draws. The shots are resampled from the
+        percentage smoothed with prior_strength pseudo-attempts at the league
+        percentage of the hexbin, so a 1-for-1 or 5-for-5 hexbin gets a wide
+        interval instead of a single point (0 gives the plain bootstrap). A
+        hexbin is significant when it has at least min_attempts attempts and
+        the league percentage in that hexbin lies outside the entity's interval.
+
+        Args:
+        - all_entities_df: DataFrame returned by get_all_entity_hexbin_data.
+        - n_replicates: Number of bootstrap replicates.
+        - confidence: Width of the confidence interval.
+        - seed: Seed for the random generator, for reproducible intervals.
+        - prior_strength: Pseudo-attempts at the league percentage added before
+          resampling.
+        - min_attempts: Hexbins with fewer attempts are never significant.
+
+        Returns a copy of all_entities_df with the ratio_ci_low, ratio_ci_high and
+        ratio_significant columns. The bootstrap parameters are stored in
+        attrs["hexbin_confidence"], so the result can be cached with the data.
+        """
+        rng = np.random.default_rng(seed)
+        tail = (1 - confidence) / 2
+
+        made = np.vstack([np.ma.filled(v, 0) for v in all_entities_df["values_made"]])
+        missed = np.vstack(
+            [np.ma.filled(v, 0) for v in all_entities_df["values_missed"]]
+        )
+        attempts = made + missed
+
+        league_attempts = attempts.sum(axis=0)
+        league_ratio = np.divide(
+            made.sum(axis=0),
+            league_attempts,
+            out=np.full(league_attempts.shape, np.nan),
+            where=league_attempts > 0,
+        )
+
+        ci_low = np.full(attempts.shape, np.nan)
+        ci_high = np.full(attempts.shape, np.nan)
+
+        # The resampled percentages of a hexbin only depend on its (hexbin,
+        # attempts, made) triple, so every distinct triple is resampled once
+        shot = attempts > 0
+        hexbins = np.broadcast_to(np.arange(attempts.shape[1]), attempts.shape)
+        triples, triple_index = np.unique(
+            np.column_stack([hexbins[shot], attempts[shot], made[shot]]).astype(int),
+            axis=0,
+            return_inverse=True,
+        )
+        hexbin, n, k = triples[:, 0], triples[:, 1], triples[:, 2]
+        smoothed = (k + prior_strength * league_ratio[hexbin]) / (n + prior_strength)
+
+        # Replicates of a chunk of triples at a time, to bound the draws matrix
+        triple_low = np.empty(len(triples))
+        triple_high = np.empty(len(triples))
+        chunk_size = max(1, BOOTSTRAP_CHUNK // n_replicates)
+        for start in range(0, len(triples), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            draws = rng.binomial(
+                n[chunk], smoothed[chunk], size=(n_replicates, len(n[chunk]))
+            )
+            triple_low[chunk], triple_high[chunk] = (
+                np.quantile(draws, [tail, 1 - tail], axis=0) / n[chunk]
+            )
+
+        ci_low[shot] = triple_low[triple_index.ravel()]
+        ci_high[shot] = triple_high[triple_index.ravel()]
+
+        significant = (attempts >= min_attempts) & (
+            (league_ratio < ci_low) | (league_ratio > ci_high)
+        )
+
+        confidence_df = all_entities_df.copy()
+        confidence_df["ratio_ci_low"] = list(ci_low)
+        confidence_df["ratio_ci_high"] = list(ci_high)
+        confidence_df["ratio_significant"] = list(significant)
+        confidence_df.attrs["hexbin_confidence"] = {
+            "n_replicates": n_replicates,
+            "confidence": confidence,
+            "seed": seed,
+            "prior_strength": prior_strength,
+            "min_attempts": min_attempts,
+        }
+        return confidence_df
+
     def _minmax_scale_normalized_values(self, normalized_df, metric="made"):
         """
         Applies Min-Max scaling to normalized values for each hexbin to see who performs the best per bin.
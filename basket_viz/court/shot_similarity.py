@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+
+class ShotProfileIndex:
+    """
+    Index of shot-location profiles for "players who shoot like X" queries.
+
+    Every entity's hexbin vector from ``ShotChart.get_all_entity_hexbin_data`` is
+    normalized to a distribution over the hexagons, and the whole league is kept
+    as a single (entities x cells) matrix. A cosine query is one matrix-vector
+    product against the pre-normalized rows. The Jensen-Shannon distance is
+    computed for all entities at once with array operations.
+
+    Args:
+    - all_entities_df: DataFrame returned by get_all_entity_hexbin_data.
+    - entity_type: "player" or "team", selects the name column.
+    - values_col: Column holding the per-hexagon counts that define a profile.
+    """
+
+    def __init__(self, all_entities_df, entity_type="player", values_col="values_all"):
+        self.entity_type = entity_type
+        self.names = all_entities_df[f"{entity_type}_name"].to_numpy()
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+        counts = np.vstack(
+            [np.ma.filled(values, 0) for values in all_entities_df[values_col]]
+        ).astype(np.float32)
+        self.attempts = counts.sum(axis=1)
+
+        totals = np.where(self.attempts > 0, self.attempts, 1)[:, None]
+        self.profiles = counts / totals
+
+        norms = np.linalg.norm(self.profiles, axis=1, keepdims=True)
+        self._unit_profiles = self.profiles / np.where(norms > 0, norms, 1)
+
+    def _position(self, entity_name):
+        if entity_name not in self._positions:
+            raise KeyError(f"Unknown {self.entity_type}: '{entity_name}'")
+        return self._positions[entity_name]
+
+    def cosine_distances(self, entity_name):
+        """Cosine distance between the entity and every indexed entity."""
+        query = self._unit_profiles[self._position(entity_name)]
+        return 1.0 - self._unit_profiles @ query
+
+    def jensen_shannon_distances(self, entity_name):
+        """Jensen-Shannon distance (base 2) between the entity and every entity."""
+        query = self.profiles[self._position(entity_name)]
+        mixture = 0.5 * (self.profiles + query)
+        divergence = 0.5 * (
+            _entropy_terms(self.profiles, mixture).sum(axis=1)
+            + _entropy_terms(query[None, :], mixture).sum(axis=1)
+        )
+        return np.sqrt(np.clip(divergence, 0, None))
+
+    def query(self, entity_name, k=5, metric="cosine", min_attempts=0):
+        """
+        Return the k entities whose shot profile is closest to ``entity_name``.
+
+        Args:
+        - entity_name: The player or team to compare against.
+        - k: Number of matches to return.
+        - metric: "cosine" or "jensen_shannon".
+        - min_attempts: Only consider entities with at least this many attempts.
+
+        Returns a DataFrame with the entity name, distance and attempts of every
+        match, sorted from most to least similar.
+        """
+        if metric == "cosine":
+            distances = self.cosine_distances(entity_name)
+        elif metric == "jensen_shannon":
+            distances = self.jensen_shannon_distances(entity_name)
+        else:
+            raise ValueError(f"Unsupported metric: {metric}")
+
+        candidates = self.attempts >= min_attempts
+        candidates[self._position(entity_name)] = False
+        candidate_idx = np.flatnonzero(candidates)
+
+        k = min(k, len(candidate_idx))
+        if k == 0:
+            top = candidate_idx[:0]
+        else:
+            nearest = np.argpartition(distances[candidate_idx], k - 1)[:k]
+            top = candidate_idx[nearest]
+            top = top[np.argsort(distances[top], kind="stable")]
+
+        return pd.DataFrame(
+            {
+                f"{self.entity_type}_name": self.names[top],
+                "distance": distances[top],
+                "attempts": self.attempts[top],
+            }
+        )
+
+
+def _entropy_terms(p, m):
+    """Elementwise p * log2(p / m), with 0 where p is 0."""
+    safe_p = np.where(p > 0, p, 1)
+    safe_m = np.where(m > 0, m, 1)
+    return np.where(p > 0, p * np.log2(safe_p / safe_m), 0)
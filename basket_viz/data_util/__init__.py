@@ -0,0 +1,12 @@
+from .column_cache import ColumnCache, load_cached
+from .pbp_loader import (
+    load_play_by_play,
+    optimize_play_by_play,
+    validate_play_by_play,
+)
+from .shot_arrays import ShotArrays
+from .synthetic import (
+    generate_box_scores,
+    generate_play_by_play,
+    generate_radar_stats,
+)
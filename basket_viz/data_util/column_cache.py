@@ -0,0 +1,394 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR_ENV = "BASKET_VIZ_CACHE_DIR"
+
+
+def default_cache_dir(name):
+    """Directory of a basket_viz cache: $BASKET_VIZ_CACHE_DIR/<name> or ~/.cache."""
+    root = os.environ.get(CACHE_DIR_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "basket_viz"
+    )
+    return os.path.join(root, name)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _key_string(key):
+    """String form of a filter key, 3 and 3.0 both give "3"."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, (float, np.floating)) and float(key).is_integer():
+        return str(int(key))
+    return str(key)
+
+
+class ColumnCache:
+    """
+    Persistent columnar cache of parsed CSV files.
+
+    The first load of a file parses it once and writes every column to its own
+    ``.npy`` file (categoricals and strings as integer codes plus a JSON list of
+    categories), with the rows sorted by the game column. Later loads memory-map
+    only the requested columns and copy only the row ranges of the requested
+    games, so a warm load costs little more than reading those bytes.
+
+    Entries are keyed by the sha256 of the source file together with the reader
+    and its options, so a changed file is parsed again. The hash of a path is
+    remembered by size and modification time, so warm loads do not re-read the
+    source file either.
+
+    Args:
+    - cache_dir: Cache directory, defaults to ``$BASKET_VIZ_CACHE_DIR/columns``
+      or ``~/.cache/basket_viz/columns``.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir("columns")
+
+    def _source_hash(self, path):
+        # One small file per source path, written atomically, so concurrent
+        # loads of different files never overwrite each other's hashes
+        stat = os.stat(path)
+        source = os.path.abspath(path)
+        name = hashlib.sha256(source.encode()).hexdigest()
+        hash_path = os.path.join(self.cache_dir, "sources", f"{name}.json")
+
+        known = None
+        if os.path.exists(hash_path):
+            try:
+                with open(hash_path) as f:
+                    known = json.load(f)
+            except ValueError:
+                pass
+        if known and (known["source"], known["size"], known["mtime"]) == (
+            source,
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            return known["sha256"]
+
+        sha256 = file_sha256(path)
+        os.makedirs(os.path.dirname(hash_path), exist_ok=True)
+        self._write_json(
+            hash_path,
+            {
+                "source": source,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "sha256": sha256,
+            },
+        )
+        return sha256
+
+    @staticmethod
+    def _write_json(path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _option_name(value):
+        """
+        Stable name of a non-JSON read option: functions and types defined at
+        module level are keyed by their qualified name, anything else (lambdas,
+        local functions, arbitrary objects) would change the key on every run.
+        """
+        qualname = getattr(value, "__qualname__", "")
+        if callable(value) and qualname and "<" not in qualname:
+            return f"{value.__module__}.{qualname}"
+        raise TypeError(
+            f"Read option {value!r} cannot be part of a cache key, use JSON "
+            "values or functions defined at module level"
+        )
+
+    def key(self, path, reader=None, sort_by="GAME_ID", **read_kwargs):
+        """
+        Cache key of a source file read with the given reader and options.
+
+        Raises:
+        - TypeError: If a read option is neither JSON nor a module-level function.
+        """
+        reader = reader or pd.read_csv
+        options = json.dumps(
+            [self._option_name(reader), sort_by, read_kwargs],
+            sort_keys=True,
+            default=self._option_name,
+        )
+        options_hash = hashlib.sha256(options.encode()).hexdigest()[:16]
+        return f"{self._source_hash(path)}-{options_hash}"
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def build(self, path, reader=None, sort_by="GAME_ID", **read_kwargs):
+        """
+        Parse the source file and write its columns to the cache, unless they are
+        cached already. Returns the cache key.
+
+        Args:
+        - path: Source file.
+        - reader: Function reading the file into a DataFrame, defaults to
+          pandas.read_csv. E.g. ``basket_viz.data_util.load_play_by_play``.
+        - sort_by: Column the rows are sorted and indexed by, None to keep the
+          file order. Ignored if the file has no such column.
+        - read_kwargs: Passed to the reader.
+        """
+        key = self.key(path, reader=reader, sort_by=sort_by, **read_kwargs)
+        entry_dir = self._entry_dir(key)
+        if os.path.exists(os.path.join(entry_dir, "meta.json")):
+            return key
+
+        df = (reader or pd.read_csv)(path, **read_kwargs)
+        if sort_by not in df.columns:
+            sort_by = None
+        if sort_by is not None:
+            order = np.argsort(self._sort_values(df[sort_by]), kind="stable")
+            df = df.iloc[order]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".build-")
+        try:
+            columns = [
+                self._write_column(tmp_dir, f"col_{i}", df[column])
+                for i, column in enumerate(df.columns)
+            ]
+            meta = {
+                "source": os.path.abspath(path),
+                "n_rows": len(df),
+                "sort_by": sort_by,
+                "columns": dict(zip(map(str, df.columns), columns)),
+            }
+            self._write_json(os.path.join(tmp_dir, "meta.json"), meta)
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Another process finished the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.exists(os.path.join(entry_dir, "meta.json")):
+                raise
+        return key
+
+    @staticmethod
+    def _is_plain(values):
+        return (
+            pd.api.types.is_numeric_dtype(values)
+            or pd.api.types.is_bool_dtype(values)
+            or pd.api.types.is_datetime64_dtype(values)
+            or pd.api.types.is_timedelta64_dtype(values)
+        ) and not pd.api.types.is_extension_array_dtype(values)
+
+    def _sort_values(self, values):
+        if self._is_plain(values):
+            return values.to_numpy()
+        return self._as_categorical(values).codes
+
+    @staticmethod
+    def _as_categorical(values):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.array
+        categorical = pd.Categorical(values)
+        categories = categorical.categories
+        if categories.dtype == object and not all(
+            isinstance(c, str) for c in categories
+        ):
+            # Mixed-type object columns are stored by their string representation
+            categorical = pd.Categorical(values.map(str, na_action="ignore"))
+        return categorical
+
+    def _write_column(self, entry_dir, name, values):
+        if self._is_plain(values):
+            np.save(os.path.join(entry_dir, f"{name}.npy"), values.to_numpy())
+            return {"file": name, "kind": "plain"}
+
+        categorical = self._as_categorical(values)
+        np.save(os.path.join(entry_dir, f"{name}.npy"), categorical.codes)
+        categories = categorical.categories.tolist()
+        with open(os.path.join(entry_dir, f"{name}.categories.json"), "w") as f:
+            json.dump(categories, f, default=str)
+        is_categorical = isinstance(values.dtype, pd.CategoricalDtype)
+        return {
+            "file": name,
+            "kind": "categorical" if is_categorical else "string",
+            "ordered": bool(categorical.ordered),
+        }
+
+    @staticmethod
+    def _categories(entry_dir, column_meta):
+        categories_path = f"{column_meta['file']}.categories.json"
+        with open(os.path.join(entry_dir, categories_path)) as f:
+            return json.load(f)
+
+    def _read_column(self, entry_dir, column_meta, ranges=None, mask=None):
+        values = np.load(
+            os.path.join(entry_dir, f"{column_meta['file']}.npy"), mmap_mode="r"
+        )
+        if ranges is None:
+            values = np.array(values)
+        else:
+            values = np.concatenate(
+                [values[start:stop] for start, stop in ranges] or [values[:0]]
+            )
+        if mask is not None:
+            values = values[mask]
+        if column_meta["kind"] == "plain":
+            return values
+
+        categories = self._categories(entry_dir, column_meta)
+        categorical = pd.Categorical.from_codes(
+            values, categories=categories, ordered=column_meta["ordered"]
+        )
+        if column_meta["kind"] == "string":
+            return np.asarray(categorical, dtype=object)
+        return categorical
+
+    @staticmethod
+    def _as_stored(wanted, numeric, strings):
+        """
+        Filter keys converted to the type of the stored keys, e.g. game 3 to
+        "3" when the reader parsed the game ids as strings.
+
+        Raises:
+        - TypeError: If a key cannot be converted to a stored number.
+        """
+        if numeric:
+            try:
+                return [pd.to_numeric(k) if isinstance(k, str) else k for k in wanted]
+            except ValueError:
+                raise TypeError(
+                    f"Filter keys {wanted} do not match the numeric keys of the "
+                    "cached column"
+                ) from None
+        if strings:
+            return [_key_string(k) for k in wanted]
+        return wanted
+
+    def _codes(self, entry_dir, column_meta, wanted, dtype=None):
+        """
+        Values (plain columns of the given dtype) or codes (categoricals) of the
+        wanted keys.
+        """
+        wanted = list(wanted)
+        if column_meta["kind"] == "plain":
+            numeric = np.issubdtype(dtype, np.number)
+            return np.asarray(self._as_stored(wanted, numeric, strings=False))
+
+        categories = self._categories(entry_dir, column_meta)
+        stored = pd.Index(categories)
+        wanted = self._as_stored(
+            wanted,
+            numeric=pd.api.types.is_numeric_dtype(stored)
+            and not pd.api.types.is_bool_dtype(stored),
+            strings=stored.inferred_type == "string",
+        )
+        positions = {category: code for code, category in enumerate(categories)}
+        return np.array([positions[k] for k in wanted if k in positions], dtype=int)
+
+    def _game_ranges(self, entry_dir, meta, games):
+        sorted_column = meta["columns"][meta["sort_by"]]
+        keys = np.load(
+            os.path.join(entry_dir, f"{sorted_column['file']}.npy"), mmap_mode="r"
+        )
+        wanted = np.unique(self._codes(entry_dir, sorted_column, games, keys.dtype))
+        starts = np.searchsorted(keys, wanted, side="left")
+        stops = np.searchsorted(keys, wanted, side="right")
+        return [(int(a), int(b)) for a, b in zip(starts, stops) if b > a]
+
+    def load(
+        self,
+        path,
+        columns=None,
+        games=None,
+        teams=None,
+        game_column="GAME_ID",
+        team_column="TEAM",
+        reader=None,
+        **read_kwargs,
+    ):
+        """
+        Load a source file from the cache, parsing it on the first load.
+
+        Args:
+        - path: Source file.
+        - columns: Columns to load, all columns if None.
+        - games: Only load the rows of these games (values of game_column).
+        - teams: Only load the rows of these teams (values of team_column).
+        - game_column: Column the rows are sorted and indexed by. For box scores
+          this is e.g. "Gamecode".
+        - team_column: Column the teams filter applies to.
+        - reader, read_kwargs: How the source file is parsed, see :meth:`build`.
+
+        Raises:
+        - KeyError: If a requested or filter column is not in the file.
+        """
+        key = self.build(path, reader=reader, sort_by=game_column, **read_kwargs)
+        entry_dir = self._entry_dir(key)
+        with open(os.path.join(entry_dir, "meta.json")) as f:
+            meta = json.load(f)
+
+        available = meta["columns"]
+        columns = list(available) if columns is None else list(columns)
+        filter_columns = [game_column] * (games is not None)
+        filter_columns += [team_column] * (teams is not None)
+        missing = [c for c in columns + filter_columns if c not in available]
+        if missing:
+            raise KeyError(f"Columns not in the cached file: {missing}")
+
+        ranges = None
+        if games is not None:
+            if meta["sort_by"] == game_column:
+                ranges = self._game_ranges(entry_dir, meta, games)
+            else:
+                ranges = [(0, meta["n_rows"])]
+
+        mask = None
+        if games is not None and meta["sort_by"] != game_column:
+            game_meta = available[game_column]
+            values = self._read_column(entry_dir, game_meta, ranges)
+            mask = pd.Series(values).isin(list(games)).to_numpy()
+        if teams is not None:
+            team_meta = available[team_column]
+            codes = np.load(
+                os.path.join(entry_dir, f"{team_meta['file']}.npy"), mmap_mode="r"
+            )
+            if ranges is not None:
+                # No matching game gives no ranges, and an empty frame
+                codes = np.concatenate([codes[a:b] for a, b in ranges] or [codes[:0]])
+            team_mask = np.isin(
+                codes, self._codes(entry_dir, team_meta, teams, codes.dtype)
+            )
+            mask = team_mask if mask is None else mask & team_mask
+
+        return pd.DataFrame(
+            {
+                column: self._read_column(entry_dir, available[column], ranges, mask)
+                for column in columns
+            },
+            columns=columns,
+        )
+
+    def clear(self):
+        """Remove all cached files."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def load_cached(path, columns=None, games=None, teams=None, cache_dir=None, **kwargs):
+    """
+    Load a CSV through the default :class:`ColumnCache`, see ColumnCache.load.
+    """
+    return ColumnCache(cache_dir).load(
+        path, columns=columns, games=games, teams=teams, **kwargs
+    )
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+PLAY_BY_PLAY_COLUMNS = ["GAME_ID", "ID_ACTION", "COORD_X", "COORD_Y", "UTC"]
+COORD_COLUMNS = ["COORD_X", "COORD_Y"]
+CATEGORICAL_COLUMNS = ["GAME_ID", "ID_ACTION"]
+
+
+def _columns(player_column_name, team_column_name, extra_columns):
+    columns = [player_column_name, team_column_name] + PLAY_BY_PLAY_COLUMNS
+    columns += list(extra_columns)
+    # Keep the order, drop duplicates
+    return list(dict.fromkeys(columns))
+
+
+def _categorical_columns(player_column_name, team_column_name):
+    return [player_column_name, team_column_name] + CATEGORICAL_COLUMNS
+
+
+def _compact_coordinates(values):
+    """
+    Return the coordinates as int16 if they are whole numbers within the int16
+    range (court coordinates are in centimeters), else as float32.
+    """
+    values = pd.to_numeric(values, errors="raise").astype(np.float32)
+    finite = values[np.isfinite(values)]
+    whole = len(finite) == len(values) and np.array_equal(finite, np.round(finite))
+    in_range = len(finite) == 0 or np.abs(finite).max() <= np.iinfo(np.int16).max
+    if whole and in_range:
+        return values.astype(np.int16)
+    return values
+
+
+def _compact_timestamps(values):
+    """Store numeric UTC stamps (e.g. 20231005184512) as int64 instead of strings."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    numeric = pd.to_numeric(values, errors="coerce")
+    if numeric.isna().any():
+        return values
+    return numeric.astype(np.int64)
+
+
+def validate_play_by_play(
+    df, player_column_name="PLAYER", team_column_name="TEAM", extra_columns=()
+):
+    """
+    Check that a play-by-play DataFrame has the columns and dtypes the charts use.
+
+    Raises:
+    - KeyError: If a required column is missing.
+    - ValueError: If the coordinates are not numeric.
+    """
+    columns = _columns(player_column_name, team_column_name, extra_columns)
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise KeyError(f"Play-by-play data is missing the columns: {missing}")
+
+    for column in COORD_COLUMNS:
+        if not pd.api.types.is_numeric_dtype(df[column]):
+            raise ValueError(
+                f"Column '{column}' has dtype {df[column].dtype}, expected numbers."
+            )
+    return df
+
+
+def optimize_play_by_play(
+    df, player_column_name="PLAYER", team_column_name="TEAM", extra_columns=()
+):
+    """
+    Project a play-by-play DataFrame onto the chart columns and convert them to
+    compact dtypes: categoricals for ids and names, int16 or float32 for the
+    coordinates and int64 for numeric UTC stamps.
+
+    Args:
+    - df: Play-by-play DataFrame, e.g. from the EuroLeague API.
+    - player_column_name, team_column_name: The configured entity columns.
+    - extra_columns: Additional columns to keep as they are.
+
+    Returns a new DataFrame, the input is not modified.
+    """
+    columns = _columns(player_column_name, team_column_name, extra_columns)
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise KeyError(f"Play-by-play data is missing the columns: {missing}")
+
+    df = df[columns].copy()
+    for column in _categorical_columns(player_column_name, team_column_name):
+        if not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    for column in COORD_COLUMNS:
+        try:
+            df[column] = _compact_coordinates(df[column])
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Column '{column}' is not numeric: {e}") from e
+    df["UTC"] = _compact_timestamps(df["UTC"])
+
+    return validate_play_by_play(
+        df, player_column_name, team_column_name, extra_columns
+    )
+
+
+def load_play_by_play(
+    path,
+    player_column_name="PLAYER",
+    team_column_name="TEAM",
+    extra_columns=(),
+    **read_csv_kwargs,
+):
+    """
+    Load a play-by-play CSV with only the columns the charts use, in compact dtypes.
+
+    Only the needed columns are parsed, ids and names are parsed straight into
+    categoricals, so the full object-string table is never materialized. The
+    result works unchanged with ShotChart (get_fg_made_miss, the hexbin methods)
+    and the other chart classes.
+
+    Args:
+    - path: Path or buffer of the CSV file.
+    - player_column_name, team_column_name: The configured entity columns.
+    - extra_columns: Additional columns to load.
+    - read_csv_kwargs: Passed to pandas.read_csv (e.g. sep, compression).
+
+    Raises:
+    - KeyError: If a required column is missing from the file.
+    - ValueError: If the coordinates are not numeric.
+    """
+    columns = _columns(player_column_name, team_column_name, extra_columns)
+    categorical_columns = _categorical_columns(player_column_name, team_column_name)
+
+    df = pd.read_csv(
+        path,
+        usecols=lambda column: column in columns,
+        dtype={
+            **{column: "category" for column in categorical_columns},
+            **{column: np.float32 for column in COORD_COLUMNS},
+        },
+        **read_csv_kwargs,
+    )
+    return optimize_play_by_play(
+        df, player_column_name, team_column_name, extra_columns
+    )
@@ -0,0 +1,262 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from basket_viz.court.hex_grid import HexGrid, shooting_ratio
+
+# Fixed width of every array, one value per shot
+SHOT_ARRAY_DTYPES = {
+    "coord_x": "float32",
+    "coord_y": "float32",
+    "player": "int32",
+    "team": "int32",
+    "game": "int32",
+    "action": "int16",
+}
+# Arrays holding codes into a vocabulary of the catalog, with their source column
+CODED_ARRAYS = ("player", "team", "game", "action")
+
+
+class ShotArrays:
+    """
+    Shots stored as fixed-width binary arrays that are read through ``np.memmap``.
+
+    A directory holds one raw file per array (coordinates, player, team, game
+    and action codes) and a small ``catalog.json`` with the number of shots, the
+    dtypes and the vocabularies that map codes back to names. Nothing is loaded
+    until it is used, and several processes reading the same directory share
+    one copy of the data through the page cache.
+
+    New seasons or rounds are added with ``write(..., append=True)``. Codes never
+    change, new names are added to the end of the vocabularies.
+
+    Args:
+    - directory: Directory of the arrays, as written by :meth:`write`.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "catalog.json")) as f:
+            self.catalog = json.load(f)
+        self._codes = {
+            name: {value: code for code, value in enumerate(vocabulary)}
+            for name, vocabulary in self.catalog["vocabularies"].items()
+        }
+
+    def __len__(self):
+        return self.catalog["n_shots"]
+
+    def array(self, name):
+        """Read-only np.memmap of one array, e.g. "coord_x" or "player"."""
+        if name not in SHOT_ARRAY_DTYPES:
+            raise KeyError(f"Unknown shot array: '{name}'")
+        if len(self) == 0:
+            return np.empty(0, dtype=SHOT_ARRAY_DTYPES[name])
+        return np.memmap(
+            os.path.join(self.directory, f"{name}.bin"),
+            dtype=SHOT_ARRAY_DTYPES[name],
+            mode="r",
+            shape=(len(self),),
+        )
+
+    def vocabulary(self, name):
+        """Names of the codes of a coded array."""
+        return self.catalog["vocabularies"][name]
+
+    def codes(self, name, values):
+        """Codes of the given names in a coded array, unknown names are skipped."""
+        codes = self._codes[name]
+        return np.array([codes[v] for v in values if v in codes], dtype=int)
+
+    def mask(self, players=None, teams=None, games=None, actions=None):
+        """Boolean mask of the shots matching all of the given filters."""
+        mask = np.ones(len(self), dtype=bool)
+        for name, values in (
+            ("player", players),
+            ("team", teams),
+            ("game", games),
+            ("action", actions),
+        ):
+            if values is not None:
+                mask &= np.isin(self.array(name), self.codes(name, values))
+        return mask
+
+    def hexbin_counts(
+        self,
+        grid,
+        entity="player",
+        mask=None,
+        actions=None,
+        chunk_size=1 << 22,
+    ):
+        """
+        Per-entity hexbin counts, binned straight from the memory-mapped arrays.
+
+        The shots are processed in chunks, so the memory used does not depend on
+        the number of shots.
+
+        Args:
+        - grid: HexGrid to bin the coordinates with.
+        - entity: "player" or "team".
+        - mask: Optional boolean mask of the shots to count, see :meth:`mask`.
+        - actions: Only count these action ids (e.g. the made action ids).
+        - chunk_size: Number of shots binned at a time.
+
+        Returns an array of shape (n_entities, n_cells), rows in vocabulary order.
+        """
+        n_entities = len(self.vocabulary(entity))
+        counts = np.zeros(n_entities * grid.n_cells)
+        coord_x, coord_y = self.array("coord_x"), self.array("coord_y")
+        entities, action_codes = self.array(entity), self.array("action")
+        wanted_actions = None if actions is None else self.codes("action", actions)
+
+        for start in range(0, len(self), chunk_size):
+            stop = start + chunk_size
+            keep = entities[start:stop] >= 0
+            if mask is not None:
+                keep &= mask[start:stop]
+            if wanted_actions is not None:
+                keep &= np.isin(action_codes[start:stop], wanted_actions)
+            cells = grid.bin_index(
+                coord_x[start:stop][keep], coord_y[start:stop][keep]
+            )
+            inside = cells >= 0
+            rows = entities[start:stop][keep][inside]
+            flat = rows * grid.n_cells + cells[inside]
+            counts += np.bincount(flat, minlength=len(counts))
+
+        return counts.reshape(n_entities, grid.n_cells)
+
+    def entity_hexbin_data(self, shot_chart, mask=None, chunk_size=1 << 22):
+        """
+        Per-entity hexbin data in the layout of
+        ``ShotChart.get_all_entity_hexbin_data``, computed from the arrays.
+
+        The entity type, action ids, gridsize and hexagon extent are taken from
+        the config of the shot chart. Entities without shots are left out.
+        """
+        config = shot_chart.config
+        entity = config["entity_type"]
+        grid = HexGrid(config["gridsize"], config["hexagon_extent"])
+
+        made, missed, all_ = (
+            self.hexbin_counts(
+                grid, entity, mask=mask, actions=actions, chunk_size=chunk_size
+            )
+            for actions in (
+                config["made_action_ids"],
+                config["missed_action_ids"],
+                None,
+            )
+        )
+        rows = np.flatnonzero(all_.sum(axis=1) > 0)
+        names = self.vocabulary(entity)
+
+        return pd.DataFrame(
+            {
+                f"{entity}_name": [names[row] for row in rows],
+                "offsets": [grid.offsets] * len(rows),
+                "values_made": [np.ma.asarray(made[row]) for row in rows],
+                "values_missed": [np.ma.asarray(missed[row]) for row in rows],
+                "values_all": [np.ma.asarray(all_[row]) for row in rows],
+                "values_ratio": [
+                    shooting_ratio(made[row], all_[row]) for row in rows
+                ],
+            }
+        )
+
+    @classmethod
+    def write(
+        cls,
+        df,
+        directory,
+        append=False,
+        player_column_name="PLAYER",
+        team_column_name="TEAM",
+        coord_x="COORD_X",
+        coord_y="COORD_Y",
+    ):
+        """
+        Export play-by-play rows to memory-mappable arrays.
+
+        Args:
+        - df: Play-by-play DataFrame (e.g. from load_play_by_play).
+        - directory: Target directory.
+        - append: Add the rows to the arrays already in the directory instead
+          of replacing them.
+        - player_column_name, team_column_name: The configured entity columns.
+        - coord_x, coord_y: The coordinate columns.
+
+        Returns the ShotArrays of the directory.
+        """
+        source_columns = {
+            "player": player_column_name,
+            "team": team_column_name,
+            "game": "GAME_ID",
+            "action": "ID_ACTION",
+        }
+        missing = [
+            c for c in [coord_x, coord_y, *source_columns.values()] if c not in df
+        ]
+        if missing:
+            raise KeyError(f"Play-by-play data is missing the columns: {missing}")
+
+        catalog_path = os.path.join(directory, "catalog.json")
+        if append and os.path.exists(catalog_path):
+            with open(catalog_path) as f:
+                catalog = json.load(f)
+        else:
+            catalog = {
+                "n_shots": 0,
+                "dtypes": SHOT_ARRAY_DTYPES,
+                "vocabularies": {name: [] for name in CODED_ARRAYS},
+            }
+            append = False
+        os.makedirs(directory, exist_ok=True)
+
+        arrays = {
+            "coord_x": df[coord_x].to_numpy(dtype=float),
+            "coord_y": df[coord_y].to_numpy(dtype=float),
+        }
+        for name, column in source_columns.items():
+            vocabulary = catalog["vocabularies"][name]
+            arrays[name] = _encode(df[column], vocabulary)
+
+        for name, values in arrays.items():
+            path = os.path.join(directory, f"{name}.bin")
+            with open(path, "r+b" if append and os.path.exists(path) else "wb") as f:
+                # Drop the bytes of an earlier write that failed before its
+                # catalog update, so the new rows line up with n_shots
+                dtype = np.dtype(SHOT_ARRAY_DTYPES[name])
+                f.truncate(catalog["n_shots"] * dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(values.astype(dtype).tobytes())
+
+        # The catalog is replaced last, readers never see rows that are not
+        # fully written
+        catalog["n_shots"] += len(df)
+        tmp_path = f"{catalog_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(catalog, f)
+        os.replace(tmp_path, catalog_path)
+
+        return cls(directory)
+
+
+def _encode(values, vocabulary):
+    """
+    Codes of the values in the vocabulary, extending it with new values in
+    place. Missing values get the code -1.
+    """
+    codes = {value: code for code, value in enumerate(vocabulary)}
+    inverse, uniques = pd.factorize(values, use_na_sentinel=True)
+    # The last entry is the code of missing values (inverse -1)
+    unique_codes = np.full(len(uniques) + 1, -1)
+    for i, value in enumerate(uniques.tolist()):
+        if value not in codes:
+            codes[value] = len(vocabulary)
+            vocabulary.append(value)
+        unique_codes[i] = codes[value]
+    return unique_codes[inverse]
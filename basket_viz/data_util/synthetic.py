@@ -0,0 +1,357 @@
+import numpy as np
+import pandas as pd
+
+TEAM_CODES = [
+    "IST", "MAD", "BAR", "OLY", "PAN", "MCO", "ULK", "TEL", "BAS",
+    "MIL", "ZAL", "VIR", "RED", "BER", "PAR", "ASV", "MUN", "PAM",
+]  # fmt: skip
+
+_SYLLABLES = [
+    "BA", "DO", "KI", "LE", "MA", "NO", "RA", "SE", "TO", "VU", "JO", "ZE",
+    "LI", "NE", "PA", "RO", "SA", "TI", "DE", "GO", "KA", "MI", "NI", "VO",
+]  # fmt: skip
+
+# Shot types with their points, league make rate and share of all attempts
+SHOT_TYPES = {
+    "rim": {"points": 2, "make": 0.62, "share": 0.30},
+    "mid": {"points": 2, "make": 0.41, "share": 0.22},
+    "three": {"points": 3, "make": 0.35, "share": 0.33},
+    "free_throw": {"points": 1, "make": 0.77, "share": 0.15},
+}
+# Made and missed action id of every point value, in code order
+ACTIONS = ["FTM", "FTA", "2FGM", "2FGA", "3FGM", "3FGA"]
+
+
+def _names(rng, n, n_syllables):
+    picks = rng.integers(0, len(_SYLLABLES), size=(n, n_syllables))
+    return ["".join(_SYLLABLES[i] for i in row) for row in picks]
+
+
+def _rosters(rng, n_teams, players_per_team):
+    teams = TEAM_CODES[:n_teams] + [
+        f"T{i:02d}" for i in range(len(TEAM_CODES), n_teams)
+    ]
+    n_players = n_teams * players_per_team
+    # Names in the EuroLeague format ("NEDOVIC, NEMANJA"), made unique
+    players = [
+        f"{surname}{i}, {first_name}"
+        for i, (surname, first_name) in enumerate(
+            zip(_names(rng, n_players, 3), _names(rng, n_players, 2))
+        )
+    ]
+    return teams, players
+
+
+def _shot_coordinates(rng, kinds):
+    """Court coordinates (cm, hoop at the origin) of shots of the given kinds."""
+    n = len(kinds)
+    rim, mid, three, free_throw = (kinds == k for k in range(len(SHOT_TYPES)))
+
+    radius = np.zeros(n)
+    radius[rim] = np.abs(rng.normal(0, 70, rim.sum()))
+    radius[mid] = rng.uniform(150, 640, mid.sum())
+    radius[three] = 675 + np.abs(rng.normal(0, 60, three.sum()))
+    theta = rng.uniform(0.0, np.pi, n)
+    x = np.cos(theta)
+    x *= radius
+    # theta is not needed anymore, y reuses its memory
+    y = np.sin(theta, out=theta)
+    y *= radius
+    del radius
+
+    # Threes close to the baseline are taken from the corners
+    corner = three & (y < 150)
+    side = np.where(x[corner] < 0, -1, 1)
+    x[corner] = side * (660 + np.abs(rng.normal(0, 20, corner.sum())))
+    y[corner] = rng.uniform(-100, 150, corner.sum())
+
+    x[free_throw] = rng.normal(0, 5, free_throw.sum())
+    y[free_throw] = rng.normal(460, 5, free_throw.sum())
+
+    return np.round(x).astype(np.int16), np.round(y).astype(np.int16)
+
+
+def _utc(season_start, game, games_per_round, seconds):
+    """YYYYMMDDhhmmss stamps, every round is played a week after the previous."""
+    n_games = game.max() + 1 if len(game) else 0
+    dates = pd.to_datetime(season_start) + pd.to_timedelta(
+        np.arange(n_games) // games_per_round * 7, unit="D"
+    )
+    day = (dates.year * 10000 + dates.month * 100 + dates.day).to_numpy(np.int64)
+
+    seconds = seconds.astype(np.int64) + 20 * 3600  # tip-off at 20:00
+    hhmmss = seconds // 3600 * 10000 + seconds % 3600 // 60 * 100 + seconds % 60
+    return day[game] * 1_000_000 + hhmmss
+
+
+def generate_play_by_play(
+    n_games=1,
+    n_rows=None,
+    n_teams=18,
+    players_per_team=12,
+    shots_per_game=180,
+    season_start="2023-10-05",
+    seed=0,
+):
+    """
+    Generate reproducible shot play-by-play in the EuroLeague layout.
+
+    Every player has a shot profile (preferred shot types), a usage and a skill,
+    so hexbins, efficiencies and similarity searches behave like on real data.
+    The rows are generated with array operations, 10M rows take a few seconds.
+
+    Args:
+    - n_games: Number of games.
+    - n_rows: Total number of rows. If given, the number of games follows from
+      it and n_games is ignored.
+    - n_teams: Number of teams in the league.
+    - players_per_team: Roster size.
+    - shots_per_game: Average number of field goal and free throw attempts.
+    - season_start: Date of the first round, every round is a week later.
+    - seed: Random seed, the same seed gives the same data.
+
+    Returns a DataFrame with the columns GAME_ID, TEAM, PLAYER, ID_ACTION,
+    POINTS (points of the made shots), COORD_X, COORD_Y and UTC (YYYYMMDDhhmmss
+    as int64, increasing within a game). TEAM, PLAYER and ID_ACTION are
+    categoricals.
+    """
+    rng = np.random.default_rng(seed)
+    teams, players = _rosters(rng, n_teams, players_per_team)
+
+    if n_rows is not None:
+        n_games = max(1, int(np.ceil(n_rows / shots_per_game)))
+    rows_per_game = rng.poisson(shots_per_game, n_games)
+    if n_rows is not None:
+        # Fix the row count: cut or extend the last games
+        surplus = rows_per_game.sum() - n_rows
+        rows_per_game[-1] -= surplus
+        while rows_per_game[-1] < 0:
+            rows_per_game[-2] += rows_per_game[-1]
+            rows_per_game = rows_per_game[:-1]
+        n_games = len(rows_per_game)
+    n = int(rows_per_game.sum())
+    # Row arrays use the smallest dtypes that fit, temporaries are dropped as
+    # soon as possible, so the peak memory stays a small multiple of the frame
+    game = np.repeat(np.arange(n_games, dtype=np.int32), rows_per_game)
+
+    # Two different teams per game
+    home = rng.integers(0, n_teams, n_games).astype(np.int16)
+    away = (home + rng.integers(1, n_teams, n_games)).astype(np.int16) % n_teams
+    team = np.where(rng.random(n) < 0.5, home[game], away[game])
+
+    def pick(weights, rows, chunk_size=1 << 20):
+        """
+        Inverse-CDF draw of one category per row, from the weights of the row's
+        group. The CDF of group g is shifted to (g, g + 1], so a single
+        searchsorted over all groups draws every row without materializing a
+        (rows, categories) matrix. Rows are drawn in chunks to bound the
+        temporaries.
+        """
+        n_groups, n_categories = weights.shape
+        cumulative = np.cumsum(weights, axis=1)
+        cumulative /= cumulative[:, -1:]
+        shifted = (cumulative + np.arange(n_groups)[:, None]).ravel()
+
+        draws = np.empty(len(rows), dtype=np.int32)
+        for start in range(0, len(rows), chunk_size):
+            group = rows[start : start + chunk_size]
+            found = np.searchsorted(shifted, group + rng.random(len(group)))
+            draws[start : start + chunk_size] = np.clip(
+                found - group.astype(np.int64) * n_categories, 0, n_categories - 1
+            )
+        return draws
+
+    usage = rng.dirichlet(np.full(players_per_team, 2.0), n_teams)
+    player = team.astype(np.int32) * players_per_team + pick(usage, team)
+
+    shares = np.array([kind["share"] for kind in SHOT_TYPES.values()])
+    profiles = rng.dirichlet(shares * 20, len(players))
+    kinds = pick(profiles, player).astype(np.int8)
+
+    make_rates = np.array([kind["make"] for kind in SHOT_TYPES.values()])
+    skill = rng.normal(0, 0.05, len(players))
+    # Make probability of every (player, shot type) pair
+    make_probability = np.clip(make_rates[None, :] + skill[:, None], 0.05, 0.95)
+    made = rng.random(n) < make_probability[player, kinds]
+    points = np.array(
+        [kind["points"] for kind in SHOT_TYPES.values()], dtype=np.int8
+    )[kinds]
+    action = (points - 1) * 2 + ~made
+
+    coord_x, coord_y = _shot_coordinates(rng, kinds)
+    del kinds
+
+    # Order the shots of every game in time
+    seconds = rng.integers(0, 40 * 60, n).astype(np.int16)
+    order = np.lexsort((seconds, game))
+
+    columns = {
+        "GAME_ID": game[order].astype(np.int64) + 1,
+        "TEAM": pd.Categorical.from_codes(team[order], categories=teams),
+        "PLAYER": pd.Categorical.from_codes(player[order], categories=players),
+        "ID_ACTION": pd.Categorical.from_codes(action[order], categories=ACTIONS),
+        "POINTS": np.where(made, points, 0)[order].astype(np.int8),
+        "COORD_X": coord_x[order],
+        "COORD_Y": coord_y[order],
+    }
+    del team, player, action, made, points, coord_x, coord_y
+    columns["UTC"] = _utc(
+        season_start, game[order], max(1, n_teams // 2), seconds[order]
+    )
+    return pd.DataFrame(columns, copy=False)
+
+
+def generate_box_scores(play_by_play, seed=0):
+    """
+    Per game box scores of the players in a (synthetic) play-by-play, in the
+    layout PlayerStatsHeatmap expects (Team, Player, GAME_CODE, VS_TEAM).
+
+    Shooting stats and points are counted from the play-by-play. Rebounds,
+    assists, steals, turnovers, blocks, minutes and plus/minus are drawn
+    around values that grow with the player's shot volume.
+
+    Args:
+    - play_by_play: DataFrame as returned by generate_play_by_play.
+    - seed: Random seed of the stats that are not in the play-by-play.
+    """
+    rng = np.random.default_rng(seed)
+    keys = ["GAME_ID", "TEAM", "PLAYER"]
+
+    counts = (
+        play_by_play.groupby(keys + ["ID_ACTION"], observed=True)
+        .size()
+        .unstack("ID_ACTION", fill_value=0)
+        .reindex(columns=ACTIONS, fill_value=0)
+    )
+    box = pd.DataFrame(
+        {
+            "FieldGoalsMade2": counts["2FGM"],
+            "FieldGoalsAttempted2": counts["2FGM"] + counts["2FGA"],
+            "FieldGoalsMade3": counts["3FGM"],
+            "FieldGoalsAttempted3": counts["3FGM"] + counts["3FGA"],
+            "FreeThrowsMade": counts["FTM"],
+            "FreeThrowsAttempted": counts["FTM"] + counts["FTA"],
+        }
+    )
+    box["Points"] = (
+        2 * box["FieldGoalsMade2"] + 3 * box["FieldGoalsMade3"] + box["FreeThrowsMade"]
+    )
+
+    volume = box["FieldGoalsAttempted2"] + box["FieldGoalsAttempted3"]
+    n = len(box)
+    box["TotalRebounds"] = rng.poisson(1 + 0.4 * volume)
+    box["Assistances"] = rng.poisson(0.5 + 0.25 * volume)
+    box["Steals"] = rng.poisson(0.8, n)
+    box["Turnovers"] = rng.poisson(0.5 + 0.15 * volume)
+    box["BlocksFavour"] = rng.poisson(0.3, n)
+    box["Minutes"] = np.clip(rng.normal(8 + 2 * volume, 4), 1, 40).round(1)
+    box["Plusminus"] = rng.normal(0, 8, n).round().astype(int)
+    missed = (
+        box["FieldGoalsAttempted2"]
+        + box["FieldGoalsAttempted3"]
+        + box["FreeThrowsAttempted"]
+        - box["FieldGoalsMade2"]
+        - box["FieldGoalsMade3"]
+        - box["FreeThrowsMade"]
+    )
+    box["Valuation"] = (
+        box["Points"]
+        + box["TotalRebounds"]
+        + box["Assistances"]
+        + box["Steals"]
+        + box["BlocksFavour"]
+        - box["Turnovers"]
+        - missed
+    )
+
+    box = box.reset_index().rename(
+        columns={"GAME_ID": "GAME_CODE", "TEAM": "Team", "PLAYER": "Player"}
+    )
+    box["Team"] = box["Team"].astype(str)
+    box["Player"] = box["Player"].astype(str)
+
+    # The opponent is the other team of the game
+    teams = box[["GAME_CODE", "Team"]].drop_duplicates()
+    opponents = teams.merge(teams, on="GAME_CODE", suffixes=("", "_vs"))
+    opponents = opponents[opponents["Team"] != opponents["Team_vs"]]
+    box = box.merge(
+        opponents.rename(columns={"Team_vs": "VS_TEAM"}),
+        on=["GAME_CODE", "Team"],
+        how="left",
+    )
+
+    columns = ["Team", "Player", "GAME_CODE", "VS_TEAM"]
+    return box[columns + [c for c in box.columns if c not in columns]]
+
+
+def generate_radar_stats(box_scores, image_url_template=None):
+    """
+    Per player averages of box scores in the layout RadarChart expects
+    (a "player" and a "player.imageUrl" column plus one column per stat).
+
+    Args:
+    - box_scores: DataFrame as returned by generate_box_scores.
+    - image_url_template: Optional format string for the image urls, e.g.
+      "https://example.com/{player_id}.png". None leaves the urls empty, so
+      nothing is downloaded.
+    """
+    grouped = box_scores.groupby("Player", sort=True)
+    totals = grouped[
+        [
+            "FieldGoalsMade2",
+            "FieldGoalsAttempted2",
+            "FieldGoalsMade3",
+            "FieldGoalsAttempted3",
+            "FreeThrowsMade",
+            "FreeThrowsAttempted",
+        ]
+    ].sum()
+    averages = grouped[
+        [
+            "Points",
+            "TotalRebounds",
+            "Assistances",
+            "Steals",
+            "Turnovers",
+            "BlocksFavour",
+            "Valuation",
+            "Minutes",
+        ]
+    ].mean()
+
+    def percentage(made, attempted):
+        attempts = totals[attempted].where(totals[attempted] > 0)
+        return (100 * totals[made] / attempts).round(1)
+
+    stats = pd.DataFrame(
+        {
+            "player": averages.index,
+            "team": grouped["Team"].first().to_numpy(),
+            "gamesPlayed": grouped.size().to_numpy(),
+            "pointsScored": averages["Points"].round(1).to_numpy(),
+            "totalRebounds": averages["TotalRebounds"].round(1).to_numpy(),
+            "assists": averages["Assistances"].round(1).to_numpy(),
+            "steals": averages["Steals"].round(1).to_numpy(),
+            "turnovers": averages["Turnovers"].round(1).to_numpy(),
+            "blocks": averages["BlocksFavour"].round(1).to_numpy(),
+            "pir": averages["Valuation"].round(1).to_numpy(),
+            "minutesPlayed": averages["Minutes"].round(1).to_numpy(),
+            "twoPointersPercentage": percentage(
+                "FieldGoalsMade2", "FieldGoalsAttempted2"
+            ).to_numpy(),
+            "threePointersPercentage": percentage(
+                "FieldGoalsMade3", "FieldGoalsAttempted3"
+            ).to_numpy(),
+            "freeThrowsPercentage": percentage(
+                "FreeThrowsMade", "FreeThrowsAttempted"
+            ).to_numpy(),
+        }
+    )
+    stats.insert(
+        1,
+        "player.imageUrl",
+        None
+        if image_url_template is None
+        else [image_url_template.format(player_id=i) for i in range(len(stats))],
+    )
+    return stats
@@ -1,8 +1,11 @@
 import os
 
+from basket_viz.instrumentation import instrumented, savefig, stage
+
 
 class LocalExport:
     @staticmethod
+    @instrumented()
     def save_plot(
         fig=None, ani=None, directory="output", file_name="shot_chart", file_format=None
     ):
@@ -14,9 +17,11 @@ class LocalExport:
                 file_format = "mp4"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
             if file_format == "gif":
-                ani.save(full_path, writer="pillow")
+                with stage("encode"):
+                    ani.save(full_path, writer="pillow")
             elif file_format == "mp4":
-                ani.save(full_path, writer="ffmpeg")
+                with stage("encode"):
+                    ani.save(full_path, writer="ffmpeg")
             else:
                 raise ValueError(
                     f"Unsupported file format for animation: {file_format}"
@@ -27,7 +32,7 @@ class LocalExport:
             if file_format is None:
                 file_format = "png"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
-            fig.savefig(full_path)
+            savefig(fig, full_path)
             print(f"Saved figure to {full_path}")
 
         else:
@@ -1,7 +1,14 @@
+from .atlas import ImageAtlas
+from .http_client import HTTPClient, fetch_all, get_client, set_client
+from .image_cache import ImageCache, OfflineCacheMiss, get_image_cache, set_image_cache
 from .img_patcher import (
     ImagePatcher,
     InlineImagePatcher,
+    ProcessedImageCache,
+    circular_logo_array,
     fetch_logo_image,
+    inline_image_key,
+    processed_images,
     render_bottom_images,
 )
 
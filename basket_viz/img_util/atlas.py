@@ -0,0 +1,104 @@
+import numpy as np
+from matplotlib.image import BboxImage
+from matplotlib.offsetbox import AnnotationBbox
+from matplotlib.transforms import Bbox
+from PIL import Image
+
+
+class ImageAtlas(BboxImage):
+    """
+    Many small images (logos, headshots) drawn as one image artist.
+
+    Every image is placed like an ``AnnotationBbox`` of an ``OffsetImage``:
+    centered on a point in the given coordinates and ``zoom`` points per image
+    pixel. At draw time the images are packed into a single texture covering
+    all of them, which is cached until the layout changes. Drawing cost and
+    the size of SVG/PDF output then no longer grow with one artist per image.
+
+    Args:
+    - ax: Axes the images belong to.
+    - transform: Transform of the image positions, e.g. ``ax.transAxes`` for
+      axes fractions or ``ax.transData`` (default) for data coordinates.
+    - kwargs: Passed to BboxImage, e.g. zorder.
+    """
+
+    def __init__(self, ax, transform=None, **kwargs):
+        kwargs.setdefault("clip_on", False)
+        # Stacked like the AnnotationBbox artists the atlas replaces
+        kwargs.setdefault("zorder", AnnotationBbox.zorder)
+        kwargs.setdefault("interpolation", "nearest")
+        super().__init__(self._atlas_bbox, **kwargs)
+        self.ax = ax
+        self.position_transform = transform or ax.transData
+        self.entries = []
+        self._texture_key = None
+        self._texture_bbox = None
+
+    def add(self, image, xy, zoom=0.5):
+        """Add an image (PIL image or array) centered on xy."""
+        if not isinstance(image, Image.Image):
+            image = Image.fromarray(np.asarray(image))
+        self.entries.append((image.convert("RGBA"), tuple(xy), zoom))
+        self._texture_key = None
+        self.stale = True
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _boxes(self, renderer):
+        """Display extents (x0, y0, x1, y1) of the images."""
+        points_to_pixels = renderer.points_to_pixels(1.0)
+        centers = self.position_transform.transform(
+            [xy for _, xy, _ in self.entries]
+        )
+        boxes = []
+        for (image, _, zoom), (x, y) in zip(self.entries, centers):
+            half_width = image.width * zoom * points_to_pixels / 2
+            half_height = image.height * zoom * points_to_pixels / 2
+            boxes.append(
+                (x - half_width, y - half_height, x + half_width, y + half_height)
+            )
+        return boxes
+
+    def _atlas_bbox(self, renderer):
+        if not self.entries:
+            return Bbox.null()
+        boxes = np.array(self._boxes(renderer))
+        return Bbox.from_extents(
+            boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max()
+        )
+
+    def _texture(self, renderer, bbox):
+        # Vector backends embed images at a higher resolution than 72 dpi
+        scale = renderer.get_image_magnification()
+        width = max(1, int(np.ceil(bbox.width * scale)))
+        height = max(1, int(np.ceil(bbox.height * scale)))
+        texture = Image.new("RGBA", (width, height))
+
+        for (image, _, _), (x0, y0, x1, y1) in zip(
+            self.entries, self._boxes(renderer)
+        ):
+            size = (
+                max(1, round((x1 - x0) * scale)),
+                max(1, round((y1 - y0) * scale)),
+            )
+            if image.size != size:
+                image = image.resize(size, Image.LANCZOS)
+            # Texture rows run from the top of the bbox down
+            left = min(max(round((x0 - bbox.x0) * scale), 0), width - 1)
+            top = min(max(round((bbox.y1 - y1) * scale), 0), height - 1)
+            texture.alpha_composite(image, (left, top))
+        return np.asarray(texture)
+
+    def draw(self, renderer):
+        if not self.entries or not self.get_visible():
+            return
+        bbox = self._atlas_bbox(renderer)
+        key = (
+            tuple(np.round(self._boxes(renderer), 1).ravel()),
+            renderer.get_image_magnification(),
+        )
+        if key != self._texture_key:
+            self.set_data(self._texture(renderer, bbox))
+            self._texture_key = key
+        super().draw(renderer)
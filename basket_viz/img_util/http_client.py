@@ -0,0 +1,127 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds of every request without an explicit timeout
+DEFAULT_TIMEOUT = (5, 20)
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Concurrent downloads of fetch_all, below the connections kept per host
+MAX_WORKERS = 8
+
+
+class HTTPClient:
+    """
+    HTTP client shared by all image downloads of the package.
+
+    One ``requests.Session`` keeps a pool of keep-alive connections per host,
+    so the logos and headshots of a chart, which come from a few hosts, reuse
+    the same connections instead of doing a TLS handshake per image. Failed
+    connections and the statuses in ``RETRY_STATUSES`` are retried a bounded
+    number of times with exponential backoff, and every request has a timeout.
+
+    Args:
+    - timeout: Default timeout in seconds, or a (connect, read) tuple.
+    - retries: Number of retries of a failed request.
+    - backoff_factor: Base of the exponential backoff between retries, the
+      n-th retry waits ``backoff_factor * 2 ** (n - 1)`` seconds.
+    - pool_connections: Number of hosts a connection pool is kept for.
+    - pool_maxsize: Number of connections kept per host, should be at least
+      the number of threads downloading concurrently.
+    """
+
+    def __init__(
+        self,
+        timeout=DEFAULT_TIMEOUT,
+        retries=3,
+        backoff_factor=0.3,
+        pool_connections=10,
+        pool_maxsize=16,
+    ):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "basket-viz"
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, timeout=None, **kwargs):
+        """
+        GET a URL through the pooled session.
+
+        Raises:
+        - requests.HTTPError: If the final response has an error status.
+        - requests.RequestException: If the request failed after all retries.
+        """
+        response = self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def get_bytes(self, url, timeout=None):
+        """Body of a GET request."""
+        return self.get(url, timeout=timeout).content
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The shared HTTPClient, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
+
+
+def set_client(client):
+    """
+    Replace the shared HTTPClient, e.g. with different timeouts or retries.
+    Returns the previous client, which is not closed.
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    return previous
+
+
+def fetch_all(urls, fetch, max_workers=MAX_WORKERS):
+    """
+    Call ``fetch(url)`` for every distinct URL on a bounded thread pool.
+
+    Returns a dict of URL to the result of fetch, or to the exception it raised,
+    once all calls have finished. Repeated URLs are fetched once.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_urls))) as pool:
+        futures = {url: pool.submit(fetch, url) for url in unique_urls}
+
+    results = {}
+    for url, future in futures.items():
+        try:
+            results[url] = future.result()
+        except Exception as e:
+            results[url] = e
+    return results
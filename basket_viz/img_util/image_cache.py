@@ -0,0 +1,329 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+import numpy as np
+import requests
+
+from basket_viz.data_util.column_cache import default_cache_dir
+from basket_viz.img_util.http_client import get_client
+
+OFFLINE_ENV = "BASKET_VIZ_OFFLINE"
+MAX_SIZE_ENV = "BASKET_VIZ_IMAGE_CACHE_MB"
+DEFAULT_MAX_MB = 512
+# Seconds a cached image is served without asking the server whether it changed
+DEFAULT_MAX_AGE = 24 * 60 * 60
+# Share of max_mb an eviction shrinks the cache to, so a full cache is not
+# scanned again on every store
+EVICT_TO = 0.9
+
+
+class OfflineCacheMiss(LookupError):
+    """An image was requested in offline mode but is not in the cache."""
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ImageCache:
+    """
+    Persistent on-disk cache of downloaded images.
+
+    Image bodies are stored content-addressed (``blobs/<sha256>``), so the same
+    logo served under several URLs is stored once. Every URL has a small entry
+    with the sha256 of its body and the ``ETag`` / ``Last-Modified`` headers of
+    the response. Entries older than ``max_age`` are revalidated with a
+    conditional request, a ``304 Not Modified`` costs no download. If the
+    server cannot be reached, the cached copy is served.
+
+    The blobs are kept under ``max_mb``, the least recently used are evicted
+    first together with the entries pointing at them. Processed variants of
+    the images (e.g. circular logos) can be stored next to them and share the
+    same budget. The size of the cache is tracked as images are stored, so the
+    cache directory is only scanned when it is over budget. In offline mode
+    the network is never used and images that are not cached raise
+    :class:`OfflineCacheMiss`.
+
+    Args:
+    - cache_dir: Cache directory, defaults to ``$BASKET_VIZ_CACHE_DIR/images``
+      or ``~/.cache/basket_viz/images``.
+    - max_mb: Size cap in megabytes, defaults to ``$BASKET_VIZ_IMAGE_CACHE_MB``
+      or 512.
+    - offline: Only serve from the cache, defaults to ``$BASKET_VIZ_OFFLINE``.
+    - max_age: Seconds before a cached image is revalidated, None to never
+      revalidate.
+    - client: HTTPClient used for downloads, defaults to the shared client.
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        max_mb=None,
+        offline=None,
+        max_age=DEFAULT_MAX_AGE,
+        client=None,
+    ):
+        self.cache_dir = cache_dir or default_cache_dir("images")
+        if max_mb is None:
+            max_mb = float(os.environ.get(MAX_SIZE_ENV) or DEFAULT_MAX_MB)
+        self.max_bytes = int(max_mb * 2**20)
+        self.offline = _env_flag(OFFLINE_ENV) if offline is None else offline
+        self.max_age = max_age
+        self._client = client
+        self._evict_lock = threading.Lock()
+        # Size of the blobs in bytes, scanned on first use and then tracked
+        self._size = None
+
+    @property
+    def client(self):
+        return self._client or get_client()
+
+    def _entry_path(self, url):
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, "entries", f"{name}.json")
+
+    def _blob_path(self, sha256):
+        return os.path.join(self.cache_dir, "blobs", sha256)
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _read_entry(self, url):
+        try:
+            with open(self._entry_path(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url or not os.path.exists(
+            self._blob_path(entry["sha256"])
+        ):
+            return None
+        return entry
+
+    def _read_blob(self, entry):
+        path = self._blob_path(entry["sha256"])
+        with open(path, "rb") as f:
+            content = f.read()
+        # The modification time of a blob is its last use, for the LRU eviction
+        os.utime(path)
+        return content
+
+    def _store(self, url, response):
+        return self._put(
+            url,
+            response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def _put(self, url, content, etag=None, last_modified=None):
+        sha256 = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(sha256)
+        try:
+            os.utime(blob_path)
+        except FileNotFoundError:
+            self._write(blob_path, content)
+            self._add_size(len(content))
+
+        entry = {
+            "url": url,
+            "sha256": sha256,
+            "etag": etag,
+            "last_modified": last_modified,
+            "checked": time.time(),
+        }
+        self._write(self._entry_path(url), json.dumps(entry).encode())
+        if self._size is not None and self._size > self.max_bytes:
+            self.evict()
+        return content
+
+    def _add_size(self, n_bytes):
+        with self._evict_lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += n_bytes
+
+    def _revalidate(self, url, entry, timeout):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.client.get(url, timeout=timeout, headers=headers)
+        except requests.RequestException as e:
+            print(f"⚠️ could not revalidate {url}, serving cached copy: {e}")
+            return self._read_blob(entry)
+
+        if response.status_code == 304:
+            entry["checked"] = time.time()
+            self._write(self._entry_path(url), json.dumps(entry).encode())
+            return self._read_blob(entry)
+        return self._store(url, response)
+
+    def get(self, url, timeout=None):
+        """
+        Body of an image URL, from the cache when possible.
+
+        Raises:
+        - OfflineCacheMiss: In offline mode, if the URL is not cached.
+        - requests.RequestException: If a download that is not cached fails.
+        """
+        entry = self._read_entry(url)
+        if entry is not None:
+            fresh = self.max_age is None or (
+                time.time() - entry["checked"] < self.max_age
+            )
+            try:
+                if self.offline or fresh:
+                    return self._read_blob(entry)
+                return self._revalidate(url, entry, timeout)
+            except FileNotFoundError:
+                # The blob was evicted after the entry was read, a cache miss
+                pass
+
+        if self.offline:
+            raise OfflineCacheMiss(f"{url} is not cached and offline mode is on")
+        return self._store(url, self.client.get(url, timeout=timeout))
+
+    @staticmethod
+    def _processed_url(entry, variant):
+        # Keyed by the body of the image, a changed image is processed again
+        return f"processed:{entry['sha256']}:{variant}"
+
+    def get_processed(self, url, variant):
+        """
+        Array of a processed variant (e.g. the circular logo at a size) of a
+        cached image, stored with :meth:`put_processed`, or None. It is only
+        served while the image itself needs no revalidation.
+        """
+        entry = self._read_entry(url)
+        if entry is None:
+            return None
+        if not self.offline and self.max_age is not None:
+            if time.time() - entry["checked"] >= self.max_age:
+                return None
+        processed = self._read_entry(self._processed_url(entry, variant))
+        if processed is None:
+            return None
+        try:
+            return np.load(BytesIO(self._read_blob(processed)), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+    def put_processed(self, url, variant, array):
+        """Store a processed variant of a cached image, see get_processed."""
+        entry = self._read_entry(url)
+        if entry is None:
+            return
+        buffer = BytesIO()
+        np.save(buffer, np.asarray(array), allow_pickle=False)
+        self._put(self._processed_url(entry, variant), buffer.getvalue())
+
+    def __contains__(self, url):
+        return self._read_entry(url) is not None
+
+    def size(self):
+        """Total size of the cached images in bytes."""
+        with self._evict_lock:
+            self._size = self._scan_size()
+            return self._size
+
+    def _blobs(self):
+        """(last use, size, path) of every blob."""
+        blob_dir = os.path.join(self.cache_dir, "blobs")
+        if not os.path.isdir(blob_dir):
+            return []
+        blobs = []
+        for entry in os.scandir(blob_dir):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, entry.path))
+        return blobs
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._blobs())
+
+    def evict(self):
+        """
+        Remove the least recently used images until the cache fits max_mb,
+        down to EVICT_TO of it, together with the entries pointing at them.
+        """
+        with self._evict_lock:
+            blobs = self._blobs()
+            total = sum(size for _, size, _ in blobs)
+            if total > self.max_bytes:
+                removed = set()
+                for _, size, path in sorted(blobs):
+                    if total <= self.max_bytes * EVICT_TO:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+                    removed.add(os.path.basename(path))
+                self._prune_entries(removed)
+            self._size = total
+
+    def _prune_entries(self, removed):
+        """Remove the entries of removed blobs."""
+        entry_dir = os.path.join(self.cache_dir, "entries")
+        if not removed or not os.path.isdir(entry_dir):
+            return
+        for entry in os.scandir(entry_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path) as f:
+                    sha256 = json.load(f).get("sha256")
+                if sha256 in removed:
+                    os.remove(entry.path)
+            except (OSError, ValueError):
+                continue
+
+    def clear(self):
+        """Remove all cached images."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._size = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache():
+    """The shared ImageCache, created on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ImageCache()
+    return _cache
+
+
+def set_image_cache(cache):
+    """
+    Replace the shared ImageCache, e.g. with another directory or in offline
+    mode. Returns the previous cache.
+    """
+    global _cache
+    with _cache_lock:
+        previous, _cache = _cache, cache
+    return previous
@@ -1,22 +1,145 @@
+import os
+import threading
+from collections import OrderedDict
 from io import BytesIO
 
 import numpy as np
-import requests
-from PIL import Image, ImageDraw
+from PIL import Image
 from matplotlib.offsetbox import AnnotationBbox, OffsetImage
 
+from basket_viz.img_util.atlas import ImageAtlas
+from basket_viz.img_util.http_client import MAX_WORKERS, fetch_all
+from basket_viz.img_util.image_cache import get_image_cache
+from basket_viz.img_util.masks import add_circular_border, apply_circular_mask
+
+
+class ProcessedImageCache:
+    """
+    Bounded in-process LRU cache of processed (resized, masked, bordered) RGBA
+    arrays, so the same logo drawn on many charts is processed once.
+
+    The cached arrays are read-only and shared by all the images drawn from
+    them.
+
+    Args:
+    - max_mb: Total size of the cached arrays in megabytes.
+    """
+
+    def __init__(self, max_mb=128):
+        self.max_bytes = int(max_mb * 2**20)
+        self._arrays = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """The cached array of the key, or None."""
+        with self._lock:
+            array = self._arrays.get(key)
+            if array is not None:
+                self._arrays.move_to_end(key)
+            return array
+
+    def put(self, key, array):
+        """Cache an array, evicting the least recently used. Returns the array."""
+        array = np.ascontiguousarray(array)
+        array.setflags(write=False)
+        with self._lock:
+            previous = self._arrays.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            if array.nbytes <= self.max_bytes:
+                self._arrays[key] = array
+                self._nbytes += array.nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._arrays.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+        return array
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._arrays
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def clear(self):
+        with self._lock:
+            self._arrays.clear()
+            self._nbytes = 0
+
+
+processed_images = ProcessedImageCache()
+
+
+def processed_image_key(
+    source, img_size, ellipse_coords=None, border_color=None, border_width=0
+):
+    """
+    Key of a processed image in ``processed_images``, None if the source can't
+    identify the image (e.g. an open file).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        if os.path.exists(source):
+            # A file changed on disk is processed again
+            source = (os.path.abspath(source), os.stat(source).st_mtime_ns)
+    elif not isinstance(source, tuple):
+        return None
+    if isinstance(border_color, list):
+        border_color = tuple(border_color)
+    return (
+        source,
+        tuple(img_size),
+        tuple(ellipse_coords) if ellipse_coords else None,
+        border_color if border_color and border_width > 0 else None,
+        border_width if border_color else 0,
+    )
+
+
+def inline_image_key(source, img_size):
+    """
+    Key in ``processed_images`` of the circular in-memory image of a source
+    (e.g. a logo URL) at a size, as drawn by InlineImagePatcher.
+    """
+    return processed_image_key(("inline", source), img_size)
+
+
+def _add_image_array(ax, img_array, position, zoom):
+    """Draw an RGBA array onto ``ax`` at ``position`` using axis fractions."""
+    offset_image = OffsetImage(img_array, zoom=zoom)
+    ab = AnnotationBbox(
+        offset_image,
+        position,
+        frameon=False,
+        xycoords="axes fraction",
+        boxcoords="axes fraction",
+        pad=0,
+    )
+    ax.add_artist(ab)
+
 
 class ImagePatcher:
     def __init__(
-        self, img_path, img_size=(300, 300), ellipse_coords=None, text_params=None
+        self,
+        img_path,
+        img_size=(300, 300),
+        ellipse_coords=None,
+        text_params=None,
+        source=None,
     ):
+        # img_path is a file path, an in-memory PIL image or a function returning
+        # one, called only if the processed image is not cached. source
+        # identifies an in-memory image in the processed_images cache (e.g. its
+        # URL).
         self.img_path = img_path
         self.img_size = img_size
-        self.img = self._load_image()
+        self.source = source
+        # Loaded on first use, not at all if the processed image is cached
+        self._img = None
 
         # Ellipse coordinates (default to a full circle if not provided)
         self.ellipse_coords = (
-            ellipse_coords if ellipse_coords else (0, 0) + self.img.size
+            ellipse_coords if ellipse_coords else (0, 0) + tuple(self.img_size)
         )
 
         # Text parameters for positioning
@@ -30,43 +153,37 @@ class ImagePatcher:
             }
         )
 
+    @property
+    def img(self):
+        if self._img is None:
+            self._img = self._load_image()
+        return self._img
+
+    @img.setter
+    def img(self, img):
+        self._img = img
+
     def _load_image(self):
         """Load the image and resize it."""
-        img = Image.open(self.img_path).convert("RGBA")
+        img_path = self.img_path() if callable(self.img_path) else self.img_path
+        if isinstance(img_path, Image.Image):
+            img = img_path.convert("RGBA")
+        else:
+            img = Image.open(img_path).convert("RGBA")
         return img.resize(self.img_size, Image.LANCZOS)
 
     def create_circular_mask(self):
         """Create a circular mask for the image using the provided or default ellipse coordinates."""
-        mask = Image.new("L", self.img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse(self.ellipse_coords, fill=255)
-        self.img.putalpha(mask)
+        # The mask replaces the alpha channel, like Image.putalpha
+        self.img = apply_circular_mask(
+            self.img, self.ellipse_coords, replace_alpha=True
+        )
 
     def add_circular_border(self, border_color=None, border_width=20):
         """Add a circular border around the image."""
         if border_color and border_width > 0:
-            border_size = (
-                self.img_size[0] + border_width * 2,
-                self.img_size[1] + border_width * 2,
-            )
-            border_img = Image.new("RGBA", border_size)
-            border_draw = ImageDraw.Draw(border_img)
-
-            # Draw the border ellipse with dynamic size
-            border_draw.ellipse(
-                (
-                    border_width // 2,
-                    border_width // 2,
-                    border_size[0] - border_width // 2,
-                    border_size[1] - border_width // 2,
-                ),
-                outline=border_color,
-                width=border_width,
-            )
-
-            # Paste the original image onto the center of the border image
-            border_img.paste(self.img, (border_width, border_width), self.img)
-            self.img = border_img
+            # The image is pasted onto the center of the border ring
+            self.img = add_circular_border(self.img, border_color, border_width)
 
     def convert_to_offset_image(self, zoom=0.5):
         """Convert the image to a numpy array and create an OffsetImage."""
@@ -90,15 +207,29 @@ class ImagePatcher:
     ):
         """
         Adds a circular image with an optional border to the given axis at the specified position.
+        The processed image is cached in ``processed_images``.
         """
-        # Create a circular mask
-        self.create_circular_mask()
+        key = processed_image_key(
+            self.img_path if self.source is None else ("source", self.source),
+            self.img_size,
+            self.ellipse_coords,
+            border_color,
+            border_width,
+        )
+        img_array = processed_images.get(key) if key else None
+        if img_array is None:
+            # Create a circular mask
+            self.create_circular_mask()
+
+            # Add a circular border if specified
+            self.add_circular_border(border_color, border_width)
 
-        # Add a circular border if specified
-        self.add_circular_border(border_color, border_width)
+            img_array = np.array(self.img)
+            if key:
+                img_array = processed_images.put(key, img_array)
 
         # Convert the image to OffsetImage
-        offset_image = self.convert_to_offset_image(zoom=zoom)
+        offset_image = OffsetImage(img_array, zoom=zoom)
 
         # Create an AnnotationBbox and position it at the specified position
         ab = AnnotationBbox(
@@ -131,6 +262,10 @@ class ImagePatcher:
 def fetch_logo_image(url, timeout=10):
     """Download an image from a URL and return it as a ``PIL.Image``.
 
+    The image is served from the shared on-disk image cache when possible and
+    downloaded through the pooled HTTP client otherwise, see
+    :class:`basket_viz.img_util.image_cache.ImageCache`.
+
     Parameters
     ----------
     url : str
@@ -144,28 +279,83 @@ def fetch_logo_image(url, timeout=10):
         The downloaded image converted to RGBA.
     """
 
-    response = requests.get(url, timeout=timeout)
-    response.raise_for_status()
-    return Image.open(BytesIO(response.content)).convert("RGBA")
+    content = get_image_cache().get(url, timeout=timeout)
+    return Image.open(BytesIO(content)).convert("RGBA")
+
+
+def circular_logo_array(url, img_size=(260, 260), timeout=10):
+    """
+    Circular RGBA array of the image at a URL, as drawn by render_bottom_images.
+    The array is taken from ``processed_images``, then from the processed
+    variants of the on-disk image cache. Otherwise the image is fetched and
+    processed, and the result is stored in both, so later processes (e.g. a
+    render job after ``basket-viz prefetch``) skip the processing too.
+    """
+    key = inline_image_key(url, img_size)
+    img_array = processed_images.get(key)
+    if img_array is not None:
+        return img_array
+
+    image_cache = get_image_cache()
+    variant = f"circle-{img_size[0]}x{img_size[1]}"
+    img_array = image_cache.get_processed(url, variant)
+    if img_array is not None:
+        return processed_images.put(key, img_array)
+
+    patcher = InlineImagePatcher(
+        fetch_logo_image(url, timeout=timeout), img_size=img_size, source=url
+    )
+    img_array = patcher.to_array()
+    image_cache.put_processed(url, variant, img_array)
+    return img_array
 
 
 class InlineImagePatcher:
     """Convenience helper for patching in-memory images onto matplotlib axes."""
 
-    def __init__(self, pil_img, img_size=(300, 300)):
-        self.img = pil_img.convert("RGBA").resize(img_size, Image.LANCZOS)
+    def __init__(self, pil_img, img_size=(300, 300), source=None):
+        """
+        ``source`` (e.g. the URL of the image) identifies the image in the
+        ``processed_images`` cache, ``pil_img`` may be None if it is cached.
+        """
+        self.pil_img = pil_img
+        self.img_size = img_size
+        self.source = source
+        self._img = None
+
+    @property
+    def img(self):
+        if self._img is None:
+            if self.pil_img is None:
+                raise ValueError("No image available to patch.")
+            self._img = self.pil_img.convert("RGBA").resize(
+                self.img_size, Image.LANCZOS
+            )
+        return self._img
+
+    @img.setter
+    def img(self, img):
+        self._img = img
+
+    def cache_key(self):
+        if self.source is None:
+            return None
+        return inline_image_key(self.source, self.img_size)
 
     def create_circular_mask(self):
         """Apply a circular alpha mask to the current image."""
-        # Create circular mask
-        mask = Image.new("L", self.img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0) + self.img.size, fill=255)
-
-        # Paste the image onto a transparent canvas using the circular mask
-        transparent_bg = Image.new("RGBA", self.img.size, (0, 0, 0, 0))
-        transparent_bg.paste(self.img, (0, 0), mask=mask)
-        self.img = transparent_bg
+        self.img = apply_circular_mask(self.img)
+
+    def to_array(self):
+        """The circular RGBA array of the image, cached in ``processed_images``."""
+        key = self.cache_key()
+        img_array = processed_images.get(key) if key else None
+        if img_array is None:
+            self.create_circular_mask()
+            img_array = np.asarray(self.img)
+            if key:
+                img_array = processed_images.put(key, img_array)
+        return img_array
 
     def to_offset_image(self, zoom=0.5):
         """Convert the masked image to an ``OffsetImage``."""
@@ -174,40 +364,67 @@ class InlineImagePatcher:
 
     def add_circular_image(self, ax, position, zoom=0.5):
         """Draw the image onto ``ax`` at ``position`` using axis fractions."""
-
-        self.create_circular_mask()
-        offset_image = self.to_offset_image(zoom=zoom)
-        ab = AnnotationBbox(
-            offset_image,
-            position,
-            frameon=False,
-            xycoords="axes fraction",
-            boxcoords="axes fraction",
-            pad=0,
-        )
-        ax.add_artist(ab)
-
-
-def render_bottom_images(ax, image_urls, logo_zoom=0.12, y_offset=-0.08, img_size=(260, 260)):
+        _add_image_array(ax, self.to_array(), position, zoom)
+
+
+def render_bottom_images(
+    ax,
+    image_urls,
+    logo_zoom=0.12,
+    y_offset=-0.08,
+    img_size=(260, 260),
+    max_workers=MAX_WORKERS,
+    atlas=False,
+):
     """Render a horizontal row of circular images beneath the x-axis.
 
     This helper is designed for stat grids but can be reused anywhere a row of
     logos needs to be positioned under a matplotlib axis without a background.
     Images are downloaded, cropped into circles, and drawn in axis-fraction
     coordinates, so they stay aligned even if limits or scales change.
+
+    All images are downloaded and processed concurrently (``max_workers`` at a
+    time, repeated URLs once) before the first one is drawn, see
+    :func:`circular_logo_array`. Images already processed at this size are
+    taken from ``processed_images`` without being fetched.
+
+    With ``atlas`` the images are drawn as a single ``ImageAtlas`` artist
+    instead of one ``AnnotationBbox`` per image.
     """
 
     if not image_urls:
         return
 
+    pending = [
+        url
+        for url in image_urls
+        if inline_image_key(url, img_size) not in processed_images
+    ]
+    images = fetch_all(
+        pending,
+        lambda url: circular_logo_array(url, img_size),
+        max_workers=max_workers,
+    )
+
+    image_atlas = ImageAtlas(ax, transform=ax.transAxes) if atlas else None
     n_images = len(image_urls)
     for idx, url in enumerate(image_urls):
         try:
-            pil_img = fetch_logo_image(url)
-            patcher = InlineImagePatcher(pil_img, img_size=img_size)
-            x_position = (idx + 0.5) / n_images
-            patcher.add_circular_image(
-                ax=ax, position=(x_position, y_offset), zoom=logo_zoom
-            )
+            img_array = images.get(url)
+            if isinstance(img_array, Exception):
+                raise img_array
+            if img_array is None:
+                # Processed before the downloads started, fetched again if it
+                # was evicted from processed_images since
+                img_array = circular_logo_array(url, img_size)
+
+            position = ((idx + 0.5) / n_images, y_offset)
+            if image_atlas is not None:
+                image_atlas.add(img_array, position, zoom=logo_zoom)
+            else:
+                _add_image_array(ax, img_array, position, logo_zoom)
         except Exception as exc:  # pragma: no cover - non-critical rendering aid
             print(f"⚠️ failed to render bottom image {url}: {exc}")
+
+    if image_atlas is not None and len(image_atlas):
+        ax.add_artist(image_atlas)
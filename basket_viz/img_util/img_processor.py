@@ -1,10 +1,11 @@
-import requests
 import numpy as np
 from PIL import Image
 from io import BytesIO
 from matplotlib import pyplot as plt
 from matplotlib.offsetbox import OffsetImage
 
+from basket_viz.img_util.image_cache import get_image_cache
+
 
 class ImageProcessor:
     def __init__(self):
@@ -12,14 +13,14 @@ class ImageProcessor:
 
     def download(self, url):
         """
-        Download an image from the provided URL.
+        Download an image from the provided URL. The image is served from the
+        shared on-disk image cache when possible (see ``ImageCache``).
         :param url: str: URL of the image
         :return: None
         """
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Check if the request was successful
-            self.image = Image.open(BytesIO(response.content))
+            content = get_image_cache().get(url)
+            self.image = Image.open(BytesIO(content))
             print("Image downloaded successfully.")
         except Exception as e:
             print(f"Failed to download the image: {e}")
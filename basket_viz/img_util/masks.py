@@ -0,0 +1,113 @@
+"""
+Anti-aliased circular alpha masks and border rings as NumPy arrays.
+
+Masks and rings are computed once per size (and color) and cached. Masking an
+image or drawing its border is then a single putalpha or paste with the cached
+arrays. Sizes are ``(width, height)`` and ellipse coordinates
+``(x0, y0, x1, y1)`` bounding boxes with inclusive corners, as in PIL.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageChops, ImageColor
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+def _ellipse_coverage(size, ellipse_coords):
+    """Share of every pixel inside the ellipse, in [0, 1]."""
+    width, height = size
+    x0, y0, x1, y1 = ellipse_coords
+    # The inclusive bounding box covers the pixels x0..x1 and y0..y1
+    cx, cy = (x0 + x1 + 1) / 2, (y0 + y1 + 1) / 2
+    rx, ry = max((x1 - x0 + 1) / 2, 1e-6), max((y1 - y0 + 1) / 2, 1e-6)
+
+    x = (np.arange(width, dtype=np.float32) + 0.5 - cx) / rx
+    y = (np.arange(height, dtype=np.float32) + 0.5 - cy) / ry
+    distance = np.sqrt(x[np.newaxis, :] ** 2 + y[:, np.newaxis] ** 2)
+    # Signed distance to the outline in pixels, approximately
+    return np.clip(0.5 + (1 - distance) * min(rx, ry), 0, 1)
+
+
+@lru_cache(maxsize=64)
+def circular_mask(size, ellipse_coords=None):
+    """
+    Alpha mask of an ellipse, uint8 array of shape (height, width), 255 inside,
+    0 outside and anti-aliased in between. Defaults to the circle filling the
+    whole image.
+    """
+    size = tuple(size)
+    ellipse_coords = tuple(ellipse_coords) if ellipse_coords else (0, 0) + size
+    coverage = _ellipse_coverage(size, ellipse_coords)
+    return _read_only(np.rint(coverage * 255).astype(np.uint8))
+
+
+@lru_cache(maxsize=64)
+def border_ring(size, border_width, border_color):
+    """
+    RGBA uint8 canvas ``2 * border_width`` larger than ``size`` in both
+    directions, holding a circular border ``border_width`` wide in the color.
+    """
+    width, height = size[0] + border_width * 2, size[1] + border_width * 2
+    inset = border_width // 2
+    outer = _ellipse_coverage(
+        (width, height), (inset, inset, width - inset, height - inset)
+    )
+    inner = _ellipse_coverage(
+        (width, height),
+        (
+            inset + border_width,
+            inset + border_width,
+            width - inset - border_width,
+            height - inset - border_width,
+        ),
+    )
+    if isinstance(border_color, str):
+        color = ImageColor.getcolor(border_color, "RGBA")
+    else:
+        # An (r, g, b) or (r, g, b, a) tuple, as ImageDraw accepts
+        color = tuple(border_color) + (255,) * (4 - len(border_color))
+    canvas = np.empty((height, width, 4), dtype=np.uint8)
+    canvas[...] = color
+    canvas[..., 3] = np.rint(np.clip(outer - inner, 0, 1) * color[3])
+    return _read_only(canvas)
+
+
+@lru_cache(maxsize=64)
+def _mask_image(size, ellipse_coords):
+    return Image.fromarray(circular_mask(size, ellipse_coords), "L")
+
+
+@lru_cache(maxsize=64)
+def _ring_image(size, border_width, border_color):
+    return Image.fromarray(border_ring(size, border_width, border_color), "RGBA")
+
+
+def apply_circular_mask(img, ellipse_coords=None, replace_alpha=False):
+    """
+    Mask an RGBA PIL image with a circle, in place. The alpha channel is
+    multiplied by the mask, or replaced by it with ``replace_alpha`` (like
+    ``putalpha``). Returns the image.
+    """
+    ellipse_coords = tuple(ellipse_coords) if ellipse_coords else None
+    mask = _mask_image(img.size, ellipse_coords)
+    if not replace_alpha:
+        mask = ImageChops.multiply(img.getchannel("A"), mask)
+    img.putalpha(mask)
+    return img
+
+
+def add_circular_border(img, border_color, border_width):
+    """
+    Put an RGBA PIL image in the middle of a circular border ring, returns a new
+    image. The image is pasted over the ring using its own alpha as the mask.
+    """
+    if isinstance(border_color, list):
+        border_color = tuple(border_color)
+    canvas = _ring_image(img.size, border_width, border_color).copy()
+    canvas.paste(img, (border_width, border_width), img)
+    return canvas
@@ -0,0 +1,303 @@
+"""
+Opt-in timing instrumentation of the chart classes.
+
+Instrumented methods record one :class:`CallRecord` per call with the duration
+of the call, the named stages inside it (filtering, binning, drawing, layout,
+encoding...), row counts and the number of artists of the resulting figure.
+Records are aggregated in :data:`stats` and handed to the registered callbacks,
+e.g. to forward them to a metrics pipeline::
+
+    from basket_viz import instrumentation
+
+    instrumentation.enable(callback=lambda record: print(record.as_dict()))
+    shot_chart.plot_entity_hexbin(df_all, "offsets", "values_ratio", player)
+    instrumentation.stats.summary()
+
+Instrumentation is disabled by default. While disabled, an instrumented method
+costs one flag check and stages are a shared no-op context manager.
+"""
+
+import functools
+import threading
+import time
+
+from matplotlib.artist import Artist
+from matplotlib.figure import Figure
+
+_enabled = False
+_callbacks = []
+_local = threading.local()
+
+
+class CallRecord:
+    """Timings and counts of one instrumented call."""
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.start = time.time()
+        self.duration = None
+        self.stages = {}
+        self.rows = {}
+        self.artists = None
+        self.error = None
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "start": self.start,
+            "duration": self.duration,
+            "stages": dict(self.stages),
+            "rows": dict(self.rows),
+            "artists": self.artists,
+            "error": self.error,
+        }
+
+    def __repr__(self):
+        return (
+            f"CallRecord({self.name!r}, duration={self.duration}, "
+            f"stages={self.stages})"
+        )
+
+
+class InstrumentationStats:
+    """Per method aggregate of the recorded calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._calls = {}
+
+    def add(self, record):
+        with self._lock:
+            calls = self._calls.setdefault(
+                record.name,
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_s": 0.0,
+                    "max_s": 0.0,
+                    "stages_s": {},
+                    "rows": {},
+                    "max_artists": None,
+                },
+            )
+            calls["calls"] += 1
+            calls["errors"] += record.error is not None
+            calls["total_s"] += record.duration
+            calls["max_s"] = max(calls["max_s"], record.duration)
+            for stage, seconds in record.stages.items():
+                stages = calls["stages_s"]
+                stages[stage] = stages.get(stage, 0.0) + seconds
+            for label, n in record.rows.items():
+                calls["rows"][label] = calls["rows"].get(label, 0) + n
+            if record.artists is not None:
+                calls["max_artists"] = max(calls["max_artists"] or 0, record.artists)
+
+    def summary(self):
+        """Dict of method name to calls, errors, total/mean/max seconds, the
+        total seconds per stage, the total rows per label and the most artists
+        seen in one call."""
+        with self._lock:
+            return {
+                name: {
+                    **calls,
+                    "mean_s": calls["total_s"] / calls["calls"],
+                    "stages_s": dict(calls["stages_s"]),
+                    "rows": dict(calls["rows"]),
+                }
+                for name, calls in self._calls.items()
+            }
+
+
+stats = InstrumentationStats()
+
+
+def enable(callback=None):
+    """Start recording instrumented calls, optionally with a callback."""
+    global _enabled
+    if callback is not None:
+        add_callback(callback)
+    _enabled = True
+
+
+def disable():
+    """Stop recording. Registered callbacks and the stats are kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def add_callback(callback):
+    """Call ``callback(record)`` with the CallRecord of every instrumented call."""
+    if callback not in _callbacks:
+        _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    if callback in _callbacks:
+        _callbacks.remove(callback)
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def current_record():
+    """The record of the innermost instrumented call, or None."""
+    stack = _stack() if _enabled else None
+    return stack[-1] if stack else None
+
+
+class _Stage:
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stages = self.record.stages
+        stages[self.name] = stages.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name):
+    """
+    Context manager timing a named stage of the current instrumented call.
+    Repeated stages of one call are summed up.
+    """
+    record = current_record()
+    if record is None:
+        return _NULL_STAGE
+    return _Stage(record, name)
+
+
+def savefig(fig, *args, **kwargs):
+    """
+    ``fig.savefig`` timed as two stages of the current call: "render" (layout
+    and rasterization, up to the draw_event the figure fires once it is drawn)
+    and "encode" (writing the file from the rendered figure). The figure is
+    drawn only once, as by savefig itself.
+    """
+    record = current_record()
+    if record is None:
+        return fig.savefig(*args, **kwargs)
+
+    drawn = []
+    cid = fig.canvas.mpl_connect(
+        "draw_event", lambda event: drawn.append(time.perf_counter())
+    )
+    start = time.perf_counter()
+    try:
+        return fig.savefig(*args, **kwargs)
+    finally:
+        end = time.perf_counter()
+        fig.canvas.mpl_disconnect(cid)
+        # bbox_inches="tight" draws twice, the last draw is the one encoded
+        rendered = drawn[-1] if drawn else start
+        for name, elapsed in (("render", rendered - start), ("encode", end - rendered)):
+            record.stages[name] = record.stages.get(name, 0.0) + elapsed
+
+
+def count_rows(label, n):
+    """Record a row count (e.g. the input or filtered rows) of the current call."""
+    record = current_record()
+    if record is not None:
+        record.rows[label] = record.rows.get(label, 0) + int(n)
+
+
+def _figure_of(args, kwargs, result, fig_before):
+    """
+    Figure a call produced or worked on: the result, a ``fig`` argument, or
+    the ``fig`` of the chart object if the call replaced it. The figure of an
+    earlier call on the same object is not counted.
+    """
+    candidates = [result, kwargs.get("fig")]
+    if args:
+        fig_after = getattr(args[0], "fig", None)
+        if fig_after is not fig_before:
+            candidates.append(fig_after)
+        candidates.append(args[0])
+    for candidate in candidates:
+        if isinstance(candidate, Figure):
+            return candidate
+        if isinstance(candidate, Artist) and candidate.figure is not None:
+            return candidate.figure
+    return None
+
+
+def _run(name, fn, args, kwargs):
+    stack = _stack()
+    record = CallRecord(name, parent=stack[-1].name if stack else None)
+    stack.append(record)
+    fig_before = getattr(args[0], "fig", None) if args else None
+    start = time.perf_counter()
+    result = None
+    try:
+        result = fn(*args, **kwargs)
+        return result
+    except Exception as e:
+        record.error = repr(e)
+        raise
+    finally:
+        record.duration = time.perf_counter() - start
+        stack.pop()
+        # Nested calls draw into the figure of the outermost call, which counts
+        # the artists once
+        figure = None if stack else _figure_of(args, kwargs, result, fig_before)
+        _finish(record, figure)
+
+
+def _finish(record, figure):
+    if figure is not None:
+        record.artists = len(figure.findobj(Artist))
+    stats.add(record)
+    for callback in list(_callbacks):
+        try:
+            callback(record)
+        except Exception as e:
+            print(f"⚠️ instrumentation callback failed: {e}")
+
+
+def instrumented(name=None):
+    """
+    Decorator recording a CallRecord for every call of the method while the
+    instrumentation is enabled. ``name`` defaults to the qualified name.
+    """
+
+    def decorator(fn):
+        call_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            return _run(call_name, fn, args, kwargs)
+
+        return wrapper
+
+    return decorator
@@ -4,6 +4,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.interpolate import make_interp_spline
 from matplotlib.animation import FuncAnimation
+from basket_viz.instrumentation import instrumented, savefig, stage
 
 
 class TrajectoryPlotter:
@@ -73,6 +74,7 @@ class TrajectoryPlotter:
             label=label,
         )
 
+    @instrumented()
     def plot_trajectory(
         self,
         df,
@@ -143,6 +145,7 @@ class TrajectoryPlotter:
 
         plt.show()
 
+    @instrumented()
     def plot_trajectory_animated(
         self,
         df,
@@ -241,6 +244,7 @@ class TrajectoryPlotter:
         plt.tight_layout()
         plt.close()
 
+    @instrumented()
     def save_plot(self, directory="output", file_name="trajectory", file_format=None):
         if not os.path.exists(directory):
             os.makedirs(directory)
@@ -250,9 +254,11 @@ class TrajectoryPlotter:
                 file_format = "mp4"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
             if file_format == "gif":
-                self.ani.save(full_path, writer="pillow")
+                with stage("encode"):
+                    self.ani.save(full_path, writer="pillow")
             elif file_format == "mp4":
-                self.ani.save(full_path, writer="ffmpeg")
+                with stage("encode"):
+                    self.ani.save(full_path, writer="ffmpeg")
             else:
                 raise ValueError(
                     f"Unsupported file format for animation: {file_format}"
@@ -263,7 +269,7 @@ class TrajectoryPlotter:
             if file_format is None:
                 file_format = "png"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
-            self.fig.savefig(full_path)
+            savefig(self.fig, full_path)
             print(f"Saved figure to {full_path}")
 
         else:
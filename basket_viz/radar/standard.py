@@ -1,11 +1,19 @@
+import os
+import tempfile
+from functools import partial
 from math import pi
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from PIL import Image
+from basket_viz.img_util.image_cache import get_image_cache
 from basket_viz.img_util.img_patcher import ImagePatcher
 from basket_viz.img_util.img_processor import ImageProcessor
 from basket_viz.export_util.fig_export import LocalExport
+from basket_viz.instrumentation import instrumented
+
+# Image cache variant of the cropped headshots, see RadarChart._player_image
+HEADSHOT_VARIANT = "radar-crop"
 
 
 class RadarChart:
@@ -66,8 +74,12 @@ class RadarChart:
         else:
             ax.grid(False)
 
+    @instrumented()
     def add_player_image(self, img_path):
-        """Adds a circular player image in the center of the radar chart."""
+        """
+        Adds a circular player image in the center of the radar chart.
+        img_path is an image file or an in-memory PIL image.
+        """
         border_color = self.kwargs.get("img_border_color", "white")
         border_width = self.kwargs.get("img_border_width", 20)
 
@@ -90,6 +102,7 @@ class RadarChart:
                 border_width=border_width,
             )
 
+    @instrumented()
     def plot_radar(self, player_name, title_sufix=None):
         """Creates the radar chart without the image."""
         # Prepare the radar chart data
@@ -140,29 +153,83 @@ class RadarChart:
             weight=title_weight,
         )
 
-    def _process_player_image(self, player_name, output_path):
-        url = self.dataframe[self.dataframe["player"] == player_name][
+    def _player_image_url(self, player_name):
+        return self.dataframe[self.dataframe["player"] == player_name][
             "player.imageUrl"
         ].values[0]
 
-        processor = ImageProcessor()
+    def _player_image(self, player_name, image_url=None):
+        """
+        Download the headshot of a player and crop it, in memory. The crop is
+        also stored in the image cache as a processed variant, so later charts
+        (e.g. after ``basket-viz prefetch``) skip downloading and cropping it.
+        """
+        image_url = image_url or self._player_image_url(player_name)
+        image_cache = get_image_cache()
+        cropped = image_cache.get_processed(image_url, HEADSHOT_VARIANT)
+        if cropped is not None:
+            return Image.fromarray(cropped)
 
-        processor.download(url)
+        processor = ImageProcessor()
+        processor.download(image_url)
+        if processor.image is None:
+            raise ValueError(f"Could not download the headshot of {player_name}")
 
         width, height = processor.image.size
         processor.crop(0, 0, width, height // 1.4)
-        processor.save(output_path)
 
+        cropped = processor.image.convert("RGBA")
+        image_cache.put_processed(image_url, HEADSHOT_VARIANT, np.asarray(cropped))
+        return cropped
+
+    def _process_player_image(self, player_name, output_path, image_url=None):
+        """Crop the headshot of a player and save it to output_path."""
+        image = self._player_image(player_name, image_url)
+
+        # Written to a temporary file first, concurrent jobs never read a
+        # partially written image
+        directory, file_name = os.path.split(os.path.abspath(output_path))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{file_name}.", suffix=".tmp"
+        )
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, format="PNG")
+        os.replace(tmp_path, output_path)
+
+        return output_path
+
+    def comparison_image(self, player_name, image_url=None):
+        """
+        The cropped headshot of a player. It is kept in memory, unless the
+        ``player_image_dir`` option is set: the image is then saved there, and
+        an image already saved there is reused without downloading it.
+
+        In memory, a function cropping the headshot is returned instead of the
+        image, so ImagePatcher only calls it if the processed image of the URL
+        is not cached yet.
+        """
+        image_url = image_url or self._player_image_url(player_name)
+        image_dir = self.kwargs.get("player_image_dir")
+        if image_dir is None:
+            return partial(self._player_image, player_name, image_url)
+
+        os.makedirs(image_dir, exist_ok=True)
+        output_path = os.path.join(image_dir, f"{player_name}.png")
+        if not os.path.exists(output_path):
+            self._process_player_image(player_name, output_path, image_url)
         return output_path
 
+    @instrumented()
     def add_comparison_images(self, start_x=0.2, spacing=0.3, y_offset=-0.2):
         """Adds player images and names below the radar chart with configurable positions."""
         if not self.ax:
             return
 
-        for player_name in self.player_names:
-            img_path = self._process_player_image(player_name, f"{player_name}.png")
-            self.player_images.append(img_path)
+        image_urls = [self._player_image_url(name) for name in self.player_names]
+        self.player_images = [
+            self.comparison_image(name, image_url)
+            for name, image_url in zip(self.player_names, image_urls)
+        ]
 
         num_images = len(self.player_images)
 
@@ -170,8 +237,8 @@ class RadarChart:
         if num_images > 1:
             start_x = 0.5 - (spacing * (num_images - 1)) / 2
 
-        for i, (img_path, player_name, color) in enumerate(
-            zip(self.player_images, self.player_names, self.line_colors)
+        for i, (img_path, player_name, color, image_url) in enumerate(
+            zip(self.player_images, self.player_names, self.line_colors, image_urls)
         ):
             # Calculate the position for each image
             position = (start_x + i * spacing, y_offset)
@@ -182,6 +249,8 @@ class RadarChart:
                 img_size=(300, 300),
                 ellipse_coords=(10, 10, 290, 290),
                 text_params={"ha": "center", "va": "bottom", "text_offset_y": 0.15},
+                # Images in memory are identified by their URL
+                source=None if isinstance(img_path, str) else image_url,
             )
             patcher.add_circular_image(
                 self.ax, zoom=0.4, position=position, border_color=color
@@ -198,6 +267,7 @@ class RadarChart:
                 transform=self.ax.transAxes,
             )
 
+    @instrumented()
     def compare_radars(
         self,
         player_names,
@@ -254,6 +324,7 @@ class RadarChart:
         """Display the radar chart and any additional elements (e.g., images)."""
         plt.show()
 
+    @instrumented()
     def save(self, directory="output", file_name="radar_chart", file_format=None):
         LocalExport.save_plot(
             fig=self.fig,
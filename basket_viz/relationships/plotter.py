@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation, FFMpegWriter
 import pandas as pd
 from basket_viz.relationships import team_configs
+from basket_viz.instrumentation import instrumented, stage
 
 
 def calculate_shots_summary(data):
@@ -102,6 +103,7 @@ class PlotRelationship:
                     config[key].update(team_config[key])
         return config
 
+    @instrumented()
     def plot_animated_relationship(
         self,
         data,
@@ -233,16 +235,18 @@ class PlotRelationship:
         ani = FuncAnimation(
             fig, update, frames=len(scatter_data) + 4, interval=500, repeat=False
         )
-        if self.output_format == "gif":
-            ani.save(
-                f"{self.export_dir}/{team_filter}_{file_name_sufix}.gif",
-                writer="imagemagick",
-            )
-        elif self.output_format == "mp4":
-            writer = FFMpegWriter(fps=1, metadata=dict(artist="Me"), bitrate=1800)
-            ani.save(
-                f"{self.export_dir}/{team_filter}_{file_name_sufix}.mp4", writer=writer
-            )
+        with stage("encode"):
+            if self.output_format == "gif":
+                ani.save(
+                    f"{self.export_dir}/{team_filter}_{file_name_sufix}.gif",
+                    writer="imagemagick",
+                )
+            elif self.output_format == "mp4":
+                writer = FFMpegWriter(fps=1, metadata=dict(artist="Me"), bitrate=1800)
+                ani.save(
+                    f"{self.export_dir}/{team_filter}_{file_name_sufix}.mp4",
+                    writer=writer,
+                )
         plt.setp(legend.get_texts(), color="white")
         plt.show()
 
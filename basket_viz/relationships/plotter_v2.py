@@ -11,7 +11,14 @@ from matplotlib.offsetbox import AnnotationBbox
 from PIL import Image
 
 from basket_viz.export_util.fig_export import LocalExport
+from basket_viz.img_util.atlas import ImageAtlas
+from basket_viz.img_util.http_client import MAX_WORKERS, fetch_all
+from basket_viz.img_util.image_cache import get_image_cache
 from basket_viz.img_util.img_processor import ImageProcessor
+from basket_viz.instrumentation import instrumented
+
+# Image cache variant of the decoded headshots, see PlotRelation.fetch_headshot
+HEADSHOT_VARIANT = "headshot-rgba"
 
 
 class PlotRelation:
@@ -29,6 +36,7 @@ class PlotRelation:
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
+    @instrumented()
     def plot_relationship(self, highlight_df: Optional[pd.DataFrame] = None) -> plt.Axes:
         """Render the base scatter relationship with optional highlight annotations."""
 
@@ -54,6 +62,7 @@ class PlotRelation:
         self.fig.tight_layout()
         return self.ax
 
+    @instrumented()
     def add_player_annotations(self, highlight_df: pd.DataFrame) -> None:
         """Add player headshots and labels for highlighted rows."""
 
@@ -72,35 +81,44 @@ class PlotRelation:
 
         text_padding = self.kwargs.get("name_vertical_padding", 0.4)
 
-        for _, row in highlight_df.iterrows():
-            image_url = row.get(image_col)
-            if not image_url:
-                continue
+        # Prefetch: download and decode all headshots in parallel, once per URL
+        entries = [(row, row.get(image_col)) for _, row in highlight_df.iterrows()]
+        entries = [(row, image_url) for row, image_url in entries if image_url]
+        processors = fetch_all(
+            [image_url for _, image_url in entries],
+            self.fetch_headshot,
+            max_workers=self.kwargs.get("image_download_workers", MAX_WORKERS),
+        )
 
-            processor = ImageProcessor()
-            try:
-                processor.download(image_url)
-            except Exception:
-                continue
+        # Optionally draw all headshots as a single image artist
+        atlas = ImageAtlas(self.ax) if self.kwargs.get("image_atlas", False) else None
 
-            image = processor.get_image()
-            if image is None:
+        for row, image_url in entries:
+            processor = processors[image_url]
+            if processor is None or isinstance(processor, Exception):
                 continue
 
-            zoom, offset = self._resolve_image_position(image)
+            image = processor.image
 
-            try:
-                offset_image = processor.to_offset_image(zoom=zoom)
-            except ValueError:
-                continue
+            zoom, offset = self._resolve_image_position(image)
 
             x_value = row.get(x_col)
             y_value = row.get(y_col)
             if pd.isna(x_value) or pd.isna(y_value):
                 continue
 
-            annotation = AnnotationBbox(offset_image, (x_value, y_value + offset), frameon=False)
-            self.ax.add_artist(annotation)
+            if atlas is not None:
+                atlas.add(image, (x_value, y_value + offset), zoom=zoom)
+            else:
+                try:
+                    offset_image = processor.to_offset_image(zoom=zoom)
+                except ValueError:
+                    continue
+
+                annotation = AnnotationBbox(
+                    offset_image, (x_value, y_value + offset), frameon=False
+                )
+                self.ax.add_artist(annotation)
 
             formatted_name = self._format_player_name(str(row.get(label_col, "")))
             if formatted_name:
@@ -114,6 +132,9 @@ class PlotRelation:
                     color=self.kwargs.get("name_color", "#222222"),
                 )
 
+        if atlas is not None and len(atlas):
+            self.ax.add_artist(atlas)
+
     def display_chart(self) -> None:
         """Display the plotted figure."""
 
@@ -121,6 +142,7 @@ class PlotRelation:
             raise ValueError("No figure has been created. Call plot_relationship() first.")
         plt.show()
 
+    @instrumented()
     def save(
         self,
         directory: Optional[str] = None,
@@ -291,6 +313,31 @@ class PlotRelation:
     # ------------------------------------------------------------------
     # Annotation helpers
     # ------------------------------------------------------------------
+    @staticmethod
+    def fetch_headshot(image_url: str) -> Optional[ImageProcessor]:
+        """Download and decode one headshot, None if it could not be loaded.
+
+        The decoded RGBA pixels are also stored in the image cache as a
+        processed variant, so later charts (e.g. after ``basket-viz prefetch``)
+        skip decoding them.
+        """
+
+        image_cache = get_image_cache()
+        processor = ImageProcessor()
+        pixels = image_cache.get_processed(image_url, HEADSHOT_VARIANT)
+        if pixels is not None:
+            processor.image = Image.fromarray(pixels)
+            return processor
+
+        processor.download(image_url)
+        if processor.image is None:
+            return None
+        processor.image = processor.image.convert("RGBA")
+        image_cache.put_processed(
+            image_url, HEADSHOT_VARIANT, np.asarray(processor.image)
+        )
+        return processor
+
     def _resolve_image_position(self, image: Image.Image) -> Tuple[float, float]:
         """Determine zoom and vertical offset based on image aspect ratio."""
 
@@ -3,6 +3,7 @@ from matplotlib.patches import Circle, Rectangle, Arc
 import pandas as pd
 import matplotlib.animation as animation
 import os
+from basket_viz.instrumentation import instrumented, savefig, stage
 
 
 class ShotChart:
@@ -56,6 +57,7 @@ class ShotChart:
 
         return ax
 
+    @instrumented()
     def plot_field_goal_scatter(self, made, miss, title=None):
         fig, ax = plt.subplots(figsize=self.config["figsize"])
         fig.patch.set_facecolor(self.config["court_background_color"])
@@ -210,6 +212,7 @@ class ShotChart:
     # refactor temporal to work both with mp4 and gif
     # refactor the config - separate court, marker, title elements
 
+    @instrumented()
     def plot_field_goal_scatter_temporal(self, made, miss, title=None):
         made["Result"] = "Made"
         miss["Result"] = "Missed"
@@ -270,6 +273,7 @@ class ShotChart:
             self.fig = fig  # Store the figure in the object
             plt.show()
 
+    @instrumented()
     def save_plot(self, directory="output", file_name="shot_chart", file_format=None):
         if not os.path.exists(directory):
             os.makedirs(directory)
@@ -279,9 +283,11 @@ class ShotChart:
                 file_format = "mp4"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
             if file_format == "gif":
-                self.ani.save(full_path, writer="pillow")
+                with stage("encode"):
+                    self.ani.save(full_path, writer="pillow")
             elif file_format == "mp4":
-                self.ani.save(full_path, writer="ffmpeg")
+                with stage("encode"):
+                    self.ani.save(full_path, writer="ffmpeg")
             else:
                 raise ValueError(
                     f"Unsupported file format for animation: {file_format}"
@@ -292,7 +298,7 @@ class ShotChart:
             if file_format is None:
                 file_format = "png"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
-            self.fig.savefig(full_path)
+            savefig(self.fig, full_path)
             print(f"Saved figure to {full_path}")
 
         else:
@@ -310,6 +316,7 @@ class ShotChart:
         fg_miss = df[df["ID_ACTION"].isin(["2FGA", "3FGA"])]
         return fg_made, fg_miss
 
+    @instrumented()
     def euroleague_player_shot_chart(
         self,
         df,
@@ -6,7 +6,9 @@ import os
 from matplotlib.collections import PatchCollection
 from matplotlib.colors import Normalize
 
+from basket_viz.data_util.column_cache import load_cached
 from basket_viz.img_util import render_bottom_images
+from basket_viz.instrumentation import count_rows, instrumented, savefig, stage
 
 
 class PlayerStatsHeatmap:
@@ -47,6 +49,7 @@ class PlayerStatsHeatmap:
                 "logo_zoom": 0.12,
                 "y_offset": -0.08,
                 "img_size": (260, 260),
+                "atlas": False,  # draw all logos as a single image artist
             },
             "columns": {  # Added config for column names
                 "team": "Team",
@@ -86,6 +89,46 @@ class PlayerStatsHeatmap:
         """
         self.params.update(kwargs)
 
+    def load_cached(self, path, stats=("Points",), teams=None, games=None, **kwargs):
+        """
+        Load a box-score file through the column cache (see
+        basket_viz.data_util.ColumnCache), reading only the columns of the
+        heatmap.
+        Parameters
+        ----------
+        path : str
+            The box-score file.
+        stats : list[str], default ("Points",)
+            The stat columns to load.
+        teams : list[str], default None
+            Only load the rows of these teams.
+        games : list, default None
+            Only load the rows of these game codes.
+        **kwargs : dict
+            Passed to ``load_cached``, e.g. ``reader`` or ``cache_dir``.
+        Returns
+        -------
+        pd.DataFrame
+            The stats, ready for :meth:`plot_stat_heatmap`.
+        """
+        columns = self.params["columns"]
+        return load_cached(
+            path,
+            columns=[
+                columns["team"],
+                columns["player"],
+                columns["game_code"],
+                columns["vs_team"],
+                *stats,
+            ],
+            games=games,
+            teams=teams,
+            game_column=columns["game_code"],
+            team_column=columns["team"],
+            **kwargs,
+        )
+
+    @instrumented()
     def plot_stat_heatmap(
         self,
         df,
@@ -133,7 +176,9 @@ class PlayerStatsHeatmap:
             additional elements before display.
         """
 
-        heatmap_data = self._prepare_data(df, team, num_games, stat)
+        count_rows("input", len(df))
+        with stage("prepare"):
+            heatmap_data = self._prepare_data(df, team, num_games, stat)
 
         fig, ax = plt.subplots(figsize=self.params["figsize"])
         self.fig = fig
@@ -165,21 +210,22 @@ class PlayerStatsHeatmap:
             ax.set_xticks(np.arange(len(heatmap_data.columns)) + 0.5, minor=False)
             ax.set_xticklabels(heatmap_data.columns, ha="center")
 
-        if self.params["shape"] == "square":
-            # Square mode using seaborn heatmap
-            sns.heatmap(
-                heatmap_data,
-                annot=self.params["annot"],
-                cmap=self.params["cmap"],
-                cbar=self.params["cbar"],
-                linewidths=self.params["linewidths"],
-                linecolor=self.params["linecolor"],
-                ax=ax,
-            )
+        with stage("draw"):
+            if self.params["shape"] == "square":
+                # Square mode using seaborn heatmap
+                sns.heatmap(
+                    heatmap_data,
+                    annot=self.params["annot"],
+                    cmap=self.params["cmap"],
+                    cbar=self.params["cbar"],
+                    linewidths=self.params["linewidths"],
+                    linecolor=self.params["linecolor"],
+                    ax=ax,
+                )
 
-        elif self.params["shape"] == "circle":
-            # Circle mode using PatchCollection and circles
-            self._plot_circles(ax, heatmap_data)
+            elif self.params["shape"] == "circle":
+                # Circle mode using PatchCollection and circles
+                self._plot_circles(ax, heatmap_data)
 
         # Highlight the specified players' rows
         self._highlight_players(ax, heatmap_data, player_names)
@@ -403,6 +449,7 @@ class PlayerStatsHeatmap:
                     )
                 )
 
+    @instrumented()
     def add_bottom_images(
         self,
         ax=None,
@@ -410,6 +457,7 @@ class PlayerStatsHeatmap:
         logo_zoom=0.12,
         y_offset=-0.08,
         img_size=(260, 260),
+        atlas=False,
     ):
         """Render a horizontal strip of circular images below the x-axis.
 
@@ -428,20 +476,25 @@ class PlayerStatsHeatmap:
             images below the x-axis while keeping them anchored to the plot.
         img_size : tuple[int, int], optional
             Base size used before scaling logos into circles.
+        atlas : bool, optional
+            Draw all images as one image artist instead of one artist per
+            image, which keeps long strips cheap to draw and export.
         """
         if ax is None:
             if self.ax is None:
                 raise ValueError("No axis available; call plot_stat_heatmap first.")
             ax = self.ax
 
-
-        render_bottom_images(
-            ax,
-            image_urls,
-            logo_zoom=logo_zoom,
-            y_offset=y_offset,
-            img_size=img_size,
-        )
+        count_rows("images", len(image_urls or []))
+        with stage("images"):
+            render_bottom_images(
+                ax,
+                image_urls,
+                logo_zoom=logo_zoom,
+                y_offset=y_offset,
+                img_size=img_size,
+                atlas=atlas,
+            )
 
     def _render_bottom_logos(self, ax, heatmap_data, team_logo_url_lst):
         """Render bottom logos when provided and aligned to the x-axis."""
@@ -464,9 +517,11 @@ class PlayerStatsHeatmap:
             logo_zoom=params.get("logo_zoom", 0.12),
             y_offset=params.get("y_offset", -0.08),
             img_size=params.get("img_size", (260, 260)),
+            atlas=params.get("atlas", False),
         )
 
 
+    @instrumented()
     def save_plot(self, directory="output", file_name="plot", file_format=None):
         """
         Save the current plot to the specified directory.
@@ -487,7 +542,7 @@ class PlayerStatsHeatmap:
             if file_format is None:
                 file_format = "png"
             full_path = os.path.join(directory, f"{file_name}.{file_format}")
-            self.fig.savefig(full_path)
+            savefig(self.fig, full_path)
             print(f"Saved figure to {full_path}")
         else:
             raise ValueError("No plot available to save.")
@@ -0,0 +1,318 @@
+"""
+Benchmarks of the data preparation and rendering stages of every chart.
+
+Every benchmark runs on synthetic data (basket_viz.data_util) at several input
+sizes with the Agg backend. For each benchmark and size the report holds the
+median wall time of the call, the time to render the resulting figure, the
+peak memory allocated by the call (tracemalloc) and the number of artists in
+the figure, as JSON.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes small,medium --output out.json
+    python benchmarks/run_benchmarks.py --compare reports/benchmarks.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.artist import Artist  # noqa: E402
+
+from basket_viz.court.shot_charts import ShotChart  # noqa: E402
+from basket_viz.data_util import (  # noqa: E402
+    generate_box_scores,
+    generate_play_by_play,
+    generate_radar_stats,
+)
+from basket_viz.overlay.score_trajectory import TrajectoryPlotter  # noqa: E402
+from basket_viz.radar.standard import RadarChart  # noqa: E402
+from basket_viz.relationships.plotter import PlotRelationship  # noqa: E402
+from basket_viz.stat_grid.season_stats import PlayerStatsHeatmap  # noqa: E402
+
+# Input size of every benchmark: rows of play-by-play, number of games or
+# players, depending on what the chart consumes
+SIZES = {
+    "small": {"rows": 2_000, "shots": 100, "games": 10, "players": 2},
+    "medium": {"rows": 20_000, "shots": 400, "games": 40, "players": 4},
+    "large": {"rows": 200_000, "shots": 1_000, "games": 120, "players": 8},
+}
+
+
+def trajectory_data(play_by_play, column, bin_width=0.5):
+    """Per player shot counts by distance relative to the league, in meters."""
+    distance = np.hypot(play_by_play["COORD_X"], play_by_play["COORD_Y"]) / 100
+    bins = pd.cut(distance, np.arange(0, 10 + bin_width, bin_width))
+    counts = (
+        play_by_play.assign(BIN=bins)
+        .groupby(["PLAYER", "BIN"], observed=False)
+        .size()
+        .rename("shots")
+        .reset_index()
+    )
+    league = counts.groupby("BIN", observed=False)["shots"].transform("mean")
+    counts[column] = counts["shots"] / league.where(league > 0, 1)
+    counts["PLAYER"] = counts["PLAYER"].astype(str)
+    return counts
+
+
+def top_players(play_by_play, n):
+    return play_by_play["PLAYER"].value_counts().index[:n].astype(str).tolist()
+
+
+def bench_get_all_entity_hexbin_data(size):
+    df = generate_play_by_play(n_rows=size["rows"], n_teams=2)
+    return lambda: ShotChart().get_all_entity_hexbin_data(df)
+
+
+def bench_normalize_totals(size):
+    shot_chart = ShotChart()
+    df = generate_play_by_play(n_rows=size["rows"], n_teams=2)
+    all_entities = shot_chart.get_all_entity_hexbin_data(df)
+    return lambda: shot_chart._normalize_totals(all_entities, metric="made")
+
+
+def bench_plot_field_goal_scatter_temporal(size):
+    df = generate_play_by_play(n_rows=size["shots"], n_teams=2)
+    shot_chart = ShotChart()
+    made, miss = shot_chart.get_fg_made_miss(df)
+
+    def run():
+        shot_chart.plot_field_goal_scatter_temporal(made.copy(), miss.copy())
+        return shot_chart.fig
+
+    return run
+
+
+def _box_scores(size):
+    df = generate_play_by_play(n_games=size["games"], n_teams=4)
+    return generate_box_scores(df)
+
+
+def bench_prepare_data(size):
+    box = _box_scores(size)
+    heatmap = PlayerStatsHeatmap()
+    return lambda: heatmap._prepare_data(box, "IST", None, "Points")
+
+
+def _bench_plot_stat_heatmap(size, shape):
+    box = _box_scores(size)
+    heatmap = PlayerStatsHeatmap()
+    heatmap.set_params(shape=shape)
+
+    def run():
+        heatmap.plot_stat_heatmap(box, "IST", [], stat="Points", show=False)
+        return heatmap.fig
+
+    return run
+
+
+def bench_plot_stat_heatmap_square(size):
+    return _bench_plot_stat_heatmap(size, "square")
+
+
+def bench_plot_stat_heatmap_circle(size):
+    return _bench_plot_stat_heatmap(size, "circle")
+
+
+def bench_plot_trajectory_animated(size):
+    column = "normalized_player_shots_relative_to_league"
+    df = generate_play_by_play(n_rows=size["rows"], n_teams=4)
+    data = trajectory_data(df, column)
+    players = top_players(df, size["players"])
+    colors = [f"C{i}" for i in range(len(players))]
+    plotter = TrajectoryPlotter()
+
+    def run():
+        plotter.plot_trajectory_animated(
+            data, players, colors, column=column, frames_per_player=30
+        )
+        return plotter.fig
+
+    return run
+
+
+def bench_compare_radars(size):
+    df = generate_play_by_play(n_games=size["games"], n_teams=4)
+    stats = generate_radar_stats(generate_box_scores(df))
+    columns = ["pointsScored", "totalRebounds", "assists", "steals", "pir"]
+    players = stats["player"].iloc[: size["players"]].tolist()
+    radar = RadarChart(stats, columns)
+
+    def run():
+        radar.compare_radars(players, title="Comparison")
+        return radar.fig
+
+    return run
+
+
+def bench_plot_animated_relationship(size):
+    df = generate_play_by_play(n_rows=size["rows"], n_teams=4)
+    df["TEAM"] = df["TEAM"].astype(str)
+    df["PLAYER"] = df["PLAYER"].astype(str)
+    # No output format: the animation is set up but not encoded
+    plotter = PlotRelationship(use_team_config=False, output_format=None)
+
+    def run():
+        plotter.plot_animated_relationship(df, team_filter="IST")
+        return plt.gcf()
+
+    return run
+
+
+BENCHMARKS = {
+    "ShotChart.get_all_entity_hexbin_data": bench_get_all_entity_hexbin_data,
+    "ShotChart._normalize_totals": bench_normalize_totals,
+    "ShotChart.plot_field_goal_scatter_temporal": (
+        bench_plot_field_goal_scatter_temporal
+    ),
+    "PlayerStatsHeatmap._prepare_data": bench_prepare_data,
+    "PlayerStatsHeatmap.plot_stat_heatmap[square]": bench_plot_stat_heatmap_square,
+    "PlayerStatsHeatmap.plot_stat_heatmap[circle]": bench_plot_stat_heatmap_circle,
+    "TrajectoryPlotter.plot_trajectory_animated": bench_plot_trajectory_animated,
+    "RadarChart.compare_radars": bench_compare_radars,
+    "PlotRelationship.plot_animated_relationship": bench_plot_animated_relationship,
+}
+
+
+def _call(run):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run()
+
+
+def measure(run, repeats):
+    """Median wall time, render time, peak memory and artist count of a run."""
+    times, render_times = [], []
+    artists = None
+    for _ in range(repeats):
+        plt.close("all")
+        start = time.perf_counter()
+        result = _call(run)
+        times.append(time.perf_counter() - start)
+
+        if isinstance(result, plt.Figure):
+            start = time.perf_counter()
+            result.canvas.draw()
+            render_times.append(time.perf_counter() - start)
+            artists = len(result.findobj(Artist))
+
+    # Memory is measured in a separate run, tracemalloc slows the calls down
+    plt.close("all")
+    tracemalloc.start()
+    _call(run)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    plt.close("all")
+
+    return {
+        "wall_s": statistics.median(times),
+        "wall_s_min": min(times),
+        "render_s": statistics.median(render_times) if render_times else None,
+        "peak_mem_mb": peak / 2**20,
+        "artists": artists,
+        "repeats": repeats,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the slowdown against a baseline report, return the regressions."""
+    previous = {(r["benchmark"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get((result["benchmark"], result["size"]))
+        if old is None or not old["wall_s"]:
+            continue
+        ratio = result["wall_s"] / old["wall_s"]
+        flag = "  <-- slower" if ratio > threshold else ""
+        print(
+            f"{result['benchmark']} [{result['size']}]: {ratio:.2f}x{flag}",
+            file=sys.stderr,
+        )
+        if ratio > threshold:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="small,medium", help="e.g. small,large")
+    parser.add_argument("--only", default=None, help="Substring of benchmark names")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default=None, help="JSON file, default stdout")
+    parser.add_argument("--compare", default=None, help="Baseline JSON report")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio against the baseline counted as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    # Read before the run, --output may overwrite the baseline file
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    warnings.filterwarnings("ignore")
+    results = []
+    for name, benchmark in BENCHMARKS.items():
+        if args.only and args.only not in name:
+            continue
+        for size_name in args.sizes.split(","):
+            run = benchmark(SIZES[size_name])
+            result = {"benchmark": name, "size": size_name, **SIZES[size_name]}
+            result.update(measure(run, args.repeats))
+            print(
+                f"{name} [{size_name}]: {result['wall_s']:.3f}s", file=sys.stderr
+            )
+            results.append(result)
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if baseline is not None and compare(results, baseline, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
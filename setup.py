@@ -39,4 +39,5 @@ setup(
     python_requires=">=3.8",
     license="MIT",
     install_requires=read_requirements(),
+    entry_points={"console_scripts": ["basket-viz=basket_viz.cli:cli"]},
 )
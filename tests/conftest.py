@@ -0,0 +1,96 @@
+import hashlib
+import threading
+from io import BytesIO
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pytest  # noqa: E402
+import requests  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from basket_viz.data_util import generate_play_by_play  # noqa: E402
+from basket_viz.img_util import (  # noqa: E402
+    ImageCache,
+    processed_images,
+    set_image_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+@pytest.fixture(scope="session")
+def play_by_play():
+    """A few synthetic games of 4 teams, 6 players each."""
+    return generate_play_by_play(n_games=8, n_teams=4, players_per_team=6, seed=3)
+
+
+def png_bytes(color=(200, 30, 30), size=(40, 40)):
+    """Body of a PNG image of a single color."""
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeClient:
+    """
+    Stands in for HTTPClient: serves the bodies of ``images`` (URL to bytes)
+    with an ETag, answers matching conditional requests with a 304 and records
+    every request. ``on_get(url)`` is called at the start of every request.
+    """
+
+    def __init__(self, images=None, on_get=None):
+        self.images = dict(images or {})
+        self.on_get = on_get
+        self.requests = []
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        with self._lock:
+            self.requests.append((url, dict(headers or {})))
+        if self.on_get is not None:
+            self.on_get(url)
+        if url not in self.images:
+            raise requests.HTTPError(f"404 Client Error for url: {url}")
+        body = self.images[url]
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304, headers={"ETag": etag})
+        return FakeResponse(200, body, {"ETag": etag})
+
+    def get_bytes(self, url, timeout=None):
+        return self.get(url, timeout=timeout).content
+
+    def urls(self):
+        return [url for url, _ in self.requests]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def image_cache(tmp_path):
+    """
+    A shared ImageCache in a temporary directory downloading through a
+    FakeClient (``image_cache.client``), with an empty processed_images.
+    """
+    cache = ImageCache(str(tmp_path / "images"), client=FakeClient(), offline=False)
+    previous = set_image_cache(cache)
+    processed_images.clear()
+    yield cache
+    set_image_cache(previous)
+    processed_images.clear()
@@ -0,0 +1,114 @@
+import io
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+
+from basket_viz.img_util import ImageAtlas, render_bottom_images
+from conftest import png_bytes
+
+COLORS = [(220, 40, 40), (40, 160, 40), (40, 40, 220)]
+URLS = [f"https://logos.test/{i}.png" for i in range(len(COLORS))]
+
+
+def _images():
+    images = []
+    for color in COLORS:
+        image = np.zeros((30, 30, 4), dtype=np.uint8)
+        image[...] = color + (255,)
+        image[:5] = (0, 0, 0, 0)  # a transparent band
+        images.append(image)
+    return images
+
+
+def _positions():
+    return [(0.2, 0.3), (0.5, 0.6), (0.8, 0.3)]
+
+
+def _render(fig):
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).astype(int)
+
+
+def _figure(atlas):
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
+    ax.set_axis_off()
+    if atlas:
+        image_atlas = ImageAtlas(ax, transform=ax.transAxes)
+        for image, xy in zip(_images(), _positions()):
+            image_atlas.add(image, xy, zoom=0.8)
+        ax.add_artist(image_atlas)
+    else:
+        for image, xy in zip(_images(), _positions()):
+            ax.add_artist(
+                AnnotationBbox(
+                    OffsetImage(image, zoom=0.8),
+                    xy,
+                    xycoords="axes fraction",
+                    frameon=False,
+                    pad=0,
+                )
+            )
+    return fig, ax
+
+
+def test_atlas_renders_like_annotation_boxes():
+    expected = _render(_figure(atlas=False)[0])
+    actual = _render(_figure(atlas=True)[0])
+
+    # Edges may fall one pixel apart
+    assert (np.abs(actual - expected).max(axis=2) > 40).mean() < 0.01
+    assert (actual != 255).any()
+
+
+def test_texture_is_cached_until_the_layout_changes():
+    fig, ax = _figure(atlas=True)
+    (image_atlas,) = [a for a in ax.artists if isinstance(a, ImageAtlas)]
+    _render(fig)
+    texture = image_atlas.get_array()
+
+    _render(fig)
+    assert image_atlas.get_array() is texture
+
+    fig.set_size_inches(6, 4)
+    _render(fig)
+    assert image_atlas.get_array() is not texture
+
+    texture = image_atlas.get_array()
+    image_atlas.add(_images()[0], (0.5, 0.1))
+    _render(fig)
+    assert image_atlas.get_array() is not texture
+    assert len(image_atlas) == 4
+
+
+def test_svg_embeds_one_image():
+    svg = {}
+    for atlas in (False, True):
+        buffer = io.BytesIO()
+        _figure(atlas)[0].savefig(buffer, format="svg")
+        svg[atlas] = buffer.getvalue().decode()
+
+    assert svg[False].count("<image") == len(COLORS)
+    assert svg[True].count("<image") == 1
+
+
+def test_empty_atlas_draws_nothing():
+    fig, ax = plt.subplots()
+    ax.add_artist(ImageAtlas(ax))
+
+    _render(fig)
+
+
+def test_bottom_images_atlas(image_cache):
+    image_cache.client.images.update(
+        {url: png_bytes(color) for url, color in zip(URLS, COLORS)}
+    )
+    _, ax = plt.subplots()
+
+    render_bottom_images(ax, URLS, atlas=True)
+
+    (image_atlas,) = ax.artists
+    assert isinstance(image_atlas, ImageAtlas)
+    assert [xy for _, xy, _ in image_atlas.entries] == [
+        ((i + 0.5) / 3, -0.08) for i in range(3)
+    ]
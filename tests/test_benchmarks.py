@@ -0,0 +1,69 @@
+import importlib.util
+import json
+import os
+
+import matplotlib.pyplot as plt
+import pytest
+
+PATH = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "run_benchmarks.py")
+
+
+@pytest.fixture(scope="module")
+def benchmarks():
+    spec = importlib.util.spec_from_file_location("run_benchmarks", PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run(benchmarks, *args):
+    options = ["--only", "_prepare_data", "--sizes", "small", "--repeats", "1"]
+    return benchmarks.main(options + list(args))
+
+
+def test_report_layout(benchmarks, tmp_path):
+    output = tmp_path / "reports" / "benchmarks.json"
+
+    assert _run(benchmarks, "--output", str(output)) == 0
+
+    report = json.loads(output.read_text())
+    assert set(report["environment"]) >= {"commit", "python", "numpy", "pandas"}
+    (result,) = report["results"]
+    assert result["benchmark"] == "PlayerStatsHeatmap._prepare_data"
+    assert result["size"] == "small" and result["games"] == 10
+    assert result["wall_s"] > 0 and result["peak_mem_mb"] > 0
+    # Data preparation returns no figure
+    assert result["render_s"] is None and result["artists"] is None
+
+
+def test_measure_renders_figures(benchmarks):
+    def run():
+        fig, ax = plt.subplots()
+        ax.plot([0, 1], [0, 1])
+        return fig
+
+    result = benchmarks.measure(run, repeats=2)
+
+    assert result["repeats"] == 2
+    assert result["render_s"] > 0
+    assert result["artists"] > 1
+
+
+def test_compare_against_the_baseline_it_overwrites(benchmarks, tmp_path):
+    output = tmp_path / "benchmarks.json"
+    _run(benchmarks, "--output", str(output))
+    baseline = json.loads(output.read_text())
+    baseline["results"][0]["wall_s"] = 1e-9
+    output.write_text(json.dumps(baseline))
+
+    # The baseline is read before the new report replaces it
+    assert _run(benchmarks, "--output", str(output), "--compare", str(output)) == 1
+    assert json.loads(output.read_text())["results"][0]["wall_s"] > 1e-9
+    assert _run(benchmarks, "--compare", str(output), "--threshold", "1e12") == 0
+
+
+def test_compare_skips_unknown_benchmarks(benchmarks):
+    results = [{"benchmark": "new", "size": "small", "wall_s": 1.0}]
+    baseline = {"results": [{"benchmark": "old", "size": "small", "wall_s": 0.1}]}
+
+    assert benchmarks.compare(results, baseline, threshold=1.25) == []
@@ -0,0 +1,77 @@
+import threading
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.offsetbox import AnnotationBbox
+
+from basket_viz.data_util import generate_box_scores
+from basket_viz.img_util import render_bottom_images
+from basket_viz.stat_grid.season_stats import PlayerStatsHeatmap
+from conftest import png_bytes
+
+COLORS = [(200, 30, 30), (30, 200, 30), (30, 30, 200), (200, 200, 30)]
+URLS = [f"https://logos.test/{i}.png" for i in range(len(COLORS))]
+
+
+def _boxes(ax):
+    return [a for a in ax.artists if isinstance(a, AnnotationBbox)]
+
+
+def _serve(image_cache, on_get=None):
+    client = image_cache.client
+    client.images.update({url: png_bytes(c) for url, c in zip(URLS, COLORS)})
+    client.on_get = on_get
+    return client
+
+
+def test_downloads_run_concurrently(image_cache):
+    # Every download waits until all of them have started, which only
+    # happens if they run at the same time
+    barrier = threading.Barrier(len(URLS), timeout=5)
+    client = _serve(image_cache, on_get=lambda url: barrier.wait())
+    urls = URLS + URLS[:2]
+    _, ax = plt.subplots()
+
+    render_bottom_images(ax, urls, max_workers=len(URLS))
+
+    assert sorted(client.urls()) == sorted(URLS)
+    boxes = _boxes(ax)
+    assert [box.xybox[0] for box in boxes] == [(i + 0.5) / 6 for i in range(6)]
+    # Images are drawn in the order of the urls
+    for box, url in zip(boxes, urls):
+        color = COLORS[URLS.index(url)]
+        np.testing.assert_array_equal(box.offsetbox.get_data()[130, 130, :3], color)
+
+
+def test_processed_images_are_not_fetched_again(image_cache):
+    client = _serve(image_cache)
+    _, ax = plt.subplots()
+    render_bottom_images(ax, URLS)
+
+    render_bottom_images(ax, URLS[::-1])
+
+    assert len(client.requests) == len(URLS)
+    assert len(_boxes(ax)) == 2 * len(URLS)
+
+
+def test_failed_images_leave_a_gap(image_cache, capsys):
+    _serve(image_cache)
+    urls = [URLS[0], "https://logos.test/missing.png", URLS[1]]
+    _, ax = plt.subplots()
+
+    render_bottom_images(ax, urls)
+
+    assert [box.xybox[0] for box in _boxes(ax)] == [0.5 / 3, 2.5 / 3]
+    assert "missing.png" in capsys.readouterr().out
+
+
+def test_heatmap_logos(image_cache, play_by_play):
+    _serve(image_cache)
+    box = generate_box_scores(play_by_play)
+    heatmap = PlayerStatsHeatmap()
+    team = box["Team"].iloc[0]
+    ax = heatmap.plot_stat_heatmap(box, team, [], num_games=4, show=False)
+
+    heatmap.add_bottom_images(image_urls=URLS)
+
+    assert len(_boxes(ax)) == len(URLS)
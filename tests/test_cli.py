@@ -0,0 +1,123 @@
+import os
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from basket_viz import cli as cli_module
+from basket_viz.cli import cli
+from basket_viz.img_util import ImageCache, set_image_cache
+from basket_viz.radar.standard import HEADSHOT_VARIANT as RADAR_VARIANT
+from basket_viz.radar.standard import RadarChart
+from basket_viz.relationships.plotter_v2 import HEADSHOT_VARIANT, PlotRelation
+from conftest import FakeClient, png_bytes
+
+LOGO = "https://logos.test/team.png"
+HEADSHOT = "https://heads.test/relation.png"
+RADAR = "https://heads.test/radar.png"
+SHARED = "https://heads.test/shared.png"
+
+
+@pytest.fixture
+def client(image_cache, monkeypatch):
+    """The client prefetch downloads with, serving every test image."""
+    client = FakeClient(
+        {url: png_bytes(size=(60, 90)) for url in (LOGO, HEADSHOT, RADAR, SHARED)}
+    )
+    monkeypatch.setattr(cli_module, "HTTPClient", lambda **kwargs: client)
+    return client
+
+
+@pytest.fixture
+def files(tmp_path):
+    logos = tmp_path / "logos.txt"
+    logos.write_text(f"# EuroLeague\n{LOGO}\n{SHARED}\n")
+    relation = tmp_path / "relation.csv"
+    pd.DataFrame({"PLAYER": ["A", "B"], "PLAYER_IMAGE": [HEADSHOT, None]}).to_csv(
+        relation, index=False
+    )
+    radar = tmp_path / "radar.jsonl"
+    pd.DataFrame(
+        {"player": ["C", "D", "E"], "player.imageUrl": [RADAR, SHARED, SHARED]}
+    ).to_json(radar, orient="records", lines=True)
+    return {"logos": str(logos), "relation": str(relation), "radar": str(radar)}
+
+
+def _prefetch(tmp_path, files, *args):
+    cache_dir = str(tmp_path / "cache")
+    result = CliRunner().invoke(
+        cli,
+        [
+            "prefetch",
+            files["relation"],
+            files["radar"],
+            "--logos",
+            files["logos"],
+            "--cache-dir",
+            cache_dir,
+            *args,
+        ],
+    )
+    return result, ImageCache(cache_dir, offline=True)
+
+
+def test_every_image_is_downloaded_once_and_processed(tmp_path, client, files):
+    result, cache = _prefetch(tmp_path, files)
+
+    assert result.exit_code == 0, result.output
+    assert "4 images ready, 0 failed" in result.output
+    assert sorted(client.urls()) == sorted([LOGO, HEADSHOT, RADAR, SHARED])
+    assert client.closed
+    assert cache.get_processed(LOGO, "circle-260x260") is not None
+    assert cache.get_processed(HEADSHOT, HEADSHOT_VARIANT).shape == (90, 60, 4)
+    assert cache.get_processed(RADAR, RADAR_VARIANT).shape == (64, 60, 4)
+    # A logo that is also a radar headshot gets both variants
+    assert cache.get_processed(SHARED, "circle-260x260") is not None
+    assert cache.get_processed(SHARED, RADAR_VARIANT) is not None
+
+
+def test_charts_render_from_the_prefetched_variants(tmp_path, client, files):
+    _, cache = _prefetch(tmp_path, files)
+    # The images themselves can no longer be decoded, only their variants
+    for url in (HEADSHOT, RADAR):
+        with open(cache._blob_path(cache._read_entry(url)["sha256"]), "wb") as f:
+            f.write(b"not an image")
+    set_image_cache(cache)
+
+    processor = PlotRelation.fetch_headshot(HEADSHOT)
+    radar = RadarChart(pd.read_json(files["radar"], lines=True), [])
+    cropped = radar.comparison_image("C")()
+
+    assert processor.image.size == (60, 90)
+    assert cropped.size == (60, 64)
+
+
+def test_radar_image_dir_saves_a_crop_per_player(tmp_path, client, files):
+    image_dir = tmp_path / "radar-images"
+
+    result, _ = _prefetch(tmp_path, files, "--radar-image-dir", str(image_dir))
+
+    assert result.exit_code == 0, result.output
+    assert sorted(os.listdir(image_dir)) == ["C.png", "D.png", "E.png"]
+    assert client.urls().count(SHARED) == 1
+
+
+def test_failures_are_listed_and_exit_with_1(tmp_path, client, files):
+    del client.images[HEADSHOT]
+
+    result, _ = _prefetch(tmp_path, files, "--workers", "2")
+
+    assert result.exit_code == 1
+    assert "3 images ready, 1 failed" in result.output
+    assert HEADSHOT in result.output
+
+
+def test_no_image_urls(tmp_path, client):
+    empty = tmp_path / "empty.csv"
+    pd.DataFrame({"PLAYER": ["A"]}).to_csv(empty, index=False)
+
+    result = CliRunner().invoke(cli, ["prefetch", str(empty)])
+
+    assert result.exit_code == 0
+    assert "No image URLs found." in result.output
+    assert client.requests == []
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from basket_viz.court.shot_charts import ShotChart
+from basket_viz.data_util import ColumnCache, load_cached, load_play_by_play
+
+READS = []
+
+
+def counting_reader(path, **kwargs):
+    READS.append(path)
+    return pd.read_csv(path, **kwargs)
+
+
+@pytest.fixture
+def source(tmp_path, play_by_play):
+    path = tmp_path / "play_by_play.csv"
+    play_by_play.assign(PLAYINFO="shot").to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ColumnCache(str(tmp_path / "cache"))
+
+
+def _expected(source, games=None, teams=None, columns=None):
+    df = pd.read_csv(source)
+    df = df.iloc[np.argsort(df["GAME_ID"].to_numpy(), kind="stable")]
+    if games is not None:
+        df = df[df["GAME_ID"].isin(games)]
+    if teams is not None:
+        df = df[df["TEAM"].isin(teams)]
+    return df[columns or list(df.columns)].reset_index(drop=True)
+
+
+def test_cold_and_warm_loads_match_read_csv(source, cache):
+    READS.clear()
+
+    cold = cache.load(source, reader=counting_reader)
+    warm = cache.load(source, reader=counting_reader)
+
+    assert READS == [source]
+    pd.testing.assert_frame_equal(cold, _expected(source), check_dtype=False)
+    pd.testing.assert_frame_equal(warm, cold)
+
+
+def test_projection_reads_only_the_requested_columns(source, cache):
+    df = cache.load(source, columns=["COORD_X", "PLAYER"])
+
+    assert list(df.columns) == ["COORD_X", "PLAYER"]
+    pd.testing.assert_frame_equal(
+        df, _expected(source, columns=["COORD_X", "PLAYER"]), check_dtype=False
+    )
+    with pytest.raises(KeyError, match="SHOT_CLOCK"):
+        cache.load(source, columns=["SHOT_CLOCK"])
+
+
+@pytest.mark.parametrize(
+    "games, teams", [([3, 4], None), (None, ["IST"]), ([2, 5, 99], ["IST", "MAD"])]
+)
+def test_game_and_team_filters(source, cache, play_by_play, games, teams):
+    teams = teams and [t for t in teams if t in set(play_by_play["TEAM"])]
+
+    df = cache.load(source, games=games, teams=teams)
+
+    expected = _expected(source, games=games, teams=teams)
+    assert len(df) > 0
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("teams", [None, ["IST"]])
+def test_no_matching_game_gives_an_empty_frame(source, cache, teams):
+    df = cache.load(source, games=[999], teams=teams, reader=load_play_by_play)
+
+    assert len(df) == 0
+    assert list(df.columns) == list(load_play_by_play(source).columns)
+
+
+def test_game_ids_match_the_type_the_reader_parsed(source, cache, play_by_play):
+    # load_play_by_play parses GAME_ID as a categorical of strings
+    teams = [play_by_play.loc[play_by_play["GAME_ID"] == 3, "TEAM"].iloc[0]]
+    expected = _expected(source, games=[3, 4], teams=teams)
+
+    for games in ([3, 4], ["3", "4"], [3.0, np.int64(4)]):
+        df = cache.load(source, games=games, teams=teams, reader=load_play_by_play)
+        assert len(df) == len(expected) > 0
+    assert len(cache.load(source, games=["3", "4"])) == len(_expected(source, [3, 4]))
+    with pytest.raises(TypeError):
+        cache.load(source, games=["third"])
+
+
+def test_cache_keys(source, cache, tmp_path):
+    key = cache.key(source)
+
+    assert cache.key(source) == key
+    assert cache.key(source, reader=load_play_by_play) != key
+    assert cache.key(source, sep=";") != key
+    with pytest.raises(TypeError):
+        cache.key(source, reader=lambda path: pd.read_csv(path))
+
+    # A changed file is parsed again
+    with open(source, "a") as f:
+        f.write("999,IST,X,2FGM,2,0,0,20240101000000,shot\n")
+    assert cache.key(source) != key
+    assert cache.load(source)["GAME_ID"].max() == 999
+    # The hash of the source is remembered in one file per source path
+    assert len(os.listdir(os.path.join(cache.cache_dir, "sources"))) == 1
+
+
+def test_charts_load_their_columns(source, tmp_path):
+    cache_dir = str(tmp_path / "charts")
+    chart = ShotChart()
+
+    df = chart.load_cached(
+        source, games=[3, 4], reader=load_play_by_play, cache_dir=cache_dir
+    )
+
+    assert "PLAYINFO" not in df
+    assert len(df) == len(_expected(source, games=[3, 4]))
+    made, miss = chart.get_fg_made_miss(df)
+    assert len(made) + len(miss) == len(df)
+    assert load_cached(source, cache_dir=cache_dir, columns=["UTC"]).shape[1] == 1
@@ -0,0 +1,74 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+from basket_viz.court.hex_grid import HexGrid
+from basket_viz.court.shot_charts import ShotChart
+
+EXTENT = (-800, 800, -200, 1300)
+
+
+def _values(grid, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.random(grid.n_cells)
+    values[rng.random(grid.n_cells) < 0.5] = np.nan
+    return values
+
+
+def test_draw_matches_hexbin_of_the_precomputed_values():
+    grid = HexGrid(15, EXTENT)
+    values = _values(grid)
+    visible = ~np.isnan(values)
+
+    _, ax = plt.subplots()
+    hc = ax.hexbin(
+        grid.offsets[visible, 0],
+        grid.offsets[visible, 1],
+        C=values[visible],
+        gridsize=15,
+        extent=EXTENT,
+    )
+    _, ax = plt.subplots()
+    drawn = grid.draw(ax, values)
+
+    np.testing.assert_allclose(drawn.get_offsets(), hc.get_offsets())
+    np.testing.assert_allclose(drawn.get_array(), hc.get_array())
+    np.testing.assert_allclose(
+        drawn.get_paths()[0].vertices, hc.get_paths()[0].vertices
+    )
+
+
+def test_values_are_drawn_in_their_own_cell():
+    grid = HexGrid(15, EXTENT)
+    values = np.full(grid.n_cells, np.nan)
+    values[[3, 200, grid.n_cells - 1]] = [1, 2, 3]
+    values = np.ma.masked_invalid(values)
+    values[200] = np.ma.masked
+
+    _, ax = plt.subplots()
+    drawn = grid.draw(ax, values)
+
+    np.testing.assert_allclose(drawn.get_offsets(), grid.offsets[[3, -1]])
+    np.testing.assert_array_equal(drawn.get_array(), [1, 3])
+    assert drawn in ax.collections
+
+
+def test_collection_is_not_added_to_the_axes():
+    grid = HexGrid(15, EXTENT)
+    _, ax = plt.subplots()
+
+    collection = grid.collection(ax, _values(grid), cmap="viridis")
+
+    assert collection not in ax.collections
+    assert collection.get_cmap().name == "viridis"
+
+
+def test_plot_hexbin_level_draws_the_visited_cells(play_by_play):
+    chart = ShotChart()
+    pyramid = chart.build_hexbin_pyramid(play_by_play, gridsizes=(25,))
+
+    chart.plot_hexbin_level(pyramid, gridsize=25, values_key="values_all")
+
+    level = pyramid.level(25)
+    hexagons = [c for c in chart.fig.axes[0].collections if c.get_array() is not None]
+    visited = np.ma.filled(level["values_all"], 0) > 0
+    np.testing.assert_allclose(hexagons[0].get_offsets(), level["offsets"][visited])
@@ -0,0 +1,48 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from basket_viz.court.hex_grid import HexGrid
+
+EXTENT = (-800, 800, -200, 1300)
+
+
+def _points(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    # Some points fall outside the extent
+    x = rng.uniform(-900, 900, n)
+    y = rng.uniform(-300, 1400, n)
+    return x, y
+
+
+@pytest.mark.parametrize("gridsize", [10, 15, 25, (20, 12)])
+def test_counts_match_matplotlib_hexbin(gridsize):
+    x, y = _points()
+    hc = plt.hexbin(x, y, gridsize=gridsize, extent=EXTENT, mincnt=0)
+
+    grid = HexGrid(gridsize, EXTENT)
+
+    np.testing.assert_allclose(grid.offsets, hc.get_offsets())
+    np.testing.assert_array_equal(grid.count(x, y), hc.get_array())
+
+
+def test_weighted_counts_sum_the_weights():
+    x, y = _points(500)
+    weights = np.arange(len(x), dtype=float)
+    grid = HexGrid(15, EXTENT)
+
+    index = grid.bin_index(x, y)
+    expected = np.zeros(grid.n_cells)
+    np.add.at(expected, index[index >= 0], weights[index >= 0])
+
+    np.testing.assert_allclose(grid.count(x, y, weights=weights), expected)
+
+
+def test_points_outside_the_grid_get_no_cell():
+    grid = HexGrid(15, EXTENT)
+
+    index = grid.bin_index([0, 5000, -5000], [500, 500, 500])
+
+    assert index[0] >= 0
+    assert list(index[1:]) == [-1, -1]
+    assert grid.count([5000], [500]).sum() == 0
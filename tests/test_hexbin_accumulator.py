@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from basket_viz.court.hexbin_accumulator import HexbinAccumulator
+from basket_viz.court.shot_charts import ShotChart
+
+
+def _by_name(df):
+    return {row.player_name: row for row in df.itertuples()}
+
+
+def _assert_same_counts(actual, expected):
+    actual, expected = _by_name(actual), _by_name(expected)
+    assert set(actual) == set(expected)
+    for name, row in expected.items():
+        for column in ("values_made", "values_missed", "values_all"):
+            np.testing.assert_array_equal(
+                np.ma.filled(getattr(actual[name], column), 0),
+                np.ma.filled(getattr(row, column), 0),
+            )
+
+
+def test_snapshot_matches_get_all_entity_hexbin_data(play_by_play):
+    chart = ShotChart()
+    accumulator = HexbinAccumulator(chart)
+    accumulator.update(play_by_play)
+
+    expected = chart.get_all_entity_hexbin_data(play_by_play)
+    snapshot = accumulator.snapshot()
+
+    _assert_same_counts(snapshot, expected)
+    row, expected_row = _by_name(snapshot), _by_name(expected)
+    for name in row:
+        np.testing.assert_allclose(
+            np.ma.filled(row[name].values_ratio, np.nan),
+            np.ma.filled(expected_row[name].values_ratio, np.nan),
+        )
+
+
+def test_updates_game_by_game_match_one_batch(play_by_play):
+    chart = ShotChart()
+    batch = HexbinAccumulator(chart)
+    batch.update(play_by_play)
+
+    incremental = HexbinAccumulator(chart)
+    for game_id in play_by_play["GAME_ID"].unique():
+        incremental.update(play_by_play[play_by_play["GAME_ID"] == game_id])
+
+    assert incremental.games == batch.games
+    _assert_same_counts(incremental.snapshot(), batch.snapshot())
+
+
+def test_replayed_game_replaces_its_counts(play_by_play):
+    chart = ShotChart()
+    first_game = play_by_play[play_by_play["GAME_ID"] == 1]
+    accumulator = HexbinAccumulator(chart)
+    accumulator.update(play_by_play)
+    before = accumulator.snapshot()
+
+    # Feeding a game again does not count it twice
+    accumulator.update(first_game)
+    _assert_same_counts(accumulator.snapshot(), before)
+
+    # A corrected game replaces the previous version
+    accumulator.update(first_game.iloc[:10])
+    expected = HexbinAccumulator(chart)
+    expected.update(play_by_play[play_by_play["GAME_ID"] != 1])
+    expected.update(first_game.iloc[:10])
+    total = accumulator.snapshot()["values_all"].apply(np.sum).sum()
+    assert total == expected.snapshot()["values_all"].apply(np.sum).sum()
+
+
+def test_remove_game(play_by_play):
+    chart = ShotChart()
+    accumulator = HexbinAccumulator(chart)
+    accumulator.update(play_by_play)
+
+    accumulator.remove_game(1)
+
+    expected = HexbinAccumulator(chart)
+    expected.update(play_by_play[play_by_play["GAME_ID"] != 1])
+    totals = accumulator.snapshot().set_index("player_name")["values_all"]
+    for name, values in expected.snapshot().set_index("player_name")[
+        "values_all"
+    ].items():
+        np.testing.assert_array_equal(totals[name], values)
+    with pytest.raises(KeyError):
+        accumulator.remove_game(1)
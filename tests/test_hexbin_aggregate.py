@@ -0,0 +1,109 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from basket_viz.court.hex_grid import HexGrid
+from basket_viz.court.shot_charts import ShotChart
+
+EXTENT = (-800, 800, -200, 1300)
+
+
+@pytest.mark.parametrize(
+    "reduce, function", [("mean", np.mean), ("sum", np.sum), ("max", np.max)]
+)
+def test_aggregate_matches_matplotlib_reduce_c_function(reduce, function):
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-800, 800, 800), rng.uniform(-200, 1300, 800)
+    C = rng.random(800)
+    hc = plt.hexbin(
+        x, y, C=C, gridsize=15, extent=EXTENT, reduce_C_function=function
+    )
+
+    grid = HexGrid(15, EXTENT)
+    values = grid.aggregate(x, y, C, reduce=reduce)
+    visited = grid.count(x, y) > 0
+
+    np.testing.assert_allclose(grid.offsets[visited], hc.get_offsets())
+    np.testing.assert_allclose(values[visited], hc.get_array())
+
+
+def test_empty_cells_and_unknown_reduce():
+    grid = HexGrid(15, EXTENT)
+    x, y, C = [0.0, 0.0], [500.0, 500.0], [1.0, 3.0]
+
+    assert np.nansum(grid.aggregate(x, y, C, reduce="min")) == 1
+    assert np.isnan(grid.aggregate(x, y, C, reduce="mean")).sum() == grid.n_cells - 1
+    assert grid.aggregate(x, y, C, reduce="count").sum() == 2
+    with pytest.raises(ValueError):
+        grid.aggregate(x, y, C, reduce="median")
+
+
+def _shots_per_cell(chart, df, values):
+    """Reference aggregation of per-shot values with a pandas groupby."""
+    made, miss = chart.get_fg_made_miss(df)
+    shots = pd.concat([made, miss])
+    cells = HexGrid(15, EXTENT).bin_index(shots["COORD_X"], shots["COORD_Y"])
+    return shots, pd.Series(values(shots), index=shots.index).groupby(cells)
+
+
+def test_points_per_shot(play_by_play):
+    chart = ShotChart()
+
+    _, values = chart.get_hexbin_aggregate(play_by_play, weights="points")
+
+    _, grouped = _shots_per_cell(chart, play_by_play, lambda s: s["POINTS"])
+    expected = grouped.mean().drop(-1, errors="ignore")
+    np.testing.assert_allclose(values[expected.index], expected.to_numpy())
+    assert np.isnan(np.delete(values, expected.index)).all()
+
+
+def test_expected_points_use_the_hexbin_percentage(play_by_play):
+    chart = ShotChart()
+
+    _, values = chart.get_hexbin_aggregate(
+        play_by_play, weights="expected_points", reduce="sum"
+    )
+
+    made, miss = chart.get_fg_made_miss(play_by_play)
+    shots = pd.concat([made, miss])
+    cells = HexGrid(15, EXTENT).bin_index(shots["COORD_X"], shots["COORD_Y"])
+    shot_value = shots["ID_ACTION"].astype(str).map(chart.config["action_points"])
+    made_ratio = (
+        shots["ID_ACTION"].isin(chart.config["made_action_ids"]).groupby(cells).mean()
+    )
+    expected = (
+        (shot_value * made_ratio.reindex(cells).to_numpy())
+        .groupby(cells)
+        .sum()
+        .drop(-1, errors="ignore")
+    )
+    np.testing.assert_allclose(values[expected.index], expected.to_numpy())
+
+
+def test_series_weights_are_aligned_on_the_index(play_by_play):
+    chart = ShotChart()
+    weights = pd.Series(np.arange(len(play_by_play), dtype=float), play_by_play.index)
+
+    _, aligned = chart.get_hexbin_aggregate(play_by_play, weights=weights, reduce="max")
+    _, shuffled = chart.get_hexbin_aggregate(
+        play_by_play, weights=weights.sample(frac=1, random_state=0), reduce="max"
+    )
+
+    np.testing.assert_array_equal(aligned, shuffled)
+    with pytest.raises(ValueError):
+        chart.get_hexbin_aggregate(play_by_play, weights=pd.concat([weights] * 2))
+    with pytest.raises(TypeError):
+        chart.get_hexbin_aggregate(play_by_play, weights=np.ones(len(play_by_play)))
+
+
+def test_points_per_shot_plot_keeps_scoreless_hexbins(play_by_play):
+    chart = ShotChart()
+    team = play_by_play["TEAM"].iloc[0]
+
+    chart.plot_points_per_shot(play_by_play, team_name=team)
+
+    _, values = chart.get_hexbin_aggregate(play_by_play, team_name=team)
+    hexagons = [c for c in chart.fig.axes[0].collections if c.get_array() is not None]
+    assert len(hexagons[0].get_array()) == np.isfinite(values).sum()
+    assert (values == 0).any()
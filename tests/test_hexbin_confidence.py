@@ -0,0 +1,108 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from basket_viz.court.hex_grid import HexGrid
+from basket_viz.court.shot_charts import ShotChart
+
+N_CELLS = HexGrid(15).n_cells
+
+
+def _entities(made, attempts):
+    """Entities with the given made/attempts in the first len(made[0]) cells."""
+    made = np.asarray(made, dtype=float)
+    attempts = np.asarray(attempts, dtype=float)
+    pad = ((0, 0), (0, N_CELLS - made.shape[1]))
+    made, attempts = np.pad(made, pad), np.pad(attempts, pad)
+    return pd.DataFrame(
+        {
+            "player_name": [f"P{i}" for i in range(len(made))],
+            "offsets": [HexGrid(15).offsets] * len(made),
+            "values_made": list(made),
+            "values_missed": list(attempts - made),
+            "values_all": list(attempts),
+        }
+    )
+
+
+def _column(df, name):
+    return np.vstack(df[name])
+
+
+def test_seeded_intervals_are_reproducible_and_cacheable(play_by_play):
+    chart = ShotChart()
+    hexbin_data = chart.get_all_entity_hexbin_data(play_by_play)
+
+    first = chart.get_hexbin_confidence(hexbin_data, n_replicates=200, seed=5)
+    second = chart.get_hexbin_confidence(hexbin_data, n_replicates=200, seed=5)
+
+    np.testing.assert_array_equal(
+        _column(first, "ratio_ci_low"), _column(second, "ratio_ci_low")
+    )
+    assert first.attrs["hexbin_confidence"]["n_replicates"] == 200
+    assert first.attrs["hexbin_confidence"]["seed"] == 5
+
+    attempts = _column(hexbin_data, "values_all")
+    low, high = _column(first, "ratio_ci_low"), _column(first, "ratio_ci_high")
+    assert np.isnan(low[attempts == 0]).all()
+    assert (low[attempts > 0] <= high[attempts > 0]).all()
+    assert ((low[attempts > 0] >= 0) & (high[attempts > 0] <= 1)).all()
+
+
+def test_plain_bootstrap_matches_the_normal_approximation():
+    # 200 of 400 in one cell, and the rest of the league at the same rate
+    df = _entities([[200], [2000]], [[400], [4000]])
+
+    result = ShotChart().get_hexbin_confidence(
+        df, n_replicates=4000, seed=0, prior_strength=0
+    )
+
+    half_width = 1.96 * np.sqrt(0.5 * 0.5 / 400)
+    assert result["ratio_ci_low"][0][0] == pytest.approx(0.5 - half_width, abs=0.01)
+    assert result["ratio_ci_high"][0][0] == pytest.approx(0.5 + half_width, abs=0.01)
+    assert not result["ratio_significant"][0][0]
+
+
+def test_significance_needs_attempts_and_a_clear_difference():
+    # League at ~40%: a 1-for-1, a 5-for-5, a 4-for-4 below min_attempts and a
+    # 80-for-100 entity, next to a high volume entity defining the league
+    df = _entities(
+        [[1, 5, 4, 80], [0, 0, 0, 0], [400, 400, 400, 400]],
+        [[1, 5, 4, 100], [0, 0, 0, 0], [1000, 1000, 1000, 1000]],
+    )
+
+    result = ShotChart().get_hexbin_confidence(df, seed=1, min_attempts=5)
+
+    significant = result["ratio_significant"][0]
+    assert result["ratio_ci_low"][0][0] == 0 and result["ratio_ci_high"][0][0] == 1
+    assert not significant[0]
+    assert not significant[2]
+    assert significant[3]
+    assert not result["ratio_significant"][1].any()
+
+
+def test_every_hexbin_greyed_out_keeps_a_finite_color_scale():
+    chart = ShotChart()
+    df = _entities([[1, 2, 3]], [[2, 4, 6]])
+    df["ratio_significant"] = [np.zeros(N_CELLS, dtype=bool)]
+    ratio = np.zeros(N_CELLS)
+    ratio[:3] = 0.5
+    df["values_ratio"] = [ratio]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        chart.plot_entity_hexbin(
+            df,
+            "offsets",
+            "values_ratio",
+            "P0",
+            significance_col="ratio_significant",
+        )
+
+    ax = chart.fig.axes[0]
+    grey, colored = [c for c in ax.collections if c.get_array() is not None]
+    assert len(grey.get_offsets()) == 3
+    assert len(colored.get_offsets()) == 0
+    assert colored.norm.vmax == pytest.approx(0.5)
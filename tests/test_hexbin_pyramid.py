@@ -0,0 +1,65 @@
+import numpy as np
+
+from basket_viz.court.hex_grid import HexGrid
+from basket_viz.court.shot_charts import ShotChart
+
+
+def _made_miss(play_by_play):
+    chart = ShotChart()
+    return chart, *chart.get_fg_made_miss(play_by_play)
+
+
+def test_levels_match_binning_the_raw_shots(play_by_play):
+    chart, made, miss = _made_miss(play_by_play)
+
+    pyramid = chart.build_hexbin_pyramid(play_by_play, gridsizes=(10, 25))
+
+    for gridsize in (10, 25):
+        grid = HexGrid(gridsize, chart.config["hexagon_extent"])
+        level = pyramid.level(gridsize)
+        expected_made = grid.count(made["COORD_X"], made["COORD_Y"])
+        expected_missed = grid.count(miss["COORD_X"], miss["COORD_Y"])
+
+        np.testing.assert_allclose(level["offsets"], grid.offsets)
+        np.testing.assert_array_equal(level["values_made"], expected_made)
+        np.testing.assert_array_equal(level["values_missed"], expected_missed)
+        np.testing.assert_array_equal(
+            level["values_all"], expected_made + expected_missed
+        )
+
+    assert pyramid.n_shots == len(made) + len(miss)
+
+
+def test_ratio_matches_get_entity_hexbin_data(play_by_play):
+    chart = ShotChart()
+    player = play_by_play["PLAYER"].value_counts().index[0]
+    shots = play_by_play[play_by_play["PLAYER"] == player]
+
+    level = chart.build_hexbin_pyramid(shots, gridsizes=(15,)).level(15)
+    entity = chart.get_entity_hexbin_data(play_by_play, player).iloc[0]
+
+    np.testing.assert_array_equal(level["values_all"], entity["values_all"])
+    np.testing.assert_allclose(
+        np.ma.filled(level["values_ratio"], np.nan),
+        np.ma.filled(entity["values_ratio"], np.nan),
+    )
+
+
+def test_levels_are_built_lazily_and_cached(play_by_play):
+    chart = ShotChart()
+    pyramid = chart.build_hexbin_pyramid(play_by_play, gridsizes=(10,))
+    assert pyramid.gridsizes == [10]
+
+    level = pyramid[40]
+
+    assert pyramid.gridsizes == [10, 40]
+    assert pyramid[40] is level
+    assert level["values_all"].sum() == pyramid.n_shots - _outside(chart, pyramid)
+
+
+def _outside(chart, pyramid):
+    """Shots that fall outside the hexbin extent."""
+    index = HexGrid(40, chart.config["hexagon_extent"]).bin_index(
+        pyramid.points[:, 0], pyramid.points[:, 1]
+    )
+    return int(pyramid.weights_all[index < 0].sum())
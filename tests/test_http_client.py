@@ -0,0 +1,111 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from basket_viz.img_util.http_client import HTTPClient, fetch_all
+
+BODY = b"image"
+
+
+class Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled connections can be reused
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.ports.add(self.client_address[1])
+            hits = server.hits[self.path]
+
+        if self.path.startswith("/flaky") and hits == 1:
+            self._respond(503)
+        elif self.path.startswith("/missing"):
+            self._respond(404)
+        elif self.path.startswith("/slow"):
+            time.sleep(1)
+            self._respond(200, BODY)
+        else:
+            self._respond(200, BODY)
+
+    def _respond(self, status, body=b""):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = {}
+    server.ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HTTPClient(timeout=0.3, retries=2, backoff_factor=0)
+    yield client
+    client.close()
+
+
+def test_retries_after_503(server, client):
+    assert client.get_bytes(f"{server.url}/flaky") == BODY
+    assert server.hits["/flaky"] == 2
+
+
+def test_error_status_raises(server, client):
+    with pytest.raises(requests.HTTPError):
+        client.get(f"{server.url}/missing")
+
+
+def test_timeout_is_retried_then_raises(server):
+    client = HTTPClient(timeout=0.2, retries=1, backoff_factor=0)
+    start = time.perf_counter()
+    # urllib3 reports a read timeout without retries left as a connection error
+    with pytest.raises(requests.RequestException):
+        client.get(f"{server.url}/slow")
+    assert time.perf_counter() - start < 1
+    assert server.hits["/slow"] == 2
+    client.close()
+
+
+def test_connections_are_reused(server, client):
+    for i in range(5):
+        client.get_bytes(f"{server.url}/logo{i}.png")
+    assert len(server.ports) == 1
+
+
+def test_fetch_all_returns_exceptions_per_url(server, client):
+    urls = [
+        f"{server.url}/a.png",
+        f"{server.url}/missing.png",
+        f"{server.url}/b.png",
+        f"{server.url}/a.png",
+    ]
+    results = fetch_all(urls, client.get_bytes, max_workers=4)
+
+    assert list(results) == urls[:3]
+    assert results[urls[0]] == BODY
+    assert results[urls[2]] == BODY
+    assert isinstance(results[urls[1]], requests.HTTPError)
+    # Repeated URLs are fetched once
+    assert server.hits["/a.png"] == 1
+
+
+def test_fetch_all_without_urls():
+    assert fetch_all([], lambda url: url) == {}
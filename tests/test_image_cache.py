@@ -0,0 +1,140 @@
+import os
+
+import numpy as np
+import pytest
+import requests
+
+from basket_viz.img_util import ImageCache, OfflineCacheMiss
+from conftest import FakeClient, png_bytes
+
+URL = "https://logos.test/team.png"
+
+
+@pytest.fixture
+def client():
+    return FakeClient({URL: png_bytes()})
+
+
+def _cache(tmp_path, client, **kwargs):
+    return ImageCache(str(tmp_path / "images"), client=client, offline=False, **kwargs)
+
+
+def test_hit_and_miss(tmp_path, client):
+    cache = _cache(tmp_path, client)
+
+    assert URL not in cache
+    assert cache.get(URL) == png_bytes()
+    assert cache.get(URL) == png_bytes()
+
+    assert URL in cache
+    assert client.urls() == [URL]
+    with pytest.raises(requests.HTTPError):
+        cache.get("https://logos.test/missing.png")
+
+
+def test_same_body_is_stored_once(tmp_path, client):
+    client.images["https://mirror.test/team.png"] = png_bytes()
+    cache = _cache(tmp_path, client)
+
+    cache.get(URL)
+    cache.get("https://mirror.test/team.png")
+
+    assert len(os.listdir(tmp_path / "images" / "blobs")) == 1
+    assert len(os.listdir(tmp_path / "images" / "entries")) == 2
+
+
+def test_stale_entries_are_revalidated(tmp_path, client):
+    cache = _cache(tmp_path, client, max_age=0)
+    cache.get(URL)
+
+    # Unchanged: a 304 keeps the cached body
+    assert cache.get(URL) == png_bytes()
+    assert client.requests[-1][1]["If-None-Match"].startswith('"')
+
+    # Changed: the new body replaces it
+    client.images[URL] = png_bytes(color=(0, 0, 0))
+    assert cache.get(URL) == png_bytes(color=(0, 0, 0))
+    assert len(client.requests) == 3
+
+
+def test_cached_copy_is_served_when_revalidation_fails(tmp_path, client, capsys):
+    cache = _cache(tmp_path, client, max_age=0)
+    cache.get(URL)
+    del client.images[URL]
+
+    assert cache.get(URL) == png_bytes()
+    assert "serving cached copy" in capsys.readouterr().out
+
+
+def test_offline_mode(tmp_path, client):
+    _cache(tmp_path, client).get(URL)
+    cache = _cache(tmp_path, client, max_age=0)
+    cache.offline = True
+
+    assert cache.get(URL) == png_bytes()
+    with pytest.raises(OfflineCacheMiss):
+        cache.get("https://logos.test/other.png")
+    assert client.urls() == [URL]
+
+
+def test_env_defaults(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASKET_VIZ_OFFLINE", "1")
+    monkeypatch.setenv("BASKET_VIZ_IMAGE_CACHE_MB", "2")
+
+    cache = ImageCache(str(tmp_path))
+
+    assert cache.offline
+    assert cache.max_bytes == 2 * 2**20
+
+
+def test_eviction_removes_the_least_recently_used(tmp_path):
+    bodies = {f"https://logos.test/{i}.png": os.urandom(4000) for i in range(4)}
+    client = FakeClient(bodies)
+    # Room for three images, an eviction shrinks the cache to 11700 bytes
+    cache = _cache(tmp_path, client, max_mb=13_000 / 2**20)
+    urls = list(bodies)
+    for i, url in enumerate(urls[:3]):
+        cache.get(url)
+        blob = cache._blob_path(cache._read_entry(url)["sha256"])
+        os.utime(blob, (i, i))
+    cache.get(urls[0])  # used again, now the most recent
+
+    cache.get(urls[3])
+
+    assert [url in cache for url in urls] == [True, False, False, True]
+    assert client.urls().count(urls[0]) == 1
+    # The size is tracked as images are stored, and matches a scan
+    assert cache._size == 8000
+    assert cache.size() == 8000
+    # The entries of evicted blobs are removed too
+    assert len(os.listdir(tmp_path / "images" / "entries")) == 2
+
+
+def test_processed_variants(tmp_path, client):
+    cache = _cache(tmp_path, client)
+    array = np.arange(12, dtype=np.uint8).reshape(2, 2, 3)
+
+    cache.put_processed(URL, "circle-2x2", array)
+    assert cache.get_processed(URL, "circle-2x2") is None  # image not cached
+
+    cache.get(URL)
+    cache.put_processed(URL, "circle-2x2", array)
+    np.testing.assert_array_equal(cache.get_processed(URL, "circle-2x2"), array)
+    assert cache.get_processed(URL, "circle-4x4") is None
+
+    # A changed image is processed again
+    client.images[URL] = png_bytes(color=(0, 0, 0))
+    cache.max_age = 0
+    cache.get(URL)
+    cache.max_age = None
+    assert cache.get_processed(URL, "circle-2x2") is None
+
+
+def test_clear(tmp_path, client):
+    cache = _cache(tmp_path, client)
+    cache.get(URL)
+
+    cache.clear()
+
+    assert URL not in cache
+    assert cache.size() == 0
@@ -0,0 +1,116 @@
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib.artist import Artist
+
+from basket_viz import instrumentation
+from basket_viz.court.shot_charts import ShotChart
+from basket_viz.export_util.fig_export import LocalExport
+
+
+@pytest.fixture
+def records():
+    records = []
+    instrumentation.stats.reset()
+    instrumentation.enable(callback=records.append)
+    yield records
+    instrumentation.disable()
+    instrumentation.remove_callback(records.append)
+    instrumentation.stats.reset()
+
+
+def _by_name(records):
+    return {record.name: record for record in records}
+
+
+def test_stages_rows_and_nested_calls(records, play_by_play):
+    player = play_by_play["PLAYER"].iloc[0]
+
+    ShotChart().get_entity_hexbin_data(play_by_play, player)
+
+    calls = _by_name(records)
+    record = calls["ShotChart.get_entity_hexbin_data"]
+    assert set(record.stages) >= {"filter", "binning"}
+    assert record.rows["input"] == len(play_by_play)
+    assert record.rows["filtered"] == (play_by_play["PLAYER"] == player).sum()
+    assert sum(record.stages.values()) <= record.duration
+    # get_fg_made_miss runs inside the call and is recorded with its parent
+    assert calls["ShotChart.get_fg_made_miss"].parent == record.name
+    assert records[-1] is record
+
+
+def test_stats_summary(records, play_by_play):
+    chart = ShotChart()
+    for player in play_by_play["PLAYER"].unique()[:3]:
+        chart.get_entity_hexbin_data(play_by_play, player)
+
+    summary = instrumentation.stats.summary()["ShotChart.get_entity_hexbin_data"]
+
+    assert summary["calls"] == 3 and summary["errors"] == 0
+    assert summary["rows"]["input"] == 3 * len(play_by_play)
+    assert summary["mean_s"] == pytest.approx(summary["total_s"] / 3)
+    assert summary["max_s"] <= summary["total_s"]
+
+
+def test_errors_are_recorded_and_raised(records):
+    with pytest.raises(ValueError):
+        LocalExport.save_plot()
+
+    assert "ValueError" in records[-1].error
+    assert instrumentation.stats.summary()["LocalExport.save_plot"]["errors"] == 1
+
+
+def test_artists_of_the_figure_the_call_produced(records, play_by_play):
+    chart = ShotChart()
+    made, miss = chart.get_fg_made_miss(play_by_play)
+
+    chart.plot_field_goal_scatter(made, miss)
+    chart.get_fg_made_miss(play_by_play)
+
+    first, second = records[-2], records[-1]
+    assert first.artists == len(chart.fig.findobj(Artist))
+    # The figure of the earlier call on the same chart is not counted again
+    assert second.artists is None
+
+
+def test_save_renders_once_and_splits_render_and_encode(records, tmp_path):
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    draws = []
+    fig.canvas.mpl_connect("draw_event", draws.append)
+
+    LocalExport.save_plot(fig=fig, directory=str(tmp_path), file_name="line")
+
+    record = records[-1]
+    assert len(draws) == 1
+    assert set(record.stages) == {"render", "encode"}
+    assert all(seconds > 0 for seconds in record.stages.values())
+    assert sum(record.stages.values()) <= record.duration
+    assert (tmp_path / "line.png").stat().st_size > 0
+
+
+def test_disabled_records_nothing(records, tmp_path):
+    instrumentation.disable()
+    fig, _ = plt.subplots()
+
+    LocalExport.save_plot(fig=fig, directory=str(tmp_path))
+    with instrumentation.stage("draw") as first, instrumentation.stage("x") as second:
+        assert first is second
+
+    assert records == []
+    assert instrumentation.stats.summary() == {}
+    assert instrumentation.current_record() is None
+
+
+def test_failing_callback_does_not_break_the_call(records, capsys, play_by_play):
+    def failing(record):
+        raise RuntimeError("metrics backend down")
+
+    instrumentation.add_callback(failing)
+    try:
+        made, _ = ShotChart().get_fg_made_miss(play_by_play)
+    finally:
+        instrumentation.remove_callback(failing)
+
+    assert len(made) > 0
+    assert len(records) == 1
+    assert "metrics backend down" in capsys.readouterr().out
@@ -0,0 +1,146 @@
+import os
+
+import numpy as np
+import pytest
+
+from basket_viz.court.shot_charts import ShotChart
+
+
+@pytest.fixture
+def game(play_by_play):
+    return play_by_play[play_by_play["GAME_ID"] == 1].reset_index(drop=True)
+
+
+def _csv_lines(df):
+    return df.to_csv(index=False).encode().splitlines(keepends=True)
+
+
+def _append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def _drawn(live, result):
+    """Coordinates of all the markers of a result, in order."""
+    x = np.concatenate([a.get_xdata() for a in live._chunks[result]])
+    y = np.concatenate([a.get_ydata() for a in live._chunks[result]])
+    return np.column_stack([x, y])
+
+
+def _made_miss(game):
+    made, miss = ShotChart().get_fg_made_miss(game)
+    return (
+        made[["COORD_X", "COORD_Y"]].to_numpy(float),
+        miss[["COORD_X", "COORD_Y"]].to_numpy(float),
+    )
+
+
+def test_reads_only_complete_appended_csv_lines(tmp_path, game):
+    path = tmp_path / "game.csv"
+    lines = _csv_lines(game)
+    path.write_bytes(b"".join(lines[:11]))
+    live = ShotChart().live_shot_chart(str(path))
+
+    assert live.update() == 10
+    # The last line is still being written
+    _append(path, b"".join(lines[11:21]) + lines[21][:5])
+    assert live.update() == 10
+    assert live.update() == 0
+    _append(path, lines[21][5:] + b"".join(lines[22:]))
+    live.update()
+
+    made, miss = _made_miss(game)
+    assert live.n_rows == len(game)
+    np.testing.assert_array_equal(_drawn(live, "made"), made)
+    np.testing.assert_array_equal(_drawn(live, "miss"), miss)
+
+
+def test_jsonl_and_filters(tmp_path, game):
+    path = tmp_path / "game.jsonl"
+    team = game["TEAM"].iloc[0]
+    game.iloc[:50].to_json(path, orient="records", lines=True)
+    live = ShotChart().live_shot_chart(str(path), team_name=team)
+
+    live.update()
+    _append(path, game.iloc[50:].to_json(orient="records", lines=True).encode())
+    live.update()
+
+    made, miss = _made_miss(game[game["TEAM"] == team])
+    np.testing.assert_array_equal(_drawn(live, "made"), made)
+    np.testing.assert_array_equal(_drawn(live, "miss"), miss)
+
+
+def test_markers_are_split_into_chunks(tmp_path, game):
+    path = tmp_path / "game.csv"
+    lines = _csv_lines(game)
+    path.write_bytes(lines[0])
+    live = ShotChart().live_shot_chart(str(path))
+    live.CHUNK_SIZE = 8
+
+    for start in range(1, len(lines), 7):
+        _append(path, b"".join(lines[start : start + 7]))
+        live.update()
+
+    made, miss = _made_miss(game)
+    assert len(live._chunks["made"]) == int(np.ceil(len(made) / 8))
+    assert all(len(a.get_xdata()) <= 8 for a in live._chunks["made"])
+    np.testing.assert_array_equal(_drawn(live, "made"), made)
+    np.testing.assert_array_equal(_drawn(live, "miss"), miss)
+
+
+def test_truncated_file_is_read_again(tmp_path, game):
+    path = tmp_path / "game.csv"
+    lines = _csv_lines(game)
+    path.write_bytes(b"".join(lines))
+    live = ShotChart().live_shot_chart(str(path))
+    live.CHUNK_SIZE = 8
+    live.update()
+
+    path.write_bytes(b"".join(lines[:21]))
+    with pytest.warns(RuntimeWarning, match="truncated or replaced"):
+        live.update()
+
+    made, miss = _made_miss(game.iloc[:20])
+    assert live.n_rows == 20
+    np.testing.assert_array_equal(_drawn(live, "made"), made)
+    np.testing.assert_array_equal(_drawn(live, "miss"), miss)
+
+
+def test_replaced_file_is_read_from_the_start(tmp_path, game):
+    path = tmp_path / "game.csv"
+    lines = _csv_lines(game)
+    path.write_bytes(b"".join(lines[:21]))
+    live = ShotChart().live_shot_chart(str(path))
+    live.update()
+
+    # Rotated: a new file with other rows is moved over the old one
+    other = tmp_path / "next.csv"
+    other.write_bytes(lines[0] + b"".join(lines[-20:]) + b"".join(lines[21:40]))
+    os.replace(other, path)
+    with pytest.warns(RuntimeWarning):
+        live.update()
+
+    assert live.n_rows == 39
+
+
+def test_exports_every_n_updates_with_shots(tmp_path, game):
+    path = tmp_path / "game.csv"
+    lines = _csv_lines(game)
+    path.write_bytes(lines[0])
+    live = ShotChart().live_shot_chart(
+        str(path),
+        export_every=2,
+        directory=str(tmp_path / "frames"),
+        numbered_frames=True,
+    )
+
+    for start in (1, 11, 21, 31):
+        _append(path, b"".join(lines[start : start + 10]))
+        live.update()
+    live.update()  # nothing new, no export
+
+    assert live.n_exports == 2
+    assert sorted(os.listdir(tmp_path / "frames")) == [
+        "live_shot_chart_00000.png",
+        "live_shot_chart_00001.png",
+    ]
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from basket_viz.img_util.masks import (
+    add_circular_border,
+    apply_circular_mask,
+    border_ring,
+    circular_mask,
+)
+
+
+def _pil_ellipse(size, ellipse_coords):
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).ellipse(ellipse_coords, fill=255)
+    return np.asarray(mask).astype(int)
+
+
+@pytest.mark.parametrize(
+    "size, ellipse_coords",
+    [
+        ((300, 300), None),
+        ((300, 300), (10, 10, 290, 290)),
+        ((120, 80), (0, 0, 119, 79)),
+    ],
+)
+def test_mask_matches_the_pil_ellipse_up_to_anti_aliasing(size, ellipse_coords):
+    mask = circular_mask(size, ellipse_coords).astype(int)
+
+    expected = _pil_ellipse(size, ellipse_coords or (0, 0) + size)
+    assert mask.shape == (size[1], size[0])
+    # Only pixels on the outline are blended
+    differs = np.abs(mask - expected) > 128
+    assert differs.sum() < 0.01 * mask.size
+    assert mask[size[1] // 2, size[0] // 2] == 255 and mask[0, 0] == 0
+    edge = (mask > 0) & (mask < 255)
+    assert edge.any()
+
+
+def test_masks_and_rings_are_cached_and_read_only():
+    mask = circular_mask((64, 64))
+
+    assert circular_mask((64, 64)) is mask
+    assert border_ring((64, 64), 4, "red") is border_ring((64, 64), 4, "red")
+    with pytest.raises(ValueError):
+        mask[0, 0] = 1
+
+
+def test_apply_circular_mask():
+    img = Image.new("RGBA", (64, 64), (10, 20, 30, 128))
+
+    multiplied = apply_circular_mask(img.copy())
+    replaced = apply_circular_mask(img.copy(), replace_alpha=True)
+
+    alpha = np.asarray(multiplied.getchannel("A")).astype(int)
+    expected = circular_mask((64, 64)) / 255 * 128
+    np.testing.assert_allclose(alpha, expected, atol=1)
+    np.testing.assert_array_equal(replaced.getchannel("A"), circular_mask((64, 64)))
+    assert apply_circular_mask(img) is img
+
+
+@pytest.mark.parametrize("color", ["red", "#ff0000", (255, 0, 0), [255, 0, 0, 255]])
+def test_add_circular_border(color):
+    img = apply_circular_mask(Image.new("RGBA", (60, 60), (0, 0, 255, 255)))
+
+    bordered = np.asarray(add_circular_border(img, color, 10))
+
+    assert bordered.shape == (80, 80, 4)
+    # The image in the middle, the red ring around it, nothing in the corners
+    np.testing.assert_array_equal(bordered[40, 40], [0, 0, 255, 255])
+    np.testing.assert_array_equal(bordered[40, 8], [255, 0, 0, 255])
+    assert bordered[0, 0, 3] == 0
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from basket_viz.court.shot_charts import ShotChart
+from basket_viz.data_util import (
+    load_play_by_play,
+    optimize_play_by_play,
+    validate_play_by_play,
+)
+
+
+@pytest.fixture
+def raw_csv(tmp_path, play_by_play):
+    raw = play_by_play.astype({"TEAM": str, "PLAYER": str, "ID_ACTION": str})
+    raw["PLAYINFO"] = "Two Pointer"
+    path = tmp_path / "play_by_play.csv"
+    raw.to_csv(path, index=False)
+    return path
+
+
+def test_loads_only_the_chart_columns_in_compact_dtypes(raw_csv):
+    df = load_play_by_play(raw_csv)
+
+    assert list(df.columns) == [
+        "PLAYER",
+        "TEAM",
+        "GAME_ID",
+        "ID_ACTION",
+        "COORD_X",
+        "COORD_Y",
+        "UTC",
+    ]
+    for column in ("PLAYER", "TEAM", "GAME_ID", "ID_ACTION"):
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    assert df["COORD_X"].dtype == np.int16
+    assert df["UTC"].dtype == np.int64
+
+    raw = pd.read_csv(raw_csv)
+    assert df.memory_usage(deep=True).sum() < raw.memory_usage(deep=True).sum() / 4
+
+
+def test_extra_columns_and_fractional_coordinates(play_by_play):
+    raw = play_by_play.assign(COORD_X=play_by_play["COORD_X"] + 0.5, PLAYINFO="x")
+
+    df = optimize_play_by_play(raw, extra_columns=["PLAYINFO"])
+
+    assert df["COORD_X"].dtype == np.float32
+    assert df["COORD_Y"].dtype == np.int16
+    assert (df["PLAYINFO"] == "x").all()
+    # The input is not modified
+    assert "PLAYINFO" in raw and raw["COORD_X"].dtype == np.float64
+
+
+def test_charts_give_the_same_hexbins(raw_csv):
+    raw = pd.read_csv(raw_csv)
+    df = load_play_by_play(raw_csv)
+    chart = ShotChart()
+    player = raw["PLAYER"].iloc[0]
+
+    expected = chart.get_entity_hexbin_data(raw, player).iloc[0]
+    actual = chart.get_entity_hexbin_data(df, player).iloc[0]
+
+    np.testing.assert_array_equal(actual["values_made"], expected["values_made"])
+    np.testing.assert_array_equal(actual["values_all"], expected["values_all"])
+
+
+def test_invalid_input(play_by_play):
+    with pytest.raises(KeyError, match="COORD_Y"):
+        optimize_play_by_play(play_by_play.drop(columns="COORD_Y"))
+    with pytest.raises(ValueError, match="COORD_X"):
+        optimize_play_by_play(play_by_play.assign(COORD_X="left corner"))
+    with pytest.raises(ValueError):
+        validate_play_by_play(play_by_play.assign(COORD_Y="baseline"))
+    assert validate_play_by_play(play_by_play) is play_by_play
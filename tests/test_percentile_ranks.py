@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from basket_viz.court.shot_charts import ShotChart
+
+
+def _entities(seed=0, n_entities=15, n_cells=30):
+    rng = np.random.default_rng(seed)
+    attempts = rng.poisson(2, size=(n_entities, n_cells)).astype(float)
+    made = rng.binomial(attempts.astype(int), 0.45).astype(float)
+    # Ties: two entities with identical hexbins
+    attempts[1], made[1] = attempts[0], made[0]
+    ratio = np.ma.masked_invalid(
+        np.divide(made, attempts, out=np.full_like(made, np.nan), where=attempts > 0)
+    )
+    return pd.DataFrame(
+        {
+            "player_name": [f"P{i}" for i in range(n_entities)],
+            "offsets": [np.zeros((n_cells, 2))] * n_entities,
+            "values_made": list(made),
+            "values_missed": list(attempts - made),
+            "values_all": list(attempts),
+            "values_ratio": list(ratio),
+        }
+    ), attempts, np.ma.filled(ratio, np.nan)
+
+
+def _expected(values, attempts, min_attempts):
+    """Mid-rank percentiles computed column by column with pandas."""
+    qualified = pd.DataFrame(np.where(attempts >= min_attempts, values, np.nan))
+    ranks = qualified.rank(axis=0, method="average")
+    return ((ranks - 0.5) / qualified.notna().sum(axis=0)).to_numpy()
+
+
+def test_percentiles_match_pandas_average_ranks():
+    df, attempts, ratio = _entities()
+
+    result = ShotChart().get_percentile_ranks(df, metric="ratio", min_attempts=2)
+
+    percentiles = np.vstack(result["percentile_values_ratio"])
+    np.testing.assert_allclose(
+        percentiles, _expected(ratio, attempts, 2), equal_nan=True
+    )
+    assert list(result["player_name"]) == list(df["player_name"])
+
+
+def test_ties_share_a_percentile_and_unqualified_get_nan():
+    df, attempts, _ = _entities()
+
+    percentiles = np.vstack(
+        ShotChart().get_percentile_ranks(df, min_attempts=1)["percentile_values_ratio"]
+    )
+
+    np.testing.assert_array_equal(percentiles[0], percentiles[1])
+    assert np.isnan(percentiles[attempts < 1]).all()
+    shot = ~np.isnan(percentiles)
+    assert ((percentiles[shot] > 0) & (percentiles[shot] < 1)).all()
+
+
+def test_count_metrics_are_ranked_too():
+    df, attempts, _ = _entities(seed=1)
+
+    result = ShotChart().get_percentile_ranks(df, metric="all")
+
+    np.testing.assert_allclose(
+        np.vstack(result["percentile_values_all"]),
+        _expected(attempts, attempts, 1),
+        equal_nan=True,
+    )
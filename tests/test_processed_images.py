@@ -0,0 +1,92 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from PIL import Image
+
+from basket_viz.img_util import (
+    ImagePatcher,
+    ProcessedImageCache,
+    circular_logo_array,
+    inline_image_key,
+    processed_images,
+    render_bottom_images,
+)
+from conftest import png_bytes
+
+URL = "https://logos.test/team.png"
+
+
+def _array(value, nbytes=1000):
+    return np.full(nbytes, value, dtype=np.uint8)
+
+
+def test_least_recently_used_arrays_are_evicted():
+    cache = ProcessedImageCache(max_mb=2500 / 2**20)
+    cache.put("a", _array(1))
+    cache.put("b", _array(2))
+    cache.get("a")
+
+    cache.put("c", _array(3))
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_arrays_are_read_only_and_replaced_in_place():
+    cache = ProcessedImageCache(max_mb=2500 / 2**20)
+
+    array = cache.put("a", _array(1))
+    cache.put("a", _array(2))
+    cache.put("big", _array(0, nbytes=5000))
+
+    with pytest.raises(ValueError):
+        array[0] = 0
+    assert cache.get("a")[0] == 2
+    # Arrays over the budget are returned but not cached
+    assert "big" not in cache and cache.get("a") is not None
+    cache.clear()
+    assert len(cache) == 0 and cache.get("a") is None
+
+
+def test_images_are_processed_once(tmp_path, image_cache):
+    image_cache.client.images[URL] = png_bytes()
+    path = tmp_path / "logo.png"
+    path.write_bytes(png_bytes())
+    _, ax = plt.subplots()
+
+    for _ in range(2):
+        ImagePatcher(str(path)).add_circular_image(ax, border_color="red")
+        circular_logo_array(URL)
+
+    assert len(processed_images) == 2
+    assert image_cache.client.urls() == [URL]
+    first, second = [a.offsetbox.get_data() for a in ax.artists]
+    assert first is second
+
+    # A file changed on disk is processed again
+    Image.new("RGB", (40, 40), (0, 0, 0)).save(path)
+    ImagePatcher(str(path)).add_circular_image(ax)
+    assert len(processed_images) == 3
+
+
+def test_logos_evicted_during_a_render_are_still_drawn(image_cache, capsys):
+    image_cache.client.images[URL] = png_bytes()
+    circular_logo_array(URL)
+    real_get = processed_images.get
+
+    def get(key):
+        # Evicted after render_bottom_images checked which logos are pending
+        if key == inline_image_key(URL, (260, 260)):
+            processed_images.clear()
+        return real_get(key)
+
+    processed_images.get = get
+    try:
+        _, ax = plt.subplots()
+        render_bottom_images(ax, [URL])
+    finally:
+        del processed_images.get
+
+    assert len(ax.artists) == 1
+    assert "failed" not in capsys.readouterr().out
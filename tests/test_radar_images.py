@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.offsetbox import AnnotationBbox
+
+from basket_viz.radar.standard import RadarChart
+from conftest import png_bytes
+
+COLUMNS = ["pointsScored", "assists", "pir"]
+
+
+@pytest.fixture
+def stats(image_cache):
+    stats = pd.DataFrame(
+        {
+            "player": ["ONE, A", "TWO, B"],
+            "player.imageUrl": ["https://heads.test/1.png", "https://heads.test/2.png"],
+            "pointsScored": [12.0, 8.0],
+            "assists": [3.0, 6.0],
+            "pir": [14.0, 11.0],
+        }
+    )
+    for url, color in zip(stats["player.imageUrl"], [(200, 0, 0), (0, 0, 200)]):
+        image_cache.client.images[url] = png_bytes(color, size=(70, 140))
+    return stats
+
+
+def _compare(radar, players):
+    radar.compare_radars(players, title="Comparison", line_colors=["red", "blue"])
+    radar.add_comparison_images()
+    return [a.offsetbox.get_data() for a in radar.ax.artists]
+
+
+def test_comparison_images_stay_in_memory(stats, image_cache, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    players = stats["player"].tolist()
+
+    images = _compare(RadarChart(stats, COLUMNS), players)
+    again = _compare(RadarChart(stats, COLUMNS), players)
+
+    assert not os.path.exists(tmp_path / "player_images")
+    assert len(images) == 2
+    # Processed once, the second chart draws the same arrays
+    assert all(a is b for a, b in zip(images, again))
+    assert image_cache.client.urls() == stats["player.imageUrl"].tolist()
+
+
+def test_headshots_are_cropped(stats):
+    radar = RadarChart(stats, COLUMNS)
+
+    image = radar.comparison_image("ONE, A")
+
+    assert callable(image)
+    assert image().size == (70, 100)
+
+
+def test_image_dir_saves_and_reuses_the_headshots(stats, image_cache, tmp_path):
+    image_dir = tmp_path / "radar"
+    players = stats["player"].tolist()
+    in_memory = _compare(RadarChart(stats, COLUMNS), players)
+
+    saved = _compare(RadarChart(stats, COLUMNS, player_image_dir=image_dir), players)
+    _compare(RadarChart(stats, COLUMNS, player_image_dir=image_dir), players)
+
+    assert sorted(os.listdir(image_dir)) == ["ONE, A.png", "TWO, B.png"]
+    assert len(image_cache.client.requests) == 2
+    for a, b in zip(saved, in_memory):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_player_image_in_the_center(stats):
+    radar = RadarChart(stats, COLUMNS)
+    radar.plot_radar("TWO, B", title_sufix="2024")
+
+    radar.add_player_image(radar.comparison_image("TWO, B"))
+
+    (box,) = [a for a in radar.ax.artists if isinstance(a, AnnotationBbox)]
+    assert box.xybox == (0.5, 0.5)
@@ -0,0 +1,62 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from matplotlib.offsetbox import AnnotationBbox
+
+from basket_viz.relationships.plotter_v2 import PlotRelation
+from conftest import png_bytes
+
+URLS = [f"https://headshots.test/{i}.png" for i in range(3)]
+
+
+def _players(image_urls):
+    n = len(image_urls)
+    return pd.DataFrame(
+        {
+            "minutesPlayed": np.arange(n, dtype=float) * 5 + 10,
+            "foulsDrawn": np.arange(n, dtype=float) + 1,
+            "PLAYER": [f"SURNAME{i}, NAME" for i in range(n)],
+            "PLAYER_IMAGE": image_urls,
+        }
+    )
+
+
+def _serve(image_cache, on_get=None):
+    client = image_cache.client
+    client.images.update({url: png_bytes(size=(40, 60)) for url in URLS})
+    client.on_get = on_get
+    return client
+
+
+def _boxes(plot):
+    return [a for a in plot.ax.artists if isinstance(a, AnnotationBbox)]
+
+
+def test_headshots_download_concurrently_once_per_url(image_cache):
+    barrier = threading.Barrier(len(URLS), timeout=5)
+    client = _serve(image_cache, on_get=lambda url: barrier.wait())
+    df = _players(URLS + URLS[:1])
+    plot = PlotRelation(df, image_download_workers=len(URLS))
+
+    plot.plot_relationship(highlight_df=df)
+
+    assert sorted(client.urls()) == sorted(URLS)
+    boxes = _boxes(plot)
+    assert len(boxes) == len(df)
+    assert [box.xy[0] for box in boxes] == df["minutesPlayed"].tolist()
+
+
+def test_rows_without_an_image_or_coordinates_are_skipped(image_cache):
+    _serve(image_cache)
+    df = _players(URLS[:2] + ["https://headshots.test/missing.png", None])
+    df.loc[1, "foulsDrawn"] = np.nan
+    plot = PlotRelation(df.iloc[[0, 2, 3]])
+    plot.plot_relationship()
+
+    plot.add_player_annotations(df)
+
+    (box,) = _boxes(plot)
+    assert box.xy[0] == df.loc[0, "minutesPlayed"]
+    labels = [t.get_text() for t in plot.ax.texts]
+    assert [label for label in labels if label.startswith("Surname")] == ["Surname0"]
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from basket_viz.court.hex_grid import HexGrid
+from basket_viz.court.hexbin_accumulator import HexbinAccumulator
+from basket_viz.court.shot_charts import ShotChart
+
+WINDOW = 3
+
+
+def _counts(chart, shots):
+    grid = HexGrid(chart.config["gridsize"], chart.config["hexagon_extent"])
+    return grid.count(shots["COORD_X"], shots["COORD_Y"])
+
+
+def _player_games(play_by_play, player):
+    shots = play_by_play[play_by_play["PLAYER"] == player]
+    return shots, list(shots["GAME_ID"].unique())
+
+
+@pytest.fixture
+def accumulator(play_by_play):
+    accumulator = HexbinAccumulator(ShotChart(), window=WINDOW)
+    for game_id in play_by_play["GAME_ID"].unique():
+        accumulator.update(play_by_play[play_by_play["GAME_ID"] == game_id])
+    return accumulator
+
+
+def test_window_keeps_the_last_games_of_every_entity(play_by_play, accumulator):
+    chart = ShotChart()
+    window = accumulator.window_snapshot().set_index("player_name")
+
+    for player in play_by_play["PLAYER"].unique():
+        shots, games = _player_games(play_by_play, player)
+        recent = shots[shots["GAME_ID"].isin(games[-WINDOW:])]
+        np.testing.assert_array_equal(
+            window.at[player, "values_all"], _counts(chart, recent)
+        )
+
+
+def test_window_is_rebuilt_after_a_removed_game(play_by_play, accumulator):
+    chart = ShotChart()
+    accumulator.remove_game(play_by_play["GAME_ID"].max())
+    window = accumulator.window_snapshot().set_index("player_name")
+
+    remaining = play_by_play[play_by_play["GAME_ID"] != play_by_play["GAME_ID"].max()]
+    for player in remaining["PLAYER"].unique():
+        shots, games = _player_games(remaining, player)
+        recent = shots[shots["GAME_ID"].isin(games[-WINDOW:])]
+        np.testing.assert_array_equal(
+            window.at[player, "values_all"], _counts(chart, recent)
+        )
+
+
+def test_rolling_window_sequence_frames(play_by_play, accumulator):
+    chart = ShotChart()
+    player = play_by_play["PLAYER"].value_counts().index[0]
+    shots, games = _player_games(play_by_play, player)
+
+    game_ids, frames = accumulator.rolling_window_sequence(player)
+    _, cumulative = accumulator.rolling_window_sequence(player, window=len(games))
+
+    assert game_ids == games
+    assert frames.shape == (len(games), 3, accumulator.grid.n_cells)
+    for k, game_id in enumerate(games):
+        in_window = games[max(0, k - WINDOW + 1) : k + 1]
+        np.testing.assert_array_equal(
+            frames[k, 2], _counts(chart, shots[shots["GAME_ID"].isin(in_window)])
+        )
+        np.testing.assert_array_equal(
+            cumulative[k, 2], _counts(chart, shots[shots["GAME_ID"] <= game_id])
+        )
+    np.testing.assert_array_equal(frames[:, 0] + frames[:, 1], frames[:, 2])
+
+
+def test_form_animation_has_a_frame_per_game(play_by_play, accumulator):
+    chart = ShotChart()
+    player = play_by_play["PLAYER"].value_counts().index[0]
+    _, games = _player_games(play_by_play, player)
+
+    chart.plot_entity_hexbin_form_animated(accumulator, player)
+
+    assert len(chart.ani._framedata) == len(games)
+
+
+def test_window_snapshot_requires_a_window(play_by_play):
+    accumulator = HexbinAccumulator(ShotChart())
+    with pytest.raises(ValueError):
+        accumulator.window_snapshot()
+    with pytest.raises(KeyError):
+        accumulator.rolling_window_sequence("UNKNOWN, PLAYER")
@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+import pytest
+
+from basket_viz.court.hex_grid import HexGrid
+from basket_viz.court.shot_charts import ShotChart
+from basket_viz.data_util import ShotArrays
+
+
+def _by_name(df):
+    return {row.player_name: row for row in df.itertuples()}
+
+
+def test_write_and_read_back(tmp_path, play_by_play):
+    shots = ShotArrays.write(play_by_play, str(tmp_path))
+
+    assert len(shots) == len(play_by_play)
+    assert isinstance(shots.array("coord_x"), np.memmap)
+    np.testing.assert_array_equal(
+        shots.array("coord_y"), play_by_play["COORD_Y"].to_numpy(np.float32)
+    )
+    players = np.asarray(shots.vocabulary("player"))[shots.array("player")]
+    np.testing.assert_array_equal(players, play_by_play["PLAYER"].to_numpy())
+    with pytest.raises(KeyError):
+        shots.array("points")
+
+
+def test_append_keeps_the_codes(tmp_path, play_by_play):
+    first = play_by_play[play_by_play["GAME_ID"] <= 4]
+    ShotArrays.write(first, str(tmp_path))
+    vocabulary = ShotArrays(str(tmp_path)).vocabulary("player")
+
+    shots = ShotArrays.write(
+        play_by_play[play_by_play["GAME_ID"] > 4], str(tmp_path), append=True
+    )
+
+    assert len(shots) == len(play_by_play)
+    assert shots.vocabulary("player")[: len(vocabulary)] == vocabulary
+    games = np.asarray(shots.vocabulary("game"))[shots.array("game")]
+    np.testing.assert_array_equal(games, play_by_play["GAME_ID"].to_numpy())
+
+
+def test_append_drops_rows_of_an_unfinished_write(tmp_path, play_by_play):
+    ShotArrays.write(play_by_play.iloc[:100], str(tmp_path))
+    # A write that failed before its catalog update left extra bytes behind
+    with open(os.path.join(tmp_path, "coord_x.bin"), "ab") as f:
+        f.write(np.zeros(7, dtype=np.float32).tobytes())
+
+    shots = ShotArrays.write(play_by_play.iloc[100:], str(tmp_path), append=True)
+
+    np.testing.assert_array_equal(
+        shots.array("coord_x"), play_by_play["COORD_X"].to_numpy(np.float32)
+    )
+    assert os.path.getsize(os.path.join(tmp_path, "coord_x.bin")) == 4 * len(shots)
+
+
+def test_mask_combines_the_filters(tmp_path, play_by_play):
+    shots = ShotArrays.write(play_by_play, str(tmp_path))
+    team = play_by_play["TEAM"].iloc[0]
+
+    mask = shots.mask(teams=[team, "unknown"], games=[2, 3])
+
+    expected = (play_by_play["TEAM"] == team) & play_by_play["GAME_ID"].isin([2, 3])
+    np.testing.assert_array_equal(mask, expected.to_numpy())
+    assert not shots.mask(players=["unknown"]).any()
+
+
+def test_entity_hexbin_data_matches_the_dataframe(tmp_path, play_by_play):
+    chart = ShotChart()
+    shots = ShotArrays.write(play_by_play, str(tmp_path))
+
+    actual = _by_name(shots.entity_hexbin_data(chart, chunk_size=1000))
+    expected = _by_name(chart.get_all_entity_hexbin_data(play_by_play))
+
+    assert set(actual) == set(expected)
+    for name, row in expected.items():
+        for column in ("values_made", "values_missed", "values_all"):
+            np.testing.assert_array_equal(
+                np.ma.filled(getattr(actual[name], column), 0),
+                np.ma.filled(getattr(row, column), 0),
+            )
+        np.testing.assert_allclose(
+            np.ma.filled(actual[name].values_ratio, np.nan),
+            np.ma.filled(row.values_ratio, np.nan),
+        )
+
+
+def test_hexbin_counts_of_a_mask(tmp_path, play_by_play):
+    shots = ShotArrays.write(play_by_play, str(tmp_path))
+    grid = HexGrid(15, ShotChart().config["hexagon_extent"])
+    mask = shots.mask(games=[1])
+
+    counts = shots.hexbin_counts(grid, entity="team", mask=mask)
+
+    game = play_by_play[play_by_play["GAME_ID"] == 1]
+    for row, team in enumerate(shots.vocabulary("team")):
+        shot = game[game["TEAM"] == team]
+        np.testing.assert_array_equal(
+            counts[row], grid.count(shot["COORD_X"], shot["COORD_Y"])
+        )
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from basket_viz.court.shot_similarity import ShotProfileIndex
+
+
+@pytest.fixture
+def profiles():
+    rng = np.random.default_rng(0)
+    counts = rng.poisson(3, size=(12, 40)).astype(float)
+    counts[3] = counts[0] * 2  # same profile as A0, twice the volume
+    counts[5, :] = 0  # no shots
+    counts[7] = np.where(np.arange(40) < 2, 1, 0)  # 2 attempts
+    return pd.DataFrame(
+        {
+            "player_name": [f"A{i}" for i in range(len(counts))],
+            "values_all": [np.ma.masked_equal(row, 0) for row in counts],
+        }
+    ), counts
+
+
+def _cosine(p, q):
+    return 1 - p @ q / (np.linalg.norm(p) * np.linalg.norm(q))
+
+
+def _jensen_shannon(p, q):
+    p, q = p / p.sum(), q / q.sum()
+    m = (p + q) / 2
+
+    def kl(a):
+        nonzero = a > 0
+        return np.sum(a[nonzero] * np.log2(a[nonzero] / m[nonzero]))
+
+    return np.sqrt((kl(p) + kl(q)) / 2)
+
+
+def test_distances_match_the_definitions(profiles):
+    df, counts = profiles
+    index = ShotProfileIndex(df)
+    shooters = [i for i in range(len(counts)) if counts[i].sum() > 0]
+
+    cosine = index.cosine_distances("A0")
+    jensen_shannon = index.jensen_shannon_distances("A0")
+
+    for i in shooters:
+        assert cosine[i] == pytest.approx(_cosine(counts[0], counts[i]), abs=1e-5)
+        assert jensen_shannon[i] == pytest.approx(
+            _jensen_shannon(counts[0], counts[i]), abs=1e-5
+        )
+    # Profiles are normalized, so the shot volume does not matter
+    assert cosine[3] == pytest.approx(0, abs=1e-6)
+    assert jensen_shannon[3] == pytest.approx(0, abs=1e-3)
+
+
+@pytest.mark.parametrize("metric", ["cosine", "jensen_shannon"])
+def test_query_returns_the_nearest_entities_sorted(profiles, metric):
+    df, counts = profiles
+    index = ShotProfileIndex(df)
+
+    matches = index.query("A0", k=4, metric=metric, min_attempts=5)
+
+    distances = (
+        index.cosine_distances("A0")
+        if metric == "cosine"
+        else index.jensen_shannon_distances("A0")
+    )
+    candidates = [
+        i for i in range(len(counts)) if i != 0 and counts[i].sum() >= 5
+    ]
+    expected = sorted(candidates, key=lambda i: distances[i])[:4]
+
+    assert list(matches["player_name"]) == [f"A{i}" for i in expected]
+    assert matches["player_name"].iloc[0] == "A3"
+    assert matches["distance"].is_monotonic_increasing
+    # The query entity and entities under min_attempts are never matched
+    assert not {"A0", "A5", "A7"} & set(matches["player_name"])
+
+
+def test_query_with_fewer_candidates_than_k(profiles):
+    df, _ = profiles
+    matches = ShotProfileIndex(df).query("A0", k=50, min_attempts=10**6)
+    assert matches.empty
+
+
+def test_unknown_entity_and_metric(profiles):
+    df, _ = profiles
+    index = ShotProfileIndex(df)
+    with pytest.raises(KeyError):
+        index.query("NOBODY")
+    with pytest.raises(ValueError):
+        index.query("A0", metric="euclidean")
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from basket_viz.court.shot_charts import ShotChart
+
+
+@pytest.fixture(scope="module")
+def hexbin_data(play_by_play):
+    return ShotChart().get_all_entity_hexbin_data(play_by_play)
+
+
+def _matrix(df, column):
+    return np.vstack([np.ma.filled(v, 0) for v in df[column]]).astype(float)
+
+
+def _colored_cells(ax):
+    """Number of hexagons drawn with a color from the colormap."""
+    return sum(
+        np.isfinite(collection.get_array()).sum()
+        for collection in ax.collections
+        if collection.get_array() is not None
+    )
+
+
+def test_fixed_prior_gives_the_posterior_mean(hexbin_data):
+    shrunk_df = ShotChart().get_shrunk_hexbin_data(hexbin_data, prior_strength=10)
+
+    made = _matrix(hexbin_data, "values_made")
+    attempts = made + _matrix(hexbin_data, "values_missed")
+    league = made.sum(axis=0) / np.maximum(attempts.sum(axis=0), 1)
+    expected = (made + 10 * league) / (attempts + 10)
+
+    shrunk = np.vstack(shrunk_df["values_ratio_shrunk"])
+    np.testing.assert_allclose(shrunk[attempts > 0], expected[attempts > 0])
+    assert np.isnan(shrunk[attempts == 0]).all()
+
+
+def test_small_samples_are_pulled_towards_the_league():
+    # 10 entities at 50% over 100 attempts, one 1-for-1 entity
+    made = np.array([[50.0]] * 10 + [[1.0]])
+    attempts = np.array([[100.0]] * 10 + [[1.0]])
+    df = pd.DataFrame(
+        {
+            "player_name": [f"P{i}" for i in range(len(made))],
+            "values_made": list(made),
+            "values_missed": list(attempts - made),
+        }
+    )
+
+    shrunk = np.vstack(
+        ShotChart().get_shrunk_hexbin_data(df)["values_ratio_shrunk"]
+    )
+
+    # No variation beyond noise: the fitted prior is as strong as allowed
+    assert shrunk[-1, 0] == pytest.approx((1 + 0.5 * 1000) / (1 + 1000), rel=1e-3)
+    assert abs(shrunk[-1, 0] - 0.5) < 0.01
+
+
+@pytest.mark.parametrize("sized", [False, True])
+def test_shrunk_ratio_only_colors_hexbins_with_shots(hexbin_data, sized):
+    chart = ShotChart()
+    shrunk_df = chart.get_shrunk_hexbin_data(hexbin_data)
+    attempts = _matrix(hexbin_data, "values_all")
+    # The player who shot from the fewest hexbins
+    n_cells = (attempts > 0).sum(axis=1)
+    row = int(np.argmin(np.where(n_cells > 0, n_cells, attempts.shape[1])))
+    player = shrunk_df["player_name"].iloc[row]
+
+    if sized:
+        chart.plot_entity_hexbin_sized(
+            shrunk_df, "offsets", "values_ratio_shrunk", "values_all", player
+        )
+    else:
+        chart.plot_entity_hexbin(shrunk_df, "offsets", "values_ratio_shrunk", player)
+
+    assert _colored_cells(chart.fig.axes[0]) == (attempts[row] > 0).sum()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from basket_viz.court.shot_charts import ShotChart
+from basket_viz.data_util import (
+    generate_box_scores,
+    generate_play_by_play,
+    generate_radar_stats,
+    validate_play_by_play,
+)
+from basket_viz.radar.standard import RadarChart
+from basket_viz.stat_grid.season_stats import PlayerStatsHeatmap
+
+
+def test_same_seed_gives_the_same_data():
+    first = generate_play_by_play(n_games=3, seed=7)
+
+    pd.testing.assert_frame_equal(first, generate_play_by_play(n_games=3, seed=7))
+    assert not first.equals(generate_play_by_play(n_games=3, seed=8))
+
+
+@pytest.mark.parametrize("n_rows", [1, 179, 1000, 5003])
+def test_n_rows_is_exact(n_rows):
+    df = generate_play_by_play(n_rows=n_rows, shots_per_game=180)
+
+    assert len(df) == n_rows
+    assert df["GAME_ID"].min() == 1
+
+
+def test_play_by_play_layout(play_by_play):
+    chart = ShotChart()
+
+    assert validate_play_by_play(play_by_play) is play_by_play
+    assert list(play_by_play.columns) == [
+        "GAME_ID",
+        "TEAM",
+        "PLAYER",
+        "ID_ACTION",
+        "POINTS",
+        "COORD_X",
+        "COORD_Y",
+        "UTC",
+    ]
+    assert (play_by_play.groupby("GAME_ID")["TEAM"].nunique() <= 2).all()
+    # Shots are ordered in time within every game
+    assert (play_by_play.groupby("GAME_ID")["UTC"].diff().dropna() >= 0).all()
+    made = play_by_play["ID_ACTION"].isin(chart.config["made_action_ids"])
+    points = play_by_play["ID_ACTION"].astype(str).map(chart.config["action_points"])
+    np.testing.assert_array_equal(
+        play_by_play["POINTS"], np.where(made, points, 0).astype(int)
+    )
+
+
+def test_box_scores_count_the_play_by_play(play_by_play):
+    box = generate_box_scores(play_by_play)
+
+    assert list(box.columns[:4]) == ["Team", "Player", "GAME_CODE", "VS_TEAM"]
+    assert box["Points"].sum() == play_by_play["POINTS"].sum()
+    assert (box["Team"] != box["VS_TEAM"]).all()
+    assert box["VS_TEAM"].notna().all()
+    assert (box["FieldGoalsMade3"] <= box["FieldGoalsAttempted3"]).all()
+
+    team = box["Team"].iloc[0]
+    players = box.loc[box["Team"] == team, "Player"].unique()[:2].tolist()
+    heatmap = PlayerStatsHeatmap()
+    ax = heatmap.plot_stat_heatmap(box, team, players, show=False)
+    assert ax is not None
+
+
+def test_radar_stats_fit_the_radar_chart(play_by_play):
+    box = generate_box_scores(play_by_play)
+    stats = generate_radar_stats(box, image_url_template="https://x/{player_id}.png")
+
+    assert list(stats.columns[:2]) == ["player", "player.imageUrl"]
+    assert stats["player"].is_unique
+    assert stats["player.imageUrl"].iloc[1] == "https://x/1.png"
+    assert stats["gamesPlayed"].sum() == len(box)
+    assert stats["threePointersPercentage"].dropna().between(0, 100).all()
+
+    columns = ["pointsScored", "totalRebounds", "assists", "pir"]
+    radar = RadarChart(stats, columns)
+    radar.plot_radar(stats["player"].iloc[0])
+    assert generate_radar_stats(box)["player.imageUrl"].isna().all()